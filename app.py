@@ -1,13 +1,22 @@
 import streamlit as st
+import hashlib
 import os
+import shutil
+import tempfile
+import time
+from collections.abc import Mapping
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
-from audio_processing.transcriber import transcribe_audio
-from audio_processing.vad import detect_voice_activity
-from audio_processing.pacing import analyze_pacing
-from audio_processing.filler_words import detect_filler_words
-from audio_processing.emotion import analyze_emotion
-from feedback.feedback_generator import generate_feedback
-from utils.helpers import convert_audio_format
+from audio_processing.pipeline import DEFAULT_STAGES, iter_analysis
+from audio_processing.prescreen import AdmissionError, admit, prescreen
+from feedback.feedback_generator import FEEDBACK_UNAVAILABLE, stream_feedback
+from utils.instrumentation import start_metrics_server
+from utils.model_registry import warmup_in_background
+from utils.result_cache import get_result_cache
+from utils.results_store import extract_metrics, get_results_store
+from config.config import FEEDBACK_MODE, JOB_POLL_INTERVAL, METRICS_PORT, TEMP_DIR, USE_JOB_QUEUE, ensure_directories
+from jobs.job_queue import DONE, FAILED, JobQueue, QueueFullError
 
 # Load environment variables
 load_dotenv()
@@ -19,62 +28,255 @@ st.set_page_config(
     layout="wide"
 )
 
+def summarize(result):
+    """Drop per-frame arrays and time series that don't belong in a results panel."""
+    if isinstance(result, Mapping):
+        return {
+            key: value for key, value in result.items()
+            if not isinstance(value, np.ndarray) and key not in ("rate_over_time", "prosody_over_time", "positions", "timeline")
+        }
+    return result
+
+# Metrics charted in the progress panel
+PROGRESS_METRICS = {
+    "filler_words.filler_percentage": "Filler words (%)",
+    "pacing.speech_rate": "Words per minute",
+    "prosody.monotony_score": "Monotony",
+}
+
+def render(section, stage, result):
+    """Render one stage's result into its placeholder."""
+    with section.container():
+        st.write(summarize(result))
+        if stage == "pacing" and len(result["rate_over_time"]["time"]):
+            series = result["rate_over_time"]
+            st.line_chart(pd.DataFrame(
+                {"Words per minute": series["wpm"]},
+                index=pd.Index(series["time"], name="Time (s)")
+            ))
+        if stage == "prosody" and len(result["prosody_over_time"]["time"]):
+            series = result["prosody_over_time"]
+            st.line_chart(pd.DataFrame(
+                {"Monotony": series["monotony"]},
+                index=pd.Index(series["time"], name="Time (s)")
+            ))
+        if stage == "emotions" and result["timeline"]:
+            st.dataframe(pd.DataFrame(
+                [(w["start"], w["end"], w["label"], w["confidence"]) for w in result["timeline"]],
+                columns=["Start (s)", "End (s)", "Emotion", "Confidence"]
+            ))
+
 def main():
     st.title("🎤 Student Presentation Feedback System")
     st.write("Upload your presentation audio for real-time feedback and analysis.")
 
+    ensure_directories()
+
+    # Idempotent, so Streamlit reruns reuse the running endpoint
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+
+    # Load models once per process, in the background so the page renders
+    # at once; an upload made before they are ready waits for the ones it
+    # needs. With the job queue the workers hold the models instead
+    if not USE_JOB_QUEUE:
+        warmup_in_background()
+
+    # Results are saved under the student and assignment for progress tracking
+    student_column, assignment_column = st.columns(2)
+    student = student_column.text_input("Student name or ID").strip() or None
+    assignment = assignment_column.text_input("Assignment").strip() or None
+
     # File uploader
     audio_file = st.file_uploader("Upload your audio file", type=['wav', 'mp3', 'm4a'])
 
     if audio_file:
-        # Save the uploaded file temporarily
-        with open("temp_audio.wav", "wb") as f:
+        # Lay out the results first so each section renders as soon as
+        # its stage finishes
+        st.subheader("Analysis Results")
+        
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.write("### Speech Clarity")
+            filler_words_section = st.empty()
+            
+            st.write("### Pacing Analysis")
+            pacing_section = st.empty()
+        
+        with col2:
+            st.write("### Emotional Analysis")
+            emotions_section = st.empty()
+            
+            st.write("### Voice Activity")
+            voice_activity_section = st.empty()
+            
+            st.write("### Vocal Variety")
+            prosody_section = st.empty()
+        
+        st.subheader("Detailed Feedback")
+        quick_feedback_section = st.empty()
+        feedback_section = st.empty()
+
+        sections = {
+            "filler_words": filler_words_section,
+            "pacing": pacing_section,
+            "emotions": emotions_section,
+            "voice_activity": voice_activity_section,
+            "prosody": prosody_section,
+        }
+        # In tiered mode the rule-based feedback shows at once and the LLM's
+        # follows; in llm mode it is only shown if the LLM is unavailable
+        if FEEDBACK_MODE != "llm":
+            sections["quick_feedback"] = quick_feedback_section
+
+        if USE_JOB_QUEUE:
+            results = analyze_queued(audio_file, sections, feedback_section, student, assignment)
+        else:
+            results = analyze_in_session(audio_file, sections, feedback_section, student, assignment)
+        if results and student:
+            show_progress(student, assignment, results)
+
+def show_fallback(results, feedback, section):
+    """Show rule-based feedback in llm mode when the LLM produced none."""
+    if FEEDBACK_MODE == "llm" and feedback == FEEDBACK_UNAVAILABLE:
+        section.markdown(results["quick_feedback"])
+
+def show_screen(screen):
+    """Note the trimmed silence and the expected analysis time."""
+    trimmed = screen["duration"] - (screen["trim_end"] - screen["trim_start"])
+    note = f"Estimated analysis time: about {screen['estimated_seconds']:.0f} seconds."
+    if trimmed >= 1:
+        note += f" {trimmed:.0f} seconds of silence at the start and end were skipped (times below start at {screen['trim_start']:.1f} s)."
+    st.caption(note)
+
+def show_progress(student, assignment, results):
+    """Chart the student's stored history and rank this recording among the assignment's submissions."""
+    store = get_results_store()
+    st.subheader("Progress")
+    history = store.history(list(PROGRESS_METRICS), student=student)
+    if len(history["id"]) > 1:
+        st.line_chart(pd.DataFrame(
+            {label: history[name] for name, label in PROGRESS_METRICS.items()},
+            index=pd.Index(pd.to_datetime(history["recorded_at"], unit="s"), name="Submitted")
+        ))
+    else:
+        st.caption("Progress charts appear once you have submitted more than one recording.")
+    if assignment:
+        metrics = extract_metrics(results)
+        ranks = [
+            (label, metrics[name], store.percentile_rank(name, metrics[name], assignment))
+            for name, label in PROGRESS_METRICS.items() if name in metrics
+        ]
+        st.dataframe(pd.DataFrame(ranks, columns=["Metric", "This recording", f"Percentile in {assignment}"]))
+
+def screen_upload(audio_file):
+    """Pre-screen an upload before it is queued; returns the screen result."""
+    workspace = tempfile.mkdtemp(prefix="session-", dir=TEMP_DIR)
+    try:
+        extension = os.path.splitext(audio_file.name)[1].lower() or ".wav"
+        audio_path = os.path.join(workspace, "input" + extension)
+        with open(audio_path, "wb") as f:
+            f.write(audio_file.getbuffer())
+        return prescreen(audio_path)
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+def analyze_in_session(audio_file, sections, feedback_section, student=None, assignment=None):
+    """Analyze the upload in this session, rendering stages as they finish; returns the results."""
+    # Each session gets its own workspace so concurrent uploads never collide
+    workspace = tempfile.mkdtemp(prefix="session-", dir=TEMP_DIR)
+    try:
+        extension = os.path.splitext(audio_file.name)[1].lower() or ".wav"
+        audio_path = os.path.join(workspace, "input" + extension)
+        with open(audio_path, "wb") as f:
             f.write(audio_file.getbuffer())
 
+        # Reject unusable uploads before any model runs, then decode and
+        # resample once, trimmed to the speech; every analyzer shares this buffer
+        try:
+            audio, screen = admit(audio_path)
+        except AdmissionError as e:
+            st.error(str(e))
+            return None
+        show_screen(screen)
+
         # Process the audio
         with st.spinner("Analyzing your presentation..."):
-            # Transcribe audio
-            transcription = transcribe_audio("temp_audio.wav")
-            
-            # Analyze different aspects
-            voice_activity = detect_voice_activity("temp_audio.wav")
-            pacing_analysis = analyze_pacing("temp_audio.wav")
-            filler_words = detect_filler_words(transcription)
-            emotions = analyze_emotion("temp_audio.wav")
-            
-            # Generate feedback
-            feedback = generate_feedback(
-                transcription=transcription,
-                voice_activity=voice_activity,
-                pacing=pacing_analysis,
-                filler_words=filler_words,
-                emotions=emotions
-            )
-
-            # Display results
-            st.subheader("Analysis Results")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.write("### Speech Clarity")
-                st.write(filler_words)
-                
-                st.write("### Pacing Analysis")
-                st.write(pacing_analysis)
-            
-            with col2:
-                st.write("### Emotional Analysis")
-                st.write(emotions)
-                
-                st.write("### Voice Activity")
-                st.write(voice_activity)
-            
-            st.subheader("Detailed Feedback")
-            st.write(feedback)
 
+            # Run independent stages concurrently and render partial results;
+            # stages already computed for this recording come from the cache
+            feedback_stage = next((stage for stage in DEFAULT_STAGES if stage.name == "feedback"), None)
+            stages = [stage for stage in DEFAULT_STAGES if stage is not feedback_stage]
+            results = {}
+            for stage, result in iter_analysis(audio, stages, cache=get_result_cache()):
+                results[stage] = result
+                if stage in sections:
+                    render(sections[stage], stage, result)
+            results["prescreen"] = screen
+
+        # Reruns of the same upload replace its earlier entry
+        get_results_store().save(results, student, assignment, source=f"{student}:{assignment}:{audio.digest()}",
+                                 filename=audio_file.name)
+
+        # Stream the LLM feedback so its first lines show while the rest is written
+        if feedback_stage is not None:
+            with feedback_section.container():
+                st.write("#### Coach's notes")
+                feedback = st.write_stream(stream_feedback(**{dep: results[dep] for dep in feedback_stage.deps}))
+            show_fallback(results, feedback, feedback_section)
+        return results
+    finally:
         # Clean up
-        os.remove("temp_audio.wav")
+        shutil.rmtree(workspace, ignore_errors=True)
+
+def analyze_queued(audio_file, sections, feedback_section, student=None, assignment=None):
+    """Submit the upload to the job queue and render results when a worker finishes; returns the results."""
+    queue = JobQueue()
+    # Streamlit reruns the script on every interaction; submit each upload once,
+    # keyed on its content so a different file with the same name is its own job
+    digest = hashlib.sha256(audio_file.getvalue()).hexdigest()
+    key = f"job:{digest}:{student}:{assignment}"
+    if key not in st.session_state:
+        # Rejected uploads never take a place in the queue
+        screen = screen_upload(audio_file)
+        if not screen["admitted"]:
+            st.error(screen["message"])
+            return None
+        show_screen(screen)
+        try:
+            st.session_state[key] = queue.submit(audio_file.getvalue(), audio_file.name,
+                                                 student=student, assignment=assignment)
+        except QueueFullError:
+            st.error("The analysis queue is full right now. Please try again in a few minutes.")
+            return None
+    job_id = st.session_state[key]
+
+    status = st.empty()
+    while True:
+        job = queue.get(job_id)
+        if job is None or job["status"] == FAILED:
+            status.error(f"Analysis failed: {job['error'] if job else 'job not found'}")
+            return None
+        if job["status"] == DONE:
+            status.empty()
+            break
+        if job["queue_position"] is not None:
+            status.info(f"Waiting in queue: {job['queue_position']} submission(s) ahead of yours")
+        else:
+            status.info("Analyzing your presentation...")
+        time.sleep(JOB_POLL_INTERVAL)
+
+    results = job["result"]
+    for stage, result in results.items():
+        if stage in sections:
+            render(sections[stage], stage, result)
+    if "feedback" in results:
+        with feedback_section.container():
+            st.write("#### Coach's notes")
+            st.markdown(results["feedback"])
+        show_fallback(results, results["feedback"], feedback_section)
+    return results
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -1,73 +1,192 @@
-from transformers import pipeline
-import torch
 import numpy as np
-from typing import Dict, List
-import os
-from dotenv import load_dotenv
-import speechbrain as sb
+from typing import Dict, List, Optional, Sequence, Tuple
 
-# Load environment variables
-load_dotenv()
+from config.config import (
+    EMOTION_BATCH_SIZE,
+    EMOTION_MIN_SEGMENT_SECONDS,
+    EMOTION_NUM_THREADS,
+    EMOTION_SEGMENT_SECONDS,
+)
+from utils.audio_buffer import AudioBuffer, AudioSource, as_audio_buffer
+from utils.instrumentation import record_error, timed
+from utils.model_registry import get_model
+from utils.records import EmotionResult, EmotionTimeline
 
-# Get Hugging Face token from environment variables
-hf_token = os.getenv("HUGGINGFACE_TOKEN")
+def speech_windows(
+    duration: float,
+    speech_segments: Optional[List[Tuple[float, float]]] = None,
+    max_seconds: float = EMOTION_SEGMENT_SECONDS,
+    min_seconds: float = EMOTION_MIN_SEGMENT_SECONDS
+) -> List[Tuple[float, float]]:
+    """
+    Split speech into model-sized windows.
+    
+    Args:
+        duration (float): Audio duration in seconds
+        speech_segments (Optional[List[Tuple[float, float]]]): VAD speech
+            segments; without them the whole recording is windowed
+        max_seconds (float): Longest window
+        min_seconds (float): Windows shorter than this are dropped
+        
+    Returns:
+        List[Tuple[float, float]]: (start, end) times of each window
+    """
+    segments = speech_segments if speech_segments else [(0.0, duration)]
+    windows = []
+    for start, end in segments:
+        # Split long segments evenly rather than leaving a short remainder
+        pieces = max(1, int(np.ceil((end - start) / max_seconds)))
+        edges = np.linspace(start, end, pieces + 1)
+        windows.extend(
+            (float(a), float(b)) for a, b in zip(edges[:-1], edges[1:])
+            if b - a >= min_seconds
+        )
+    if not windows and duration > 0:
+        # Too little speech for the minimum; classify the longest stretch we have
+        start, end = max(segments, key=lambda s: s[1] - s[0])
+        windows = [(float(start), float(min(end, start + max_seconds)))]
+    return windows
+
+def _classify_windows(classifier, items: List[Tuple[AudioBuffer, int, int]],
+                      batch_size: int) -> Tuple[Tuple[str, ...], np.ndarray]:
+    import torch
+
+    # Sort by length so each batch needs little padding, and reuse one
+    # preallocated batch tensor for every forward pass
+    order = sorted(range(len(items)), key=lambda i: items[i][2] - items[i][1])
+    longest = max(end - start for _, start, end in items)
+    batch = torch.zeros(min(batch_size, len(items)), longest)
+    
+    scores: Optional[np.ndarray] = None
+    with torch.inference_mode():
+        for first in range(0, len(order), batch_size):
+            chunk = order[first:first + batch_size]
+            width = max(items[i][2] - items[i][1] for i in chunk)
+            wavs = batch[:len(chunk), :width]
+            wavs.zero_()
+            for row, i in enumerate(chunk):
+                buffer, start, end = items[i]
+                wavs[row, :end - start] = buffer.as_tensor()[start:end]
+            wav_lens = torch.tensor([(items[i][2] - items[i][1]) / width for i in chunk])
+            
+            out_prob, _, _, _ = classifier.classify_batch(wavs, wav_lens)
+            
+            # The model ends in a log-softmax, so softmax recovers
+            # per-class probabilities
+            probabilities = torch.softmax(out_prob.reshape(len(chunk), -1), dim=-1)
+            if scores is None:
+                scores = np.empty((len(items), probabilities.shape[1]), dtype=np.float32)
+            scores[chunk] = probabilities.numpy()
+    label_encoder = classifier.hparams.label_encoder
+    return tuple(label_encoder.ind2lab[index] for index in range(scores.shape[1])), scores
+
+def _summarize_timeline(timeline: EmotionTimeline) -> EmotionResult:
+    # Aggregate weighted by window duration
+    weights = timeline.end.astype(np.float64) - timeline.start
+    scores = weights @ timeline.scores / weights.sum()
+    emotions = dict(zip(timeline.labels, scores.tolist()))
+        
+    # Get dominant emotion
+    dominant_emotion = max(emotions.items(), key=lambda x: x[1])
+    
+    # Calculate emotion distribution
+    total_score = sum(emotions.values())
+    emotion_distribution = {
+        emotion: (score / total_score * 100) 
+        for emotion, score in emotions.items()
+    }
+    
+    return EmotionResult(
+        dominant_emotion=dominant_emotion[0],
+        confidence=dominant_emotion[1],
+        emotion_distribution=emotion_distribution,
+        all_emotions=emotions,
+        timeline=timeline
+    )
 
-# Initialize emotion classifier
-try:
-    # Load SpeechBrain emotion recognition model
-    emotion_classifier = sb.pretrained.EncoderClassifier.from_hparams(
-        source="speechbrain/emotion-recognition-wav2vec2-IEMOCAP",
-        savedir="models/emotion_recognition",
-        run_opts={"device": "cuda" if torch.cuda.is_available() else "cpu"}
+def _neutral_result() -> EmotionResult:
+    return EmotionResult(
+        dominant_emotion="neutral",
+        confidence=0.0,
+        emotion_distribution={},
+        all_emotions={},
+        timeline=EmotionTimeline.empty()
     )
-except Exception as e:
-    print(f"Error loading emotion model: {str(e)}")
-    emotion_classifier = None
 
-def analyze_emotion(audio_path: str) -> Dict:
+@timed("emotions")
+def analyze_emotion_batch(
+    audios: Sequence[AudioSource],
+    voice_activities: Optional[Sequence[Optional[Dict]]] = None,
+    batch_size: int = EMOTION_BATCH_SIZE
+) -> List[EmotionResult]:
     """
-    Analyze emotional content of speech using SpeechBrain model.
+    Analyze emotion for several recordings, sharing forward passes.
+    
+    Windows from every recording go into the same padded batches, so a
+    worker handling many short submissions keeps its batches full.
     
     Args:
-        audio_path (str): Path to the audio file
+        audios (Sequence[AudioSource]): Decoded AudioBuffers or paths
+        voice_activities (Optional[Sequence[Optional[Dict]]]): VAD result per recording
+        batch_size (int): Windows per forward pass
         
     Returns:
-        Dict: Emotion analysis results
+        List[EmotionResult]: Emotion analysis results per recording, in input order
     """
     try:
-        if emotion_classifier is None:
-            raise Exception("Emotion classifier not initialized")
-            
-        # Get emotion predictions
-        predictions = emotion_classifier.classify_file(audio_path)
+        # Get the shared emotion classifier (loaded once per process)
+        emotion_classifier = get_model("emotion")
+        if EMOTION_NUM_THREADS > 0:
+            import torch
+            torch.set_num_threads(EMOTION_NUM_THREADS)
         
-        # Process predictions
-        emotions = {}
-        for emotion, score in zip(predictions[1], predictions[0]):
-            emotions[emotion] = float(score)
-            
-        # Get dominant emotion
-        dominant_emotion = max(emotions.items(), key=lambda x: x[1])
-        
-        # Calculate emotion distribution
-        total_score = sum(emotions.values())
-        emotion_distribution = {
-            emotion: (score / total_score * 100) 
-            for emotion, score in emotions.items()
-        }
+        voice_activities = voice_activities or [None] * len(audios)
+        items, owners = [], []
+        for owner, (audio, voice_activity) in enumerate(zip(audios, voice_activities)):
+            buffer = as_audio_buffer(audio)
+            segments = voice_activity.get("speech_segments") if voice_activity else None
+            for start, end in speech_windows(buffer.duration, segments):
+                items.append((buffer, int(start * buffer.sample_rate), int(end * buffer.sample_rate)))
+                owners.append(owner)
+        if not items:
+            raise ValueError("No audio to classify")
         
-        return {
-            "dominant_emotion": dominant_emotion[0],
-            "confidence": dominant_emotion[1],
-            "emotion_distribution": emotion_distribution,
-            "all_emotions": emotions
-        }
+        labels, scores = _classify_windows(emotion_classifier, items, batch_size)
+        owners = np.array(owners)
+        bounds = np.array([(start, end) for _, start, end in items], dtype=np.float64)
+        bounds /= np.array([buffer.sample_rate for buffer, _, _ in items])[:, None]
+        results = []
+        for owner in range(len(audios)):
+            rows = owners == owner
+            if not rows.any():
+                results.append(_neutral_result())
+                continue
+            results.append(_summarize_timeline(EmotionTimeline(bounds[rows, 0], bounds[rows, 1], labels, scores[rows])))
+        return results
         
     except Exception as e:
         print(f"Error in emotion analysis: {str(e)}")
-        return {
-            "dominant_emotion": "neutral",
-            "confidence": 0.0,
-            "emotion_distribution": {},
-            "all_emotions": {}
-        } 
\ No newline at end of file
+        record_error("emotions", e)
+        return [_neutral_result() for _ in audios]
+
+def analyze_emotion(
+    audio: AudioSource,
+    voice_activity: Optional[Dict] = None,
+    batch_size: int = EMOTION_BATCH_SIZE
+) -> EmotionResult:
+    """
+    Analyze emotional content of speech using SpeechBrain model.
+    
+    Speech is cut into VAD-bounded windows that are classified in padded
+    batches, so peak memory depends on the batch and window size rather than
+    on the length of the talk.
+    
+    Args:
+        audio (AudioSource): Decoded AudioBuffer or path to the audio file
+        voice_activity (Optional[Dict]): Output of detect_voice_activity
+        batch_size (int): Windows per forward pass
+        
+    Returns:
+        EmotionResult: Emotion analysis results and per-window timeline
+    """
+    return analyze_emotion_batch([audio], [voice_activity], batch_size)[0]
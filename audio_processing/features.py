@@ -0,0 +1,237 @@
+import threading
+from collections.abc import Mapping
+from typing import Callable, Dict, Iterator
+
+import numpy as np
+import scipy.fft
+
+from config.config import (
+    ENERGY_VAD_MAX_ZCR,
+    ENERGY_VAD_MIN_DB,
+    F0_FRAME_SECONDS,
+    F0_MAX,
+    F0_MIN,
+    F0_SAMPLE_RATE,
+    F0_THRESHOLD,
+    FEATURE_HOP_LENGTH,
+    FEATURE_N_FFT,
+    FEATURE_N_MELS,
+    VOICED_MAX_DB_BELOW_PEAK,
+)
+from utils.audio_buffer import AudioSource, as_audio_buffer
+
+
+def yin_pitch(frames: np.ndarray, sample_rate: int, fmin: float = F0_MIN, fmax: float = F0_MAX,
+              threshold: float = F0_THRESHOLD) -> np.ndarray:
+    """
+    YIN pitch estimate of many frames at once.
+
+    The difference function of every frame comes from one batched FFT
+    autocorrelation plus cumulative energies, and the period search is a
+    masked argmax, so there is no loop over frames.
+
+    Args:
+        frames (np.ndarray): (n_frames, frame_length) float32 frames
+        sample_rate (int): Sample rate of the frames
+        fmin (float): Lowest pitch searched, in Hz
+        fmax (float): Highest pitch searched, in Hz
+        threshold (float): Normalized difference below which the first dip is taken
+
+    Returns:
+        np.ndarray: Pitch in Hz per frame
+    """
+    n, width = frames.shape
+    if n == 0:
+        return np.zeros(0, dtype=np.float32)
+    tau_min = max(1, int(sample_rate / fmax))
+    tau_max = min(width // 2, int(np.ceil(sample_rate / fmin)))
+    lags = np.arange(tau_max + 2)
+
+    # d(tau) = sum over j < width - tau of (x[j] - x[j + tau])^2
+    size = scipy.fft.next_fast_len(width + tau_max + 2, real=True)
+    spectrum = scipy.fft.rfft(frames, size, axis=1)
+    acf = scipy.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2, size, axis=1)[:, :tau_max + 2]
+    energy = np.zeros((n, width + 1), dtype=np.float32)
+    np.cumsum(frames * frames, axis=1, out=energy[:, 1:])
+    diff = np.maximum(energy[:, width - lags] + energy[:, width:] - energy[:, lags] - 2 * acf, 0)
+
+    # Cumulative mean normalized difference
+    cmnd = np.ones_like(diff)
+    cmnd[:, 1:] = diff[:, 1:] * lags[1:] / np.maximum(np.cumsum(diff[:, 1:], axis=1), 1e-12)
+
+    # First local minimum under the threshold, else the global minimum
+    region = cmnd[:, tau_min:tau_max + 1]
+    inner = region[:, 1:-1]
+    dips = (inner < region[:, :-2]) & (inner <= region[:, 2:]) & (inner < threshold)
+    tau = np.where(dips.any(axis=1), np.argmax(dips, axis=1) + 1, np.argmin(region, axis=1)) + tau_min
+
+    # Parabolic interpolation around the chosen lag
+    rows = np.arange(n)
+    before, at, after = cmnd[rows, tau - 1], cmnd[rows, tau], cmnd[rows, tau + 1]
+    curvature = before - 2 * at + after
+    safe = np.where(np.abs(curvature) > 1e-12, curvature, 1.0)
+    shift = np.where(np.abs(curvature) > 1e-12, 0.5 * (before - after) / safe, 0.0)
+    return (sample_rate / (tau + np.clip(shift, -1, 1))).astype(np.float32)
+
+
+class FrameFeatures(Mapping):
+    """
+    Frame-level features of one recording, computed on first access.
+
+    Every feature shares one frame grid: centered frames every `hop_length`
+    samples, so frame i describes the audio around i * hop_length. Arrays are
+    float32 (bool for masks), read-only, and computed at most once even when
+    several analyzers ask for them concurrently.
+
+    Available features:
+        stft_magnitude  (1 + n_fft // 2, n_frames) magnitude spectrogram
+        power           (1 + n_fft // 2, n_frames) power spectrogram
+        log_mel         (n_mels, n_frames) log-mel in Whisper's scaling
+        rms             (n_frames,) root-mean-square energy
+        rms_db          (n_frames,) RMS energy in dBFS
+        zcr             (n_frames,) zero crossings per sample
+        f0              (n_frames,) pitch in Hz, NaN where unvoiced
+        voiced          (n_frames,) frames loud and tonal enough to carry pitch
+    """
+
+    def __init__(self, audio: AudioSource, n_fft: int = FEATURE_N_FFT, hop_length: int = FEATURE_HOP_LENGTH,
+                 n_mels: int = FEATURE_N_MELS):
+        self.buffer = as_audio_buffer(audio)
+        self.sample_rate = self.buffer.sample_rate
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.n_mels = n_mels
+        self._extractors: Dict[str, Callable[[], np.ndarray]] = {
+            "stft_magnitude": self._stft_magnitude,
+            "power": self._power,
+            "log_mel": self._log_mel,
+            "rms": self._rms,
+            "rms_db": self._rms_db,
+            "zcr": self._zcr,
+            "f0": self._f0,
+            "voiced": self._voiced,
+        }
+        self._values: Dict[str, np.ndarray] = {}
+        self._locks = {name: threading.Lock() for name in self._extractors}
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        if name not in self._extractors:
+            raise KeyError(name)
+        value = self._values.get(name)
+        if value is None:
+            with self._locks[name]:
+                value = self._values.get(name)
+                if value is None:
+                    value = self._extractors[name]()
+                    value.setflags(write=False)
+                    self._values[name] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._extractors)
+
+    def __len__(self) -> int:
+        return len(self._extractors)
+
+    def is_computed(self, name: str) -> bool:
+        return name in self._values
+
+    @property
+    def n_frames(self) -> int:
+        return 1 + len(self.buffer) // self.hop_length
+
+    @property
+    def frame_duration(self) -> float:
+        """Seconds between frames."""
+        return self.hop_length / self.sample_rate
+
+    def frame_times(self) -> np.ndarray:
+        """Center time of each frame in seconds."""
+        return (np.arange(self.n_frames) * self.frame_duration).astype(np.float32)
+
+    def _frames(self) -> np.ndarray:
+        # Centered, reflect-padded frames on the shared grid (a strided view)
+        samples = self.buffer.samples
+        pad = self.n_fft // 2
+        mode = "reflect" if len(samples) > pad else "constant"
+        padded = np.pad(samples, pad, mode=mode)
+        return np.lib.stride_tricks.sliding_window_view(padded, self.n_fft)[::self.hop_length][:self.n_frames]
+
+    def _stft_magnitude(self) -> np.ndarray:
+        import librosa
+        stft = librosa.stft(self.buffer.samples, n_fft=self.n_fft, hop_length=self.hop_length,
+                            window="hann", center=True, pad_mode="reflect")
+        return np.abs(stft).astype(np.float32)
+
+    def _power(self) -> np.ndarray:
+        return np.square(self["stft_magnitude"])
+
+    def _log_mel(self) -> np.ndarray:
+        # Same filters and scaling as whisper.audio.log_mel_spectrogram
+        import librosa
+        filters = librosa.filters.mel(sr=self.sample_rate, n_fft=self.n_fft, n_mels=self.n_mels)
+        log_spec = np.log10(np.maximum(filters @ self["power"], 1e-10))
+        log_spec = np.maximum(log_spec, log_spec.max(initial=-10.0) - 8.0)
+        return ((log_spec + 4.0) / 4.0).astype(np.float32)
+
+    def _rms(self) -> np.ndarray:
+        frames = self._frames()
+        return np.sqrt(np.einsum('ij,ij->i', frames, frames) / self.n_fft).astype(np.float32)
+
+    def _rms_db(self) -> np.ndarray:
+        return (20 * np.log10(np.maximum(self["rms"], 1e-5))).astype(np.float32)
+
+    def _zcr(self) -> np.ndarray:
+        signs = np.signbit(self._frames())
+        return (np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.n_fft).astype(np.float32)
+
+    def _voiced(self) -> np.ndarray:
+        rms_db = self["rms_db"]
+        peak = rms_db.max(initial=-100.0)
+        # The absolute floor keeps digital silence from counting as its own peak
+        loud = (rms_db > peak - VOICED_MAX_DB_BELOW_PEAK) & (rms_db > ENERGY_VAD_MIN_DB)
+        return loud & (self["zcr"] < ENERGY_VAD_MAX_ZCR)
+
+    def _f0(self) -> np.ndarray:
+        # Pitch only needs the band below F0_MAX, so voiced frames are searched
+        # on audio decimated to F0_SAMPLE_RATE; a box filter is enough
+        # anti-aliasing for the periodicity search
+        f0 = np.full(self.n_frames, np.nan, dtype=np.float32)
+        factor = self.sample_rate // F0_SAMPLE_RATE
+        if factor < 1 or self.hop_length % factor or self.sample_rate % F0_SAMPLE_RATE:
+            factor = 1
+        samples = self.buffer.samples
+        low = samples[:len(samples) // factor * factor].reshape(-1, factor).mean(axis=1, dtype=np.float32)
+        rate = self.sample_rate // factor
+        width = int(F0_FRAME_SECONDS * rate)
+        if len(low) <= width // 2:
+            return f0
+        padded = np.pad(low, width // 2, mode="reflect")
+        frames = np.lib.stride_tricks.sliding_window_view(padded, width)[::self.hop_length // factor]
+        voiced = self["voiced"].copy()
+        voiced[len(frames):] = False
+        f0[voiced] = yin_pitch(frames[:self.n_frames][voiced[:len(frames)]], rate)
+        return f0
+
+
+_features_lock = threading.Lock()
+
+
+def get_features(audio: AudioSource) -> FrameFeatures:
+    """
+    Shared feature cache of a recording.
+
+    Analyzers handed the same AudioBuffer get the same FrameFeatures, so each
+    feature is computed once per upload. The cache lives as long as the buffer.
+
+    Args:
+        audio (AudioSource): Decoded AudioBuffer or path to the audio file
+
+    Returns:
+        FrameFeatures: Lazily computed features
+    """
+    buffer = as_audio_buffer(audio)
+    with _features_lock:
+        if buffer.features is None:
+            buffer.features = FrameFeatures(buffer)
+        return buffer.features
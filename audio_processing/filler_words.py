@@ -1,77 +1,185 @@
-from typing import Dict, List
-import re
+from typing import Dict, List, Optional, Sequence, Union
+import string
+from config.config import COMMON_FILLER_WORDS
+from utils.instrumentation import record_error, timed
+from utils.records import FillerWordsResult
 
 # Common filler words to detect
-FILLER_WORDS = {
-    'um': 0,
-    'uh': 0,
-    'like': 0,
-    'you know': 0,
-    'sort of': 0,
-    'kind of': 0,
-    'basically': 0,
-    'literally': 0,
-    'actually': 0,
-    'so': 0,
-    'well': 0,
-    'right': 0,
-    'okay': 0,
-    'now': 0,
-    'just': 0
-}
-
-def detect_filler_words(transcription: str) -> Dict:
+FILLER_WORDS = dict.fromkeys(COMMON_FILLER_WORDS, 0)
+
+_PHRASE_END = "$"
+
+def _normalize(token: str) -> str:
+    return token.strip(string.punctuation + "’“”").lower()
+
+class FillerMatcher:
     """
-    Detect and count filler words in the transcribed text.
-    
-    Args:
-        transcription (str): Transcribed text
-        
-    Returns:
-        Dict: Statistics about filler word usage
+    Single-pass filler word matcher over a token trie.
+
+    The vocabulary (including multi-word phrases such as "you know") is built
+    into a trie once. Each transcript token is visited once and matched
+    leftmost-longest, so cost is proportional to the new text whether the
+    transcript arrives all at once or segment by segment through feed().
     """
-    try:
-        # Initialize counters
-        filler_counts = FILLER_WORDS.copy()
-        total_words = len(transcription.split())
-        
-        # Convert to lowercase for case-insensitive matching
-        text = transcription.lower()
-        
-        # Count occurrences of each filler word
-        for filler in filler_counts.keys():
-            # Use word boundaries to avoid partial matches
-            pattern = r'\b' + re.escape(filler) + r'\b'
-            count = len(re.findall(pattern, text))
-            filler_counts[filler] = count
-        
-        # Calculate total filler words
-        total_fillers = sum(filler_counts.values())
-        
-        # Calculate filler word percentage
-        filler_percentage = (total_fillers / total_words * 100) if total_words > 0 else 0
-        
-        # Get most common filler words
+
+    def __init__(self, fillers: Sequence[str] = COMMON_FILLER_WORDS):
+        self.fillers = list(fillers)
+        self._trie: Dict = {}
+        for filler in self.fillers:
+            node = self._trie
+            for word in filler.lower().split():
+                node = node.setdefault(word, {})
+            node[_PHRASE_END] = filler
+        self.reset()
+
+    def reset(self) -> None:
+        self.filler_counts = dict.fromkeys(self.fillers, 0)
+        self.matches: List[Dict] = []
+        self.total_words = 0
+        self._chars = 0
+        self._pending: List[Dict] = []
+
+    def feed(self, segment: Union[str, Dict]) -> List[Dict]:
+        """
+        Match fillers in the next piece of transcript.
+
+        A trailing token that could still start or continue a phrase is held
+        back until the next call (or flush()).
+
+        Args:
+            segment (Union[str, Dict]): Text, or a transcript segment/transcript
+                with "text" and optional timed "words"
+
+        Returns:
+            List[Dict]: Newly found fillers with character, word and time positions
+        """
+        self._pending.extend(self._tokenize(segment))
+        return self._match(final=False)
+
+    def flush(self) -> List[Dict]:
+        """
+        Resolve any held-back tokens at the end of the transcript.
+
+        Returns:
+            List[Dict]: Newly found fillers
+        """
+        return self._match(final=True)
+
+    def result(self) -> FillerWordsResult:
+        """
+        Statistics about filler word usage so far.
+
+        Returns:
+            FillerWordsResult: Counts, percentages, most common fillers and positions
+        """
+        total_fillers = sum(self.filler_counts.values())
         most_common = sorted(
-            [(word, count) for word, count in filler_counts.items() if count > 0],
+            [(word, count) for word, count in self.filler_counts.items() if count > 0],
             key=lambda x: x[1],
             reverse=True
         )
-        
-        return {
-            "total_filler_words": total_fillers,
-            "filler_percentage": filler_percentage,
-            "total_words": total_words,
-            "filler_counts": filler_counts,
-            "most_common_fillers": most_common[:5]  # Top 5 most used filler words
-        }
-        
+        return FillerWordsResult(
+            total_filler_words=total_fillers,
+            filler_percentage=(total_fillers / self.total_words * 100) if self.total_words > 0 else 0,
+            total_words=self.total_words,
+            filler_counts=dict(self.filler_counts),
+            most_common_fillers=most_common[:5],  # Top 5 most used filler words
+            positions=list(self.matches)
+        )
+
+    def _tokenize(self, segment: Union[str, Dict]) -> List[Dict]:
+        if isinstance(segment, str):
+            pieces = [(segment, None, None)]
+        elif segment.get("words"):
+            pieces = [(word["word"], word.get("start"), word.get("end")) for word in segment["words"]]
+        else:
+            pieces = [(segment.get("text", ""), None, None)]
+
+        tokens = []
+        for text, start, end in pieces:
+            position = 0
+            for raw in text.split():
+                char_start = text.index(raw, position)
+                position = char_start + len(raw)
+                tokens.append({
+                    "norm": _normalize(raw),
+                    "joins": raw[-1] not in string.punctuation,
+                    "char_start": self._chars + char_start,
+                    "char_end": self._chars + position,
+                    "word_index": self.total_words,
+                    "start": start,
+                    "end": end
+                })
+                self.total_words += 1
+            self._chars += len(text)
+        return tokens
+
+    def _match(self, final: bool) -> List[Dict]:
+        tokens = self._pending
+        found = []
+        i = 0
+        while i < len(tokens):
+            node = self._trie
+            longest = None
+            j = i
+            waiting = False
+            while j < len(tokens) and tokens[j]["norm"] in node:
+                node = node[tokens[j]["norm"]]
+                j += 1
+                if _PHRASE_END in node:
+                    longest = (j, node[_PHRASE_END])
+                # Punctuation after a word ends any phrase it could be part of
+                if not tokens[j - 1]["joins"]:
+                    break
+            else:
+                waiting = j == len(tokens) and len(node) > (_PHRASE_END in node) and not final
+            if waiting:
+                break
+            if longest is None:
+                i += 1
+                continue
+            end, filler = longest
+            match = {
+                "filler": filler,
+                "char_start": tokens[i]["char_start"],
+                "char_end": tokens[end - 1]["char_end"],
+                "word_index": tokens[i]["word_index"],
+                "start": tokens[i]["start"],
+                "end": tokens[end - 1]["end"]
+            }
+            self.filler_counts[filler] += 1
+            self.matches.append(match)
+            found.append(match)
+            i = end
+        self._pending = tokens[i:]
+        return found
+
+@timed("filler_words")
+def detect_filler_words(transcription: Union[str, Dict]) -> FillerWordsResult:
+    """
+    Detect and count filler words in the transcribed text.
+
+    Args:
+        transcription (Union[str, Dict]): Transcribed text, or a timestamped
+            transcript whose word timings are attached to each match
+
+    Returns:
+        FillerWordsResult: Statistics about filler word usage
+    """
+    try:
+        matcher = FillerMatcher()
+        matcher.feed(transcription)
+        matcher.flush()
+        return matcher.result()
+
     except Exception as e:
         print(f"Error in filler word detection: {str(e)}")
-        return {
-            "total_filler_words": 0,
-            "filler_percentage": 0,
-            "total_words": 0,
-            "filler_counts": FILLER_WORDS,
-            "most_common_fillers": []
-        } 
\ No newline at end of file
+        record_error("filler_words", e)
+        return FillerWordsResult(
+            total_filler_words=0,
+            filler_percentage=0,
+            total_words=0,
+            filler_counts=dict(FILLER_WORDS),
+            most_common_fillers=[],
+            positions=[]
+        )
@@ -1,59 +1,150 @@
-import librosa
 import numpy as np
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+from config.config import (
+    LONG_PAUSE_DURATION,
+    MIN_SILENCE_DURATION,
+    PACING_HOP_SECONDS,
+    PACING_WINDOW_SECONDS,
+    PAUSE_HISTOGRAM_BINS,
+)
+from audio_processing.vad import detect_voice_activity, mask_to_segments
+from utils.audio_buffer import AudioSource, as_audio_buffer
+from utils.instrumentation import record_error, timed
+from utils.records import PacingResult, RateSeries
 
-def analyze_pacing(audio_path: str) -> Dict:
+def _word_times(transcript: Optional[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+    # Prefer word timestamps; fall back to spreading each segment's words evenly
+    if not transcript:
+        return np.zeros(0), np.zeros(0)
+    words = transcript.get("words") or []
+    if words:
+        starts = np.array([word["start"] for word in words], dtype=np.float64)
+        ends = np.array([word["end"] for word in words], dtype=np.float64)
+        return starts, ends
+    starts, ends = [], []
+    for segment in transcript.get("segments", []):
+        count = len(segment["text"].split())
+        if count:
+            edges = np.linspace(segment["start"], segment["end"], count + 1)
+            starts.extend(edges[:-1])
+            ends.extend(edges[1:])
+    return np.array(starts), np.array(ends)
+
+def _pause_durations(speech_mask: Optional[np.ndarray], frame_duration: float,
+                     word_starts: np.ndarray, word_ends: np.ndarray) -> np.ndarray:
+    # Silences between speech regions; leading and trailing silence is not a pause
+    if speech_mask is not None and len(speech_mask):
+        segments = np.array(mask_to_segments(speech_mask, frame_duration)).reshape(-1, 2)
+        gaps = segments[1:, 0] - segments[:-1, 1]
+    elif len(word_starts):
+        gaps = word_starts[1:] - word_ends[:-1]
+    else:
+        gaps = np.zeros(0)
+    return gaps[gaps >= MIN_SILENCE_DURATION]
+
+def _rate_over_time(word_starts: np.ndarray, word_ends: np.ndarray, total_duration: float) -> RateSeries:
+    # Words per minute in sliding windows, counting each word at its midpoint
+    window_starts = np.arange(0.0, max(total_duration - PACING_WINDOW_SECONDS, 0.0) + 1e-9, PACING_HOP_SECONDS)
+    window_ends = np.minimum(window_starts + PACING_WINDOW_SECONDS, total_duration)
+    midpoints = np.sort((word_starts + word_ends) / 2)
+    counts = np.searchsorted(midpoints, window_ends) - np.searchsorted(midpoints, window_starts)
+    lengths = np.maximum(window_ends - window_starts, 1e-9)
+    return RateSeries(time=(window_starts + window_ends) / 2, wpm=counts / lengths * 60)
+
+@timed("pacing")
+def analyze_pacing(
+    audio: Optional[AudioSource] = None,
+    transcript: Optional[Dict] = None,
+    voice_activity: Optional[Dict] = None
+) -> PacingResult:
     """
     Analyze speech pacing including rate, pauses, and rhythm.
     
+    Speaking rate comes from the transcript's word timestamps and pauses from
+    the VAD speech mask, both of which the pipeline has already computed, so
+    no additional spectral analysis is needed.
+    
     Args:
-        audio_path (str): Path to the audio file
+        audio (Optional[AudioSource]): Decoded AudioBuffer or path to the audio file,
+            used for the total duration and, if no VAD result is given, for
+            energy-based VAD on its shared frame features
+        transcript (Optional[Dict]): Output of transcribe_with_timestamps
+        voice_activity (Optional[Dict]): Output of detect_voice_activity
         
     Returns:
-        Dict: Pacing analysis results
+        PacingResult: Pacing analysis results
     """
     try:
-        # Load audio file
-        y, sr = librosa.load(audio_path)
-        
-        # Extract tempo and beat frames
-        tempo, beat_frames = librosa.beat.beat_track(y=y, sr=sr)
+        buffer = as_audio_buffer(audio) if audio is not None else None
+        if voice_activity is None:
+            if buffer is None:
+                raise ValueError("analyze_pacing needs audio or a voice activity result")
+            # Standalone calls detect pauses from the buffer's shared
+            # RMS/ZCR features rather than another pass over the PCM
+            voice_activity = detect_voice_activity(buffer, backend="energy")
         
-        # Calculate speech rate (words per minute)
-        # This is a simplified version - in practice, you'd want to use
-        # a more sophisticated method combining with transcription
-        speech_rate = tempo * 1.5  # Approximate words per minute
+        speech_mask = voice_activity.get("speech_mask")
+        frame_duration = voice_activity.get("frame_duration", 0.03)
+        word_starts, word_ends = _word_times(transcript)
         
-        # Detect pauses
-        intervals = librosa.effects.split(y, top_db=20)
-        pause_durations = []
+        if buffer is not None:
+            total_duration = buffer.duration
+        else:
+            total_duration = voice_activity.get("total_frames", 0) * frame_duration
+        if speech_mask is not None and len(speech_mask):
+            speaking_time = float(np.count_nonzero(speech_mask)) * frame_duration
+        else:
+            speaking_time = float(np.sum(word_ends - word_starts))
         
-        for i in range(len(intervals) - 1):
-            pause_duration = (intervals[i+1][0] - intervals[i][1]) / sr
-            if pause_duration > 0.5:  # Only count pauses longer than 0.5 seconds
-                pause_durations.append(pause_duration)
+        # Speaking rate from real word counts
+        total_words = len(word_starts)
+        speech_rate = total_words / total_duration * 60 if total_duration > 0 else 0
+        articulation_rate = total_words / speaking_time * 60 if speaking_time > 0 else 0
+        rate_over_time = _rate_over_time(word_starts, word_ends, total_duration)
+        speaking_windows = rate_over_time.wpm[rate_over_time.wpm > 0]
+        rate_variability = float(np.std(speaking_windows) / np.mean(speaking_windows)) if len(speaking_windows) > 1 else 0
         
-        # Calculate statistics
-        avg_pause_duration = np.mean(pause_durations) if pause_durations else 0
-        total_pause_time = sum(pause_durations)
-        total_duration = len(y) / sr
+        # Pause statistics and distribution
+        pause_durations = _pause_durations(speech_mask, frame_duration, word_starts, word_ends)
+        avg_pause_duration = float(np.mean(pause_durations)) if len(pause_durations) else 0
+        total_pause_time = float(np.sum(pause_durations))
+        bins = list(PAUSE_HISTOGRAM_BINS) + [np.inf]
+        histogram, _ = np.histogram(pause_durations, bins=bins)
+        labels = [f"{low:g}-{high:g}s" for low, high in zip(bins[:-2], bins[1:-1])] + [f">{bins[-2]:g}s"]
         
-        return {
-            "speech_rate": speech_rate,
-            "tempo": tempo,
-            "avg_pause_duration": avg_pause_duration,
-            "total_pause_time": total_pause_time,
-            "total_duration": total_duration,
-            "pause_percentage": (total_pause_time / total_duration) * 100 if total_duration > 0 else 0
-        }
+        return PacingResult(
+            speech_rate=speech_rate,
+            articulation_rate=articulation_rate,
+            total_words=total_words,
+            rate_variability=rate_variability,
+            avg_pause_duration=avg_pause_duration,
+            total_pause_time=total_pause_time,
+            total_duration=total_duration,
+            pause_percentage=(total_pause_time / total_duration) * 100 if total_duration > 0 else 0,
+            pause_count=len(pause_durations),
+            long_pause_count=int(np.count_nonzero(pause_durations >= LONG_PAUSE_DURATION)),
+            median_pause_duration=float(np.median(pause_durations)) if len(pause_durations) else 0,
+            p90_pause_duration=float(np.percentile(pause_durations, 90)) if len(pause_durations) else 0,
+            pause_histogram=dict(zip(labels, histogram.tolist())),
+            rate_over_time=rate_over_time
+        )
         
     except Exception as e:
         print(f"Error in pacing analysis: {str(e)}")
-        return {
-            "speech_rate": 0,
-            "tempo": 0,
-            "avg_pause_duration": 0,
-            "total_pause_time": 0,
-            "total_duration": 0,
-            "pause_percentage": 0
-        } 
\ No newline at end of file
+        record_error("pacing", e)
+        return PacingResult(
+            speech_rate=0,
+            articulation_rate=0,
+            total_words=0,
+            rate_variability=0,
+            avg_pause_duration=0,
+            total_pause_time=0,
+            total_duration=0,
+            pause_percentage=0,
+            pause_count=0,
+            long_pause_count=0,
+            median_pause_duration=0,
+            p90_pause_duration=0,
+            pause_histogram={},
+            rate_over_time=RateSeries.empty()
+        )
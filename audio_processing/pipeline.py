@@ -0,0 +1,309 @@
+import math
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from config.config import (
+    COMMON_FILLER_WORDS,
+    EMOTION_MODEL_SOURCE,
+    EMOTION_SEGMENT_SECONDS,
+    F0_SAMPLE_RATE,
+    FEEDBACK_BACKEND,
+    FEEDBACK_MODE,
+    GPT_MODEL,
+    LOCAL_LLM_MODEL,
+    MAX_TOKENS,
+    MODEL_QUANTIZATION,
+    PIPELINE_MAX_WORKERS,
+    PIPELINE_PROCESS_STAGES,
+    PROSODY_WINDOW_SECONDS,
+    TEMPERATURE,
+    VAD_AGGRESSIVENESS,
+    VAD_BACKEND,
+)
+from audio_processing.transcriber import transcribe_with_timestamps
+from audio_processing.vad import detect_voice_activity
+from audio_processing.pacing import analyze_pacing
+from audio_processing.filler_words import detect_filler_words
+from audio_processing.emotion import analyze_emotion
+from audio_processing.prosody import analyze_prosody
+from feedback.feedback_generator import FEEDBACK_UNAVAILABLE, generate_feedback
+from feedback.rules import generate_rule_feedback
+from utils.audio_buffer import AudioSource, as_audio_buffer
+from utils.inference import whisper_size_policy
+from utils.result_cache import ResultCache, stage_key
+
+
+class Stage(NamedTuple):
+    """
+    One node of the analysis DAG.
+
+    The stage function is called with the shared AudioBuffer (when
+    `uses_audio` is set) followed by the results of its dependencies as
+    keyword arguments named after the dependency stages.
+
+    `version` identifies the model and settings behind the result and is
+    part of its cache key; `cache_if` can reject results that should not be
+    cached, such as the fallback an analyzer returns after an error.
+    """
+    name: str
+    func: Callable
+    deps: Tuple[str, ...] = ()
+    uses_audio: bool = True
+    executor: str = "thread"
+    version: str = "1"
+    cache_if: Optional[Callable[[Any], bool]] = None
+
+
+def _executor_for(name: str) -> str:
+    return "process" if name in PIPELINE_PROCESS_STAGES else "thread"
+
+
+def transcript_text(transcript: Dict) -> str:
+    """Plain text of a timestamped transcript, for stages that only need words."""
+    return transcript["text"]
+
+
+def transcript_fillers(transcript: Dict) -> Dict:
+    """Filler words located by the word timestamps of a transcript."""
+    return detect_filler_words(transcript)
+
+
+DEFAULT_STAGES = [
+    Stage(
+        "transcript",
+        transcribe_with_timestamps,
+        executor=_executor_for("transcript"),
+        version=f"whisper-{whisper_size_policy()}-{MODEL_QUANTIZATION}-windowed:2",
+        # Transcripts from a size stepped down under load are not cached, so
+        # the recording gets its own rung again once the queue drains
+        cache_if=lambda result: bool(result["text"]) and not result.get("stepped_down")
+    ),
+    Stage("transcription", transcript_text, deps=("transcript",), uses_audio=False, cache_if=bool),
+    Stage(
+        "voice_activity",
+        detect_voice_activity,
+        executor=_executor_for("voice_activity"),
+        version=f"{VAD_BACKEND}-{VAD_AGGRESSIVENESS}:3",
+        cache_if=lambda result: result.get("total_frames", 0) > 0
+    ),
+    Stage(
+        "pacing",
+        analyze_pacing,
+        deps=("transcript", "voice_activity"),
+        executor=_executor_for("pacing"),
+        version="word-timings:2",
+        cache_if=lambda result: result.get("total_duration", 0) > 0
+    ),
+    Stage(
+        "emotions",
+        analyze_emotion,
+        deps=("voice_activity",),
+        executor=_executor_for("emotions"),
+        version=f"{EMOTION_MODEL_SOURCE}-{MODEL_QUANTIZATION}-{EMOTION_SEGMENT_SECONDS}:2",
+        cache_if=lambda result: bool(result.get("all_emotions"))
+    ),
+    Stage(
+        "prosody",
+        analyze_prosody,
+        deps=("voice_activity",),
+        executor=_executor_for("prosody"),
+        version=f"yin-{F0_SAMPLE_RATE}-{PROSODY_WINDOW_SECONDS}:3",
+        # At least one window had enough voiced frames to be scored
+        cache_if=lambda result: result.get("voiced_duration", 0) > 0 and math.isfinite(result.get("monotony_score", math.nan))
+    ),
+    Stage(
+        "filler_words",
+        transcript_fillers,
+        deps=("transcript",),
+        uses_audio=False,
+        version="|".join(COMMON_FILLER_WORDS) + ":2",
+        cache_if=lambda result: result.get("total_words", 0) > 0
+    ),
+    # Rule-based feedback takes microseconds, so it is never worth caching
+    # (and always reflects the current thresholds)
+    Stage(
+        "quick_feedback",
+        generate_rule_feedback,
+        deps=("voice_activity", "pacing", "filler_words", "emotions"),
+        uses_audio=False,
+        cache_if=lambda result: False
+    ),
+]
+
+if FEEDBACK_MODE != "rules":
+    DEFAULT_STAGES.append(Stage(
+        "feedback",
+        generate_feedback,
+        deps=("transcription", "voice_activity", "pacing", "filler_words", "emotions"),
+        uses_audio=False,
+        version=f"{FEEDBACK_BACKEND}-{GPT_MODEL if FEEDBACK_BACKEND == 'openai' else LOCAL_LLM_MODEL}-{TEMPERATURE}-{MAX_TOKENS}:2",
+        cache_if=lambda result: result != FEEDBACK_UNAVAILABLE
+    ))
+
+
+def validate_stages(stages: Sequence[Stage]) -> List[str]:
+    """
+    Check that stage names are unique and dependencies form a DAG.
+
+    Args:
+        stages (Sequence[Stage]): Stages to check
+
+    Returns:
+        List[str]: Stage names in a valid topological order
+    """
+    by_name = {}
+    for stage in stages:
+        if stage.name in by_name:
+            raise ValueError(f"Duplicate stage: {stage.name}")
+        if stage.executor not in ("thread", "process"):
+            raise ValueError(f"Unknown executor for stage {stage.name}: {stage.executor}")
+        by_name[stage.name] = stage
+
+    order: List[str] = []
+    state: Dict[str, str] = {}
+
+    def visit(name: str, path: Tuple[str, ...]) -> None:
+        if state.get(name) == "done":
+            return
+        if state.get(name) == "visiting":
+            raise ValueError(f"Dependency cycle: {' -> '.join(path + (name,))}")
+        if name not in by_name:
+            raise ValueError(f"Unknown dependency {name} of stage {path[-1]}")
+        state[name] = "visiting"
+        for dep in by_name[name].deps:
+            visit(dep, path + (name,))
+        state[name] = "done"
+        order.append(name)
+
+    for stage in stages:
+        visit(stage.name, ())
+    return order
+
+
+def stage_keys(audio_digest: str, stages: Sequence[Stage]) -> Dict[str, str]:
+    """
+    Cache key of every stage's output on one recording.
+
+    Args:
+        audio_digest (str): Content hash of the decoded audio
+        stages (Sequence[Stage]): Analysis DAG
+
+    Returns:
+        Dict[str, str]: Cache key keyed by stage name
+    """
+    by_name = {stage.name: stage for stage in stages}
+    keys: Dict[str, str] = {}
+    for name in validate_stages(stages):
+        stage = by_name[name]
+        keys[name] = stage_key(audio_digest, name, stage.version, [keys[dep] for dep in stage.deps])
+    return keys
+
+
+def _run_stage(func: Callable, args: Tuple, kwargs: Dict) -> Any:
+    return func(*args, **kwargs)
+
+
+def iter_analysis(
+    audio: AudioSource,
+    stages: Sequence[Stage] = DEFAULT_STAGES,
+    max_workers: int = PIPELINE_MAX_WORKERS,
+    cache: Optional[ResultCache] = None,
+    seeded: Optional[Dict[str, Any]] = None
+) -> Iterator[Tuple[str, Any]]:
+    """
+    Run the analysis stages concurrently, yielding results as they finish.
+
+    Independent stages are submitted together as soon as their dependencies
+    are available, so wall-clock time tends towards the slowest chain rather
+    than the sum of every stage. With a cache, stages whose result is already
+    stored for this audio (and the same versions upstream) are not run.
+
+    Args:
+        audio (AudioSource): Decoded AudioBuffer or path to the audio file
+        stages (Sequence[Stage]): Analysis DAG (default: DEFAULT_STAGES)
+        max_workers (int): Maximum stages running at once
+        cache (Optional[ResultCache]): Result cache to read and populate
+        seeded (Optional[Dict[str, Any]]): Results already computed for some
+            stages (e.g. batched across recordings by a worker); those stages
+            are neither run, looked up nor cached here
+
+    Yields:
+        Tuple[str, Any]: Stage name and its result, in completion order
+    """
+    validate_stages(stages)
+    buffer = as_audio_buffer(audio)
+    keys = stage_keys(buffer.digest(), stages) if cache is not None else {}
+    by_name = {stage.name: stage for stage in stages}
+    seeded = {name: value for name, value in (seeded or {}).items() if name in by_name}
+    pending = {name: stage for name, stage in by_name.items() if name not in seeded}
+    running: Dict[Future, str] = {}
+    results: Dict[str, Any] = dict(seeded)
+    process_pool: Optional[ProcessPoolExecutor] = None
+
+    for name, value in seeded.items():
+        yield name, value
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis") as thread_pool:
+        try:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    if not all(dep in results for dep in stage.deps):
+                        continue
+                    del pending[name]
+
+                    if cache is not None:
+                        found, value = cache.lookup(name, keys[name])
+                        if found:
+                            results[name] = value
+                            yield name, value
+                            continue
+
+                    args = (buffer,) if stage.uses_audio else ()
+                    kwargs = {dep: results[dep] for dep in stage.deps}
+                    if stage.executor == "process":
+                        if process_pool is None:
+                            process_pool = ProcessPoolExecutor(max_workers=max_workers)
+                        future = process_pool.submit(_run_stage, stage.func, args, kwargs)
+                    else:
+                        future = thread_pool.submit(_run_stage, stage.func, args, kwargs)
+                    running[future] = name
+
+                if not running:
+                    continue
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    stage = by_name[name]
+                    if cache is not None and (stage.cache_if is None or stage.cache_if(results[name])):
+                        cache.put(name, keys[name], results[name])
+                    yield name, results[name]
+        finally:
+            for future in running:
+                future.cancel()
+            if process_pool is not None:
+                process_pool.shutdown(wait=True)
+
+
+def run_analysis(
+    audio: AudioSource,
+    stages: Sequence[Stage] = DEFAULT_STAGES,
+    max_workers: int = PIPELINE_MAX_WORKERS,
+    cache: Optional[ResultCache] = None,
+    seeded: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Run every analysis stage and return all results.
+
+    Args:
+        audio (AudioSource): Decoded AudioBuffer or path to the audio file
+        stages (Sequence[Stage]): Analysis DAG (default: DEFAULT_STAGES)
+        max_workers (int): Maximum stages running at once
+        cache (Optional[ResultCache]): Result cache to read and populate
+        seeded (Optional[Dict[str, Any]]): Results already computed for some
+            stages, see iter_analysis()
+
+    Returns:
+        Dict[str, Any]: Result of each stage keyed by stage name
+    """
+    return dict(iter_analysis(audio, stages, max_workers, cache, seeded))
@@ -0,0 +1,163 @@
+import numpy as np
+import soundfile as sf
+from typing import Dict, Iterator, Tuple
+from config.config import (
+    ANALYSIS_COST_OVERHEAD,
+    ANALYSIS_COST_RTF,
+    MAX_AUDIO_DURATION,
+    MIN_AUDIO_DURATION,
+    MIN_SPEECH_SECONDS,
+    PRESCREEN_FRAME_SECONDS,
+    PRESCREEN_SAMPLE_RATE,
+    PRESCREEN_SPEECH_DB,
+    TRIM_MIN_SILENCE_SECONDS,
+    TRIM_PADDING_SECONDS,
+)
+from audio_processing.vad import energy_speech_mask
+from utils.audio_buffer import AudioBuffer
+from utils.helpers import get_audio_duration, iter_audio_blocks
+from utils.instrumentation import record_error, record_rejection, timed
+
+
+class AdmissionError(Exception):
+    """Raised when an upload fails the pre-screen; `screen` holds the details."""
+
+    def __init__(self, screen: Dict):
+        super().__init__(screen["message"])
+        self.screen = screen
+
+
+def _screen_blocks(audio_path: str) -> Iterator[np.ndarray]:
+    # Decimated mono blocks; containers libsndfile can't read are decoded
+    # whole, but already at the low screening rate
+    try:
+        for block, _ in iter_audio_blocks(audio_path, PRESCREEN_SAMPLE_RATE):
+            yield block
+    except sf.LibsndfileError:
+        import librosa
+        yield librosa.load(audio_path, sr=PRESCREEN_SAMPLE_RATE, mono=True, dtype=np.float32)[0]
+
+
+def frame_energy_db(audio_path: str, frame_seconds: float = PRESCREEN_FRAME_SECONDS) -> np.ndarray:
+    """
+    Frame energy of a file, streamed at the screening sample rate.
+
+    Args:
+        audio_path (str): Path to the audio file
+        frame_seconds (float): Frame length
+
+    Returns:
+        np.ndarray: Energy in dBFS of each complete frame
+    """
+    frame = max(1, int(frame_seconds * PRESCREEN_SAMPLE_RATE))
+    energies = []
+    carry = np.zeros(0, dtype=np.float32)
+    for block in _screen_blocks(audio_path):
+        samples = np.concatenate((carry, block))
+        whole = len(samples) // frame * frame
+        frames = samples[:whole].reshape(-1, frame)
+        energies.append(np.einsum('ij,ij->i', frames, frames) / frame)
+        carry = samples[whole:]
+    power = np.concatenate(energies) if energies else np.zeros(0, dtype=np.float32)
+    return 10 * np.log10(np.maximum(power, 1e-10))
+
+
+def _clock(seconds: float) -> str:
+    minutes, seconds = divmod(int(np.ceil(seconds)), 60)
+    return f"{minutes}:{seconds:02d}"
+
+
+def _verdict(screen: Dict, reason: str, message: str) -> Dict:
+    screen.update(admitted=False, reason=reason, message=message)
+    record_rejection(reason)
+    return screen
+
+
+@timed("prescreen")
+def prescreen(audio_path: str) -> Dict:
+    """
+    Decide whether an upload is worth analyzing, before any model runs.
+
+    The duration comes from the file header, so over-long uploads are
+    rejected without being decoded. Otherwise one vectorized energy pass
+    over the audio decimated to PRESCREEN_SAMPLE_RATE finds the speech,
+    rejects uploads without enough of it, and locates the leading and
+    trailing silence to trim.
+
+    Args:
+        audio_path (str): Path to the uploaded audio file
+
+    Returns:
+        Dict: admitted, reason and message, duration, speech_duration,
+            speech_percentage, trim_start/trim_end (seconds to analyze) and
+            estimated_seconds of analysis time
+    """
+    duration = get_audio_duration(audio_path)
+    screen = {
+        "admitted": True,
+        "reason": None,
+        "message": "",
+        "duration": duration,
+        "speech_duration": 0.0,
+        "speech_percentage": 0.0,
+        "trim_start": 0.0,
+        "trim_end": duration,
+        "estimated_seconds": ANALYSIS_COST_OVERHEAD + ANALYSIS_COST_RTF * duration
+    }
+    if duration <= 0:
+        return _verdict(screen, "unreadable", "The file could not be read as audio.")
+    if duration > MAX_AUDIO_DURATION:
+        return _verdict(screen, "too_long",
+                        f"The recording is {_clock(duration)} long; the limit is {_clock(MAX_AUDIO_DURATION)}.")
+    if duration < MIN_AUDIO_DURATION:
+        return _verdict(screen, "too_short", "The recording is too short to analyze.")
+
+    try:
+        energy_db = frame_energy_db(audio_path)
+    except Exception as e:
+        print(f"Error screening audio: {str(e)}")
+        record_error("prescreen", e)
+        return _verdict(screen, "unreadable", "The file could not be read as audio.")
+
+    # Zero crossings say little after decimation, so only energy decides
+    speech = energy_speech_mask(energy_db, np.zeros_like(energy_db), speech_db=PRESCREEN_SPEECH_DB)
+    speech_duration = float(np.count_nonzero(speech) * PRESCREEN_FRAME_SECONDS)
+    screen["speech_duration"] = speech_duration
+    screen["speech_percentage"] = speech_duration / duration * 100
+    if speech_duration < MIN_SPEECH_SECONDS:
+        return _verdict(screen, "no_speech", "No speech was detected in the recording.")
+
+    # Only silence well beyond the padding is trimmed, so quiet onsets and
+    # trailing words the energy pass missed stay in the analyzed audio
+    voiced = np.flatnonzero(speech)
+    first = float(voiced[0]) * PRESCREEN_FRAME_SECONDS
+    last = float(voiced[-1] + 1) * PRESCREEN_FRAME_SECONDS
+    if first > TRIM_MIN_SILENCE_SECONDS:
+        screen["trim_start"] = first - TRIM_PADDING_SECONDS
+    if duration - last > TRIM_MIN_SILENCE_SECONDS:
+        screen["trim_end"] = last + TRIM_PADDING_SECONDS
+    screen["estimated_seconds"] = ANALYSIS_COST_OVERHEAD + ANALYSIS_COST_RTF * (screen["trim_end"] - screen["trim_start"])
+    return screen
+
+
+def admit(audio_path: str) -> Tuple[AudioBuffer, Dict]:
+    """
+    Pre-screen an upload and decode the part worth analyzing.
+
+    Args:
+        audio_path (str): Path to the uploaded audio file
+
+    Returns:
+        Tuple[AudioBuffer, Dict]: Audio trimmed to the speech (result times
+            are relative to its start) and the prescreen() result
+
+    Raises:
+        AdmissionError: If the upload is rejected
+    """
+    screen = prescreen(audio_path)
+    if not screen["admitted"]:
+        raise AdmissionError(screen)
+    buffer = AudioBuffer.from_file(audio_path)
+    if screen["trim_start"] > 0 or screen["trim_end"] < buffer.duration:
+        buffer = buffer.view(screen["trim_start"], screen["trim_end"])
+    return buffer, screen
@@ -0,0 +1,126 @@
+import numpy as np
+from typing import Dict, Optional
+from config.config import (
+    EXPRESSIVE_ENERGY_STD,
+    EXPRESSIVE_PITCH_STD,
+    MONOTONY_THRESHOLD,
+    PROSODY_HOP_SECONDS,
+    PROSODY_MIN_VOICED_FRACTION,
+    PROSODY_WINDOW_SECONDS,
+)
+from audio_processing.features import get_features
+from utils.audio_buffer import AudioSource, as_audio_buffer
+from utils.instrumentation import record_error, timed
+from utils.records import ProsodyResult, ProsodySeries
+
+def _windowed_moments(values: np.ndarray, valid: np.ndarray, starts: np.ndarray, ends: np.ndarray):
+    # Count, mean and standard deviation of the valid values in each
+    # [start, end) frame range, from prefix sums instead of a loop
+    weights = valid.astype(np.float64)
+    filled = np.where(valid, values, 0.0).astype(np.float64)
+    count = np.concatenate(([0.0], np.cumsum(weights)))
+    total = np.concatenate(([0.0], np.cumsum(filled)))
+    squares = np.concatenate(([0.0], np.cumsum(filled * filled)))
+    n = count[ends] - count[starts]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = (total[ends] - total[starts]) / n
+        variance = (squares[ends] - squares[starts]) / n - mean * mean
+    return n, mean, np.sqrt(np.maximum(variance, 0))
+
+def _speech_frames(features, voice_activity: Optional[Dict]) -> np.ndarray:
+    # Voiced feature frames, restricted to VAD speech when a mask is available
+    voiced = features["voiced"] & ~np.isnan(features["f0"])
+    speech_mask = voice_activity.get("speech_mask") if voice_activity else None
+    if speech_mask is not None and len(speech_mask):
+        index = (features.frame_times() / voice_activity["frame_duration"]).astype(int)
+        voiced = voiced & np.asarray(speech_mask)[np.minimum(index, len(speech_mask) - 1)]
+    return voiced
+
+def _neutral_result() -> ProsodyResult:
+    return ProsodyResult(
+        median_pitch=0,
+        pitch_range=0,
+        pitch_variability=0,
+        energy_range=0,
+        energy_variability=0,
+        energy_consistency=float("nan"),
+        monotony_score=float("nan"),
+        monotonous_percentage=float("nan"),
+        voiced_duration=0,
+        prosody_over_time=ProsodySeries.empty()
+    )
+
+@timed("prosody")
+def analyze_prosody(audio: AudioSource, voice_activity: Optional[Dict] = None) -> ProsodyResult:
+    """
+    Analyze pitch and loudness variation to detect monotonous delivery.
+
+    Pitch is measured in semitones around the speaker's median so scores are
+    comparable across voices. Every statistic is computed with vectorized
+    NumPy over the shared frame features, including the sliding windows.
+
+    Args:
+        audio (AudioSource): Decoded AudioBuffer or path to the audio file
+        voice_activity (Optional[Dict]): Output of detect_voice_activity, used
+            to ignore voiced frames outside speech
+
+    Returns:
+        ProsodyResult: Pitch range and variability, energy dynamics, monotony
+            score and windowed time series
+    """
+    try:
+        buffer = as_audio_buffer(audio)
+        features = get_features(buffer)
+        speech = _speech_frames(features, voice_activity)
+        if not speech.any():
+            # A silent talk is not a failure; there is just nothing to measure
+            return _neutral_result()
+
+        f0 = features["f0"]
+        rms_db = features["rms_db"]
+        median_pitch = float(np.median(f0[speech]))
+        semitones = 12 * np.log2(np.where(speech, f0, median_pitch) / median_pitch)
+
+        # Whole-talk statistics
+        pitch_low, pitch_high = np.percentile(semitones[speech], [5, 95])
+        energy_low, energy_high = np.percentile(rms_db[speech], [10, 95])
+
+        # Sliding windows over the frame grid
+        frame_duration = features.frame_duration
+        window = max(1, int(round(PROSODY_WINDOW_SECONDS / frame_duration)))
+        hop = max(1, int(round(PROSODY_HOP_SECONDS / frame_duration)))
+        starts = np.arange(0, max(features.n_frames - window, 0) + 1, hop)
+        ends = np.minimum(starts + window, features.n_frames)
+        voiced_count, _, pitch_std = _windowed_moments(semitones, speech, starts, ends)
+        _, energy_mean, energy_std = _windowed_moments(rms_db, speech, starts, ends)
+        scored = voiced_count >= PROSODY_MIN_VOICED_FRACTION * (ends - starts)
+
+        expressiveness = (0.7 * np.minimum(pitch_std / EXPRESSIVE_PITCH_STD, 1)
+                          + 0.3 * np.minimum(energy_std / EXPRESSIVE_ENERGY_STD, 1))
+        monotony = np.where(scored, 1 - expressiveness, np.nan)
+        scored_monotony = monotony[scored]
+
+        return ProsodyResult(
+            median_pitch=median_pitch,
+            pitch_range=float(pitch_high - pitch_low),
+            pitch_variability=float(np.std(semitones[speech])),
+            energy_range=float(energy_high - energy_low),
+            energy_variability=float(np.std(rms_db[speech])),
+            # Without a single scored window there is no score; NaN keeps it
+            # from reading as perfectly expressive
+            energy_consistency=float(np.std(energy_mean[scored])) if scored.any() else float("nan"),
+            monotony_score=float(np.mean(scored_monotony)) if len(scored_monotony) else float("nan"),
+            monotonous_percentage=float(np.mean(scored_monotony > MONOTONY_THRESHOLD) * 100) if len(scored_monotony) else float("nan"),
+            voiced_duration=float(np.count_nonzero(speech) * frame_duration),
+            prosody_over_time=ProsodySeries(
+                time=(starts + ends) / 2 * frame_duration,
+                pitch_variability=np.where(scored, pitch_std, np.nan),
+                energy_variability=np.where(scored, energy_std, np.nan),
+                monotony=monotony
+            )
+        )
+
+    except Exception as e:
+        print(f"Error in prosody analysis: {str(e)}")
+        record_error("prosody", e)
+        return _neutral_result()
@@ -0,0 +1,283 @@
+import collections
+import webrtcvad
+import numpy as np
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from config.config import (
+    MIN_SILENCE_DURATION,
+    MIN_SPEECH_DURATION,
+    SAMPLE_RATE,
+    STREAM_RING_SECONDS,
+    STREAM_UPDATE_INTERVAL,
+    STREAM_WINDOW_SECONDS,
+    VAD_AGGRESSIVENESS,
+    VAD_FRAME_MS,
+)
+
+# Energy swing (dB) needed between a peak and the surrounding valleys for the
+# peak to count as a syllable nucleus
+SYLLABLE_PROMINENCE_DB = 3.0
+SYLLABLES_PER_WORD = 1.5
+ENERGY_FLOOR_DB = -120.0
+
+Chunk = Union[bytes, bytearray, memoryview, np.ndarray]
+
+
+class RingBuffer:
+    """
+    Fixed-capacity circular buffer of the most recent samples.
+    """
+
+    def __init__(self, capacity: int, dtype=np.int16):
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._pos = 0
+        self.total_written = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._data)
+
+    def write(self, samples: np.ndarray) -> None:
+        """
+        Append samples, overwriting the oldest ones once full.
+
+        Args:
+            samples (np.ndarray): Samples to append
+        """
+        samples = samples[-self.capacity:]
+        first = min(len(samples), self.capacity - self._pos)
+        self._data[self._pos:self._pos + first] = samples[:first]
+        self._data[:len(samples) - first] = samples[first:]
+        self._pos = (self._pos + len(samples)) % self.capacity
+        self.total_written += len(samples)
+
+    def latest(self, count: Optional[int] = None) -> np.ndarray:
+        """
+        Copy of the most recent samples in chronological order.
+
+        Args:
+            count (Optional[int]): Number of samples (default: everything held)
+
+        Returns:
+            np.ndarray: Most recent samples, oldest first
+        """
+        held = min(self.total_written, self.capacity)
+        count = held if count is None else min(count, held)
+        start = (self._pos - count) % self.capacity
+        if start + count <= self.capacity:
+            return self._data[start:start + count].copy()
+        return np.concatenate((self._data[start:], self._data[:self._pos]))
+
+
+class StreamingAnalyzer:
+    """
+    Incremental voice activity, pause and speech-rate tracking for live audio.
+
+    PCM chunks are split into the same 30 ms frames used by `vad.py` and each
+    frame updates running statistics in O(1), so history is never rescanned
+    and memory stays constant however long the presentation runs. A metrics
+    update is emitted every `update_interval` seconds of audio, which bounds
+    audio-to-metric latency by that interval plus one frame.
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = SAMPLE_RATE,
+        aggressiveness: int = VAD_AGGRESSIVENESS,
+        update_interval: float = STREAM_UPDATE_INTERVAL,
+        window_seconds: float = STREAM_WINDOW_SECONDS,
+        ring_seconds: float = STREAM_RING_SECONDS
+    ):
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * VAD_FRAME_MS / 1000)
+        self.frame_duration = self.frame_size / sample_rate
+        self.ring = RingBuffer(int(sample_rate * ring_seconds))
+
+        self._vad = webrtcvad.Vad(aggressiveness)
+        self._pending = b""
+        self._update_frames = max(1, int(round(update_interval / self.frame_duration)))
+        self._min_pause_frames = int(np.ceil(MIN_SILENCE_DURATION / self.frame_duration))
+        self._min_speech_frames = int(np.ceil(MIN_SPEECH_DURATION / self.frame_duration))
+
+        # Rolling window of (is_speech, is_syllable) with running sums
+        self._window = collections.deque(maxlen=max(1, int(window_seconds / self.frame_duration)))
+        self._window_voiced = 0
+        self._window_syllables = 0
+
+        # Cumulative statistics
+        self.total_frames = 0
+        self.voice_frames = 0
+        self.syllables = 0
+        self.speech_segments = 0
+        self.pause_count = 0
+        self.total_pause_time = 0.0
+        self.longest_pause = 0.0
+
+        # Current run of identical VAD decisions
+        self._run_is_speech = False
+        self._run_frames = 0
+        self._heard_speech = False
+
+        # Syllable nucleus peak tracking
+        self._rising = True
+        self._peak_db = ENERGY_FLOOR_DB
+        self._peak_is_speech = False
+        self._valley_db = ENERGY_FLOOR_DB
+
+    def feed(self, chunk: Chunk) -> List[Dict]:
+        """
+        Process a chunk of audio (e.g. config.CHUNK_SIZE samples).
+
+        Args:
+            chunk (Chunk): Little-endian int16 PCM bytes, an int16 array, or a
+                float array in [-1, 1]
+
+        Returns:
+            List[Dict]: Metric updates that became due while processing the chunk
+        """
+        pcm = self._to_pcm16(chunk)
+        self.ring.write(pcm)
+
+        data = self._pending + pcm.tobytes()
+        frame_bytes = self.frame_size * 2
+        n_frames = len(data) // frame_bytes
+        self._pending = data[n_frames * frame_bytes:]
+        if n_frames == 0:
+            return []
+
+        # Frame energies for the whole chunk in one vectorized pass
+        frames = np.frombuffer(data, dtype=np.int16, count=n_frames * self.frame_size)
+        frames = frames.reshape(n_frames, self.frame_size).astype(np.float32)
+        rms = np.sqrt(np.mean(frames * frames, axis=1)) / 32768.0
+        energy_db = 20 * np.log10(np.maximum(rms, 1e-6))
+
+        updates = []
+        view = memoryview(data)
+        for i in range(n_frames):
+            frame = view[i * frame_bytes:(i + 1) * frame_bytes]
+            is_speech = self._vad.is_speech(frame, self.sample_rate)
+            self._process_frame(is_speech, float(energy_db[i]))
+            if self.total_frames % self._update_frames == 0:
+                updates.append(self.snapshot())
+        return updates
+
+    def snapshot(self) -> Dict:
+        """
+        Current rolling metrics.
+
+        Returns:
+            Dict: Streaming voice activity, pause and speech-rate statistics
+        """
+        elapsed = self.total_frames * self.frame_duration
+        voice_time = self.voice_frames * self.frame_duration
+        window_time = len(self._window) * self.frame_duration
+        current_pause = 0.0
+        if self._heard_speech and not self._run_is_speech:
+            current_pause = self._run_frames * self.frame_duration
+
+        return {
+            "time": elapsed,
+            "is_speaking": self._run_is_speech,
+            "voice_percentage": (self.voice_frames / self.total_frames * 100) if self.total_frames else 0,
+            "recent_voice_percentage": (self._window_voiced / len(self._window) * 100) if self._window else 0,
+            "speech_segments": self.speech_segments,
+            "pause_count": self.pause_count,
+            "avg_pause_duration": (self.total_pause_time / self.pause_count) if self.pause_count else 0,
+            "longest_pause": self.longest_pause,
+            "total_pause_time": self.total_pause_time,
+            "current_pause": current_pause,
+            "speech_rate": self._words_per_minute(self.syllables, elapsed),
+            "articulation_rate": self._words_per_minute(self.syllables, voice_time),
+            "recent_speech_rate": self._words_per_minute(self._window_syllables, window_time),
+        }
+
+    def _process_frame(self, is_speech: bool, energy_db: float) -> None:
+        self.total_frames += 1
+        if is_speech:
+            self.voice_frames += 1
+
+        # Close the previous run when the VAD decision flips
+        if is_speech != self._run_is_speech and self._run_frames:
+            self._close_run()
+        self._run_is_speech = is_speech
+        self._run_frames += 1
+        if is_speech:
+            self._heard_speech = True
+
+        is_syllable = self._track_syllable(is_speech, energy_db)
+        if is_syllable:
+            self.syllables += 1
+
+        if len(self._window) == self._window.maxlen:
+            old_speech, old_syllable = self._window[0]
+            self._window_voiced -= old_speech
+            self._window_syllables -= old_syllable
+        self._window.append((is_speech, is_syllable))
+        self._window_voiced += is_speech
+        self._window_syllables += is_syllable
+
+    def _close_run(self) -> None:
+        if self._run_is_speech:
+            if self._run_frames >= self._min_speech_frames:
+                self.speech_segments += 1
+        elif self._heard_speech and self._run_frames >= self._min_pause_frames:
+            # Only silences between speech count as pauses
+            pause = self._run_frames * self.frame_duration
+            self.pause_count += 1
+            self.total_pause_time += pause
+            self.longest_pause = max(self.longest_pause, pause)
+        self._run_frames = 0
+
+    def _track_syllable(self, is_speech: bool, energy_db: float) -> bool:
+        # Hysteresis peak picking on frame energy: a syllable nucleus is a
+        # speech-frame peak that stands out from the valleys on both sides
+        if self._rising:
+            if energy_db > self._peak_db:
+                self._peak_db = energy_db
+                self._peak_is_speech = is_speech
+            elif self._peak_db - energy_db >= SYLLABLE_PROMINENCE_DB:
+                counted = self._peak_is_speech and self._peak_db - self._valley_db >= SYLLABLE_PROMINENCE_DB
+                self._rising = False
+                self._valley_db = energy_db
+                return counted
+        else:
+            if energy_db < self._valley_db:
+                self._valley_db = energy_db
+            elif energy_db - self._valley_db >= SYLLABLE_PROMINENCE_DB:
+                self._rising = True
+                self._peak_db = energy_db
+                self._peak_is_speech = is_speech
+        return False
+
+    def _words_per_minute(self, syllables: int, seconds: float) -> float:
+        if seconds <= 0:
+            return 0.0
+        return syllables / SYLLABLES_PER_WORD / seconds * 60
+
+    @staticmethod
+    def _to_pcm16(chunk: Chunk) -> np.ndarray:
+        if isinstance(chunk, np.ndarray):
+            if chunk.dtype == np.int16:
+                return chunk.ravel()
+            return (np.clip(chunk.ravel(), -1.0, 1.0) * 32767).astype(np.int16)
+        return np.frombuffer(chunk, dtype=np.int16)
+
+
+def stream_analysis(
+    chunks: Iterable[Chunk],
+    analyzer: Optional[StreamingAnalyzer] = None
+) -> Iterator[Dict]:
+    """
+    Yield rolling metric updates for a stream of PCM chunks.
+
+    Args:
+        chunks (Iterable[Chunk]): Audio chunks from a microphone, socket, ...
+        analyzer (Optional[StreamingAnalyzer]): Analyzer to use (default: a new one)
+
+    Yields:
+        Dict: Metric updates at the analyzer's update cadence
+    """
+    analyzer = analyzer or StreamingAnalyzer()
+    for chunk in chunks:
+        for update in analyzer.feed(chunk):
+            yield update
@@ -1,24 +1,250 @@
-import whisper
 import os
+import numpy as np
+from typing import Any, Dict, Iterator, List, Optional
+from config.config import (
+    SAMPLE_RATE,
+    TRANSCRIBE_OVERLAP_SECONDS,
+    TRANSCRIBE_PROMPT_CHARS,
+    TRANSCRIBE_WINDOW_SECONDS,
+    WHISPER_MODEL,
+)
+from utils.audio_buffer import AudioBuffer, AudioSource, as_audio_buffer
+from utils.inference import choose_whisper_size
+from utils.instrumentation import record_error, timed
+from utils.model_registry import get_model
 
-def transcribe_audio(audio_path: str) -> str:
+@timed("transcription")
+def transcribe_audio(audio: AudioSource) -> str:
     """
     Transcribe audio file to text using OpenAI's Whisper model.
-    
+
     Args:
-        audio_path (str): Path to the audio file
-        
+        audio (AudioSource): Decoded AudioBuffer or path to the audio file
+
     Returns:
         str: Transcribed text
     """
     try:
-        # Load the Whisper model
-        model = whisper.load_model("base")
-        
-        # Transcribe the audio
-        result = model.transcribe(audio_path)
-        
+        # Whisper takes 16 kHz float32 samples directly, skipping its ffmpeg decode
+        buffer = as_audio_buffer(audio)
+
+        # Get the shared Whisper model (loaded once per process), sized for the recording
+        model = get_model(f"whisper-{choose_whisper_size(buffer.duration)}")
+        result = model.transcribe(buffer.as_tensor())
+
         return result["text"]
     except Exception as e:
         print(f"Error in transcription: {str(e)}")
-        return "" 
\ No newline at end of file
+        record_error("transcription", e)
+        return ""
+
+@timed("transcript")
+def transcribe_with_timestamps(audio: AudioSource) -> Dict:
+    """
+    Transcribe audio keeping Whisper's segment and word timestamps.
+
+    Args:
+        audio (AudioSource): Decoded AudioBuffer or path to the audio file
+
+    Returns:
+        Dict: Full text, segments, a flat list of timed words, the Whisper
+            size used and whether a busy queue stepped it down from the size
+            the recording's length gets
+    """
+    try:
+        buffer = as_audio_buffer(audio)
+        size = choose_whisper_size(buffer.duration)
+        segments = list(iter_transcription(buffer, get_model(f"whisper-{size}")))
+        return {
+            "text": "".join(segment["text"] for segment in segments).strip(),
+            "segments": segments,
+            "words": [word for segment in segments for word in segment["words"]],
+            "model_size": size,
+            "stepped_down": size != choose_whisper_size(buffer.duration, queue_depth=0)
+        }
+    except Exception as e:
+        print(f"Error in transcription: {str(e)}")
+        record_error("transcript", e)
+        return {
+            "text": "",
+            "segments": [],
+            "words": [],
+            "model_size": None,
+            "stepped_down": False
+        }
+
+class ChunkedTranscriber:
+    """
+    Transcribe audio in overlapping windows and stitch the segments.
+
+    Each window is transcribed on its own (so only one window's mel
+    spectrogram is ever held), with the previous window's text passed as the
+    prompt for context. Segments are committed up to the middle of the
+    overlap; anything later is left for the next window, which sees it with
+    more context.
+    """
+
+    def __init__(
+        self,
+        model: Any = None,
+        sample_rate: int = SAMPLE_RATE,
+        window_seconds: float = TRANSCRIBE_WINDOW_SECONDS,
+        overlap_seconds: float = TRANSCRIBE_OVERLAP_SECONDS,
+        word_timestamps: bool = True
+    ):
+        if overlap_seconds >= window_seconds:
+            raise ValueError("Overlap must be shorter than the window")
+        self._model = model
+        self.sample_rate = sample_rate
+        self.window = int(window_seconds * sample_rate)
+        self.overlap = int(overlap_seconds * sample_rate)
+        self.step = self.window - self.overlap
+        self.word_timestamps = word_timestamps
+
+        self._pending = np.zeros(0, dtype=np.float32)
+        self._offset = 0  # sample index of the first pending sample
+        self._commit_from = 0.0  # earlier segments belong to the previous window
+        self._committed_until = 0.0  # end of the last committed segment
+        self._commit_after = 0.0  # words starting earlier were already committed
+        self._prompt = ""
+        self._next_id = 0
+
+    @property
+    def model(self) -> Any:
+        if self._model is None:
+            self._model = get_model(f"whisper-{WHISPER_MODEL}")
+        return self._model
+
+    def feed(self, samples: np.ndarray) -> List[Dict]:
+        """
+        Add live audio and transcribe every window that is now complete.
+
+        Args:
+            samples (np.ndarray): Float32 samples at the transcriber's sample rate
+
+        Returns:
+            List[Dict]: Newly committed segments
+        """
+        self._pending = np.concatenate((self._pending, np.asarray(samples, dtype=np.float32)))
+        segments = []
+        while len(self._pending) >= self.window:
+            window = AudioBuffer(self._pending[:self.window], self.sample_rate)
+            segments.extend(self._transcribe_window(window, self._offset, final=False))
+            self._pending = self._pending[self.step:]
+            self._offset += self.step
+        return segments
+
+    def flush(self) -> List[Dict]:
+        """
+        Transcribe whatever audio is left at the end of a stream.
+
+        Returns:
+            List[Dict]: Remaining committed segments
+        """
+        if not len(self._pending):
+            return []
+        window = AudioBuffer(self._pending, self.sample_rate)
+        segments = self._transcribe_window(window, self._offset, final=True)
+        self._offset += len(self._pending)
+        self._pending = np.zeros(0, dtype=np.float32)
+        return segments
+
+    def iter_buffer(self, buffer: AudioBuffer) -> Iterator[Dict]:
+        """
+        Transcribe an already decoded buffer window by window.
+
+        Args:
+            buffer (AudioBuffer): Decoded audio
+
+        Yields:
+            Dict: Segments in time order as soon as their window is done
+        """
+        total = len(buffer)
+        start = 0
+        while total:
+            end = min(start + self.window, total)
+            window = buffer.view(start / self.sample_rate, end / self.sample_rate)
+            for segment in self._transcribe_window(window, start, final=end >= total):
+                yield segment
+            if end >= total:
+                break
+            start += self.step
+
+    def _transcribe_window(self, window: AudioBuffer, offset: int, final: bool) -> List[Dict]:
+        window_start = offset / self.sample_rate
+        if final:
+            commit_end = float("inf")
+        else:
+            commit_end = window_start + (self.window - self.overlap / 2) / self.sample_rate
+
+        result = self.model.transcribe(
+            window.as_tensor(),
+            initial_prompt=self._prompt or None,
+            condition_on_previous_text=False,
+            word_timestamps=self.word_timestamps
+        )
+
+        committed = []
+        for segment in result.get("segments", []):
+            start = window_start + float(segment["start"])
+            end = window_start + float(segment["end"])
+            words = [
+                {
+                    "word": word["word"],
+                    "start": window_start + float(word["start"]),
+                    "end": window_start + float(word["end"]),
+                    "probability": float(word.get("probability", 0.0))
+                }
+                for word in segment.get("words", [])
+            ]
+            if words:
+                # Stitch word by word: segment boundaries move between
+                # overlapping windows, words barely do. A word starting before
+                # the middle of the last committed one is that word again
+                kept = [word for word in words if self._commit_after - 1e-3 <= word["start"] < commit_end]
+                if not kept:
+                    continue
+                if len(kept) < len(words):
+                    text = "".join(word["word"] for word in kept)
+                    start, end = kept[0]["start"], kept[-1]["end"]
+                else:
+                    text = segment["text"]
+                self._commit_after = (kept[-1]["start"] + kept[-1]["end"]) / 2
+            else:
+                # Without word timings, skip what the previous window already
+                # committed and leave the tail of the overlap to the next window
+                if start < self._commit_from - 1e-3 or start >= commit_end:
+                    continue
+                if end <= self._committed_until + 1e-3:
+                    continue
+                text, kept = segment["text"], []
+                self._commit_after = end
+            committed.append({"id": self._next_id, "start": start, "end": end, "text": text, "words": kept})
+            self._next_id += 1
+            self._committed_until = end
+        self._commit_from = commit_end
+
+        if committed:
+            text = "".join(segment["text"] for segment in committed)
+            self._prompt = (self._prompt + text)[-TRANSCRIBE_PROMPT_CHARS:]
+        return committed
+
+def iter_transcription(audio: AudioSource, model: Any = None, **options) -> Iterator[Dict]:
+    """
+    Transcribe audio incrementally in overlapping windows.
+
+    Args:
+        audio (AudioSource): Decoded AudioBuffer or path to the audio file
+        model (Any): Whisper model (default: shared model from the registry,
+            sized for the recording by choose_whisper_size())
+        **options: Window settings passed to ChunkedTranscriber
+
+    Yields:
+        Dict: Segments with absolute start/end times, text and word timings
+    """
+    buffer = as_audio_buffer(audio)
+    if model is None:
+        model = get_model(f"whisper-{choose_whisper_size(buffer.duration)}")
+    transcriber = ChunkedTranscriber(model, sample_rate=buffer.sample_rate, **options)
+    for segment in transcriber.iter_buffer(buffer):
+        yield segment
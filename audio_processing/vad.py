@@ -1,57 +1,172 @@
 import webrtcvad
-import wave
-import collections
-import struct
 import numpy as np
+from typing import List, Optional, Tuple
+from config.config import (
+    ENERGY_VAD_MARGIN_DB,
+    ENERGY_VAD_MAX_ZCR,
+    ENERGY_VAD_MIN_DB,
+    MIN_SILENCE_DURATION,
+    VAD_AGGRESSIVENESS,
+    VAD_BACKEND,
+    VAD_FRAME_MS,
+)
+from audio_processing.features import get_features
+from utils.audio_buffer import AudioSource, as_audio_buffer
+from utils.instrumentation import record_error, timed
+from utils.records import VoiceActivityResult
 
-def detect_voice_activity(audio_path: str) -> dict:
+def frame_signal(samples: np.ndarray, frame_size: int, hop: int = None) -> np.ndarray:
+    """
+    Split a signal into frames without copying it.
+    
+    Args:
+        samples (np.ndarray): 1-D signal
+        frame_size (int): Samples per frame
+        hop (int): Samples between frame starts (default: frame_size)
+        
+    Returns:
+        np.ndarray: Read-only (n_frames, frame_size) strided view; a trailing
+            partial frame is dropped
+    """
+    hop = hop or frame_size
+    if len(samples) < frame_size:
+        return np.zeros((0, frame_size), dtype=samples.dtype)
+    return np.lib.stride_tricks.sliding_window_view(samples, frame_size)[::hop]
+
+def mask_to_segments(mask: np.ndarray, frame_duration: float, min_gap: float = 0.0) -> List[Tuple[float, float]]:
+    """
+    Convert a per-frame speech mask into (start, end) times.
+    
+    Args:
+        mask (np.ndarray): Boolean speech flag per frame
+        frame_duration (float): Frame length in seconds
+        min_gap (float): Silences shorter than this are merged into speech
+        
+    Returns:
+        List[Tuple[float, float]]: Speech segments in seconds
+    """
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    if len(starts) and min_gap > 0:
+        keep = (starts[1:] - ends[:-1]) * frame_duration >= min_gap
+        starts = starts[np.concatenate(([True], keep))]
+        ends = ends[np.concatenate((keep, [True]))]
+    return [(float(start * frame_duration), float(end * frame_duration)) for start, end in zip(starts, ends)]
+
+def webrtc_speech_mask(pcm_frames: np.ndarray, sample_rate: int, aggressiveness: int = VAD_AGGRESSIVENESS) -> np.ndarray:
+    """
+    Classify int16 frames with WebRTC VAD.
+    
+    Frames are passed as slices of one memoryview, so no per-frame bytes
+    objects are allocated.
+    
+    Args:
+        pcm_frames (np.ndarray): (n_frames, frame_size) int16 frames
+        sample_rate (int): Sample rate (8, 16, 32 or 48 kHz)
+        aggressiveness (int): WebRTC aggressiveness mode (0-3)
+        
+    Returns:
+        np.ndarray: Boolean speech flag per frame
+    """
+    vad = webrtcvad.Vad(aggressiveness)
+    frame_bytes = pcm_frames.shape[1] * 2
+    pcm = memoryview(np.ascontiguousarray(pcm_frames)).cast('B')
+    return np.fromiter(
+        (vad.is_speech(pcm[offset:offset + frame_bytes], sample_rate)
+         for offset in range(0, len(pcm), frame_bytes)),
+        dtype=bool,
+        count=len(pcm_frames)
+    )
+
+def energy_speech_mask(energy_db: np.ndarray, zcr: np.ndarray, smoothing: int = 3,
+                       speech_db: Optional[float] = None) -> np.ndarray:
+    """
+    Classify frames from their energy and zero-crossing rate in one
+    vectorized pass.
+    
+    A frame is speech when it is well above the recording's noise floor and
+    either clearly loud or not dominated by zero crossings (hiss, noise).
+    
+    Args:
+        energy_db (np.ndarray): Frame energy in dBFS
+        zcr (np.ndarray): Zero crossings per sample of each frame
+        smoothing (int): Frames in the majority vote that removes isolated flips
+        speech_db (Optional[float]): Absolute level (dBFS) the threshold never
+            exceeds; without pauses the estimated noise floor is quiet speech,
+            and a purely relative threshold misses most of the talk
+        
+    Returns:
+        np.ndarray: Boolean speech flag per frame
+    """
+    if not len(energy_db):
+        return np.zeros(0, dtype=bool)
+    noise_floor = np.percentile(energy_db, 10)
+    threshold = noise_floor + ENERGY_VAD_MARGIN_DB
+    if speech_db is not None:
+        threshold = min(threshold, speech_db)
+    threshold = max(threshold, ENERGY_VAD_MIN_DB)
+    mask = (energy_db > threshold) & ((zcr < ENERGY_VAD_MAX_ZCR) | (energy_db > threshold + ENERGY_VAD_MARGIN_DB))
+
+    votes = np.convolve(mask.astype(np.int8), np.ones(smoothing, dtype=np.int8), mode='same')
+    return votes > smoothing // 2
+
+@timed("voice_activity")
+def detect_voice_activity(audio: AudioSource, backend: str = VAD_BACKEND) -> VoiceActivityResult:
     """
     Detect voice activity in audio file using WebRTC VAD.
     
     Args:
-        audio_path (str): Path to the audio file
+        audio (AudioSource): Decoded AudioBuffer or path to the audio file
+        backend (str): "webrtc" (default) or "energy" for the pure NumPy detector
         
     Returns:
-        dict: Voice activity statistics
+        VoiceActivityResult: Voice activity statistics, per-frame speech mask
+            and speech segments
     """
     try:
-        # Initialize VAD
-        vad = webrtcvad.Vad(3)  # Aggressiveness mode 3
-        
-        # Read audio file
-        with wave.open(audio_path, 'rb') as wf:
-            sample_rate = wf.getframerate()
-            pcm_data = wf.readframes(wf.getnframes())
+        buffer = as_audio_buffer(audio)
+        sample_rate = buffer.sample_rate
             
-        # Process audio in 30ms frames
-        frame_duration = 30  # ms
-        frame_size = int(sample_rate * frame_duration / 1000)
+        if backend == "webrtc":
+            # Process audio in 30ms frames, as strided views over the shared buffer
+            frame_size = int(sample_rate * VAD_FRAME_MS / 1000)
+            frame_duration = frame_size / sample_rate
+            speech_mask = webrtc_speech_mask(frame_signal(buffer.pcm16_array, frame_size), sample_rate)
+        elif backend == "energy":
+            # Reuse the buffer's shared RMS/ZCR frames, smoothing over about
+            # as much audio as three WebRTC frames
+            features = get_features(buffer)
+            frame_duration = features.frame_duration
+            smoothing = max(1, round(3 * VAD_FRAME_MS / 1000 / frame_duration))
+            speech_mask = energy_speech_mask(features["rms_db"], features["zcr"], smoothing)
+        else:
+            raise ValueError(f"Unknown VAD backend: {backend}")
         
         # Calculate statistics
-        total_frames = len(pcm_data) // (frame_size * 2)  # 2 bytes per sample
-        voice_frames = 0
-        
-        for i in range(0, len(pcm_data) - frame_size * 2, frame_size * 2):
-            frame = pcm_data[i:i + frame_size * 2]
-            if len(frame) == frame_size * 2:
-                is_speech = vad.is_speech(frame, sample_rate)
-                if is_speech:
-                    voice_frames += 1
-        
-        voice_percentage = (voice_frames / total_frames) * 100
+        total_frames = len(speech_mask)
+        voice_frames = int(np.count_nonzero(speech_mask))
+        voice_percentage = (voice_frames / total_frames) * 100 if total_frames else 0
         
-        return {
-            "total_frames": total_frames,
-            "voice_frames": voice_frames,
-            "voice_percentage": voice_percentage,
-            "has_speech": voice_percentage > 0
-        }
+        return VoiceActivityResult(
+            total_frames=total_frames,
+            voice_frames=voice_frames,
+            voice_percentage=voice_percentage,
+            has_speech=voice_percentage > 0,
+            frame_duration=frame_duration,
+            speech_mask=speech_mask,
+            speech_segments=mask_to_segments(speech_mask, frame_duration, MIN_SILENCE_DURATION)
+        )
         
     except Exception as e:
         print(f"Error in voice activity detection: {str(e)}")
-        return {
-            "total_frames": 0,
-            "voice_frames": 0,
-            "voice_percentage": 0,
-            "has_speech": False
-        } 
\ No newline at end of file
+        record_error("voice_activity", e)
+        return VoiceActivityResult(
+            total_frames=0,
+            voice_frames=0,
+            voice_percentage=0,
+            has_speech=False,
+            frame_duration=VAD_FRAME_MS / 1000,
+            speech_mask=np.zeros(0, dtype=bool),
+            speech_segments=[]
+        )
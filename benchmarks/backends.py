@@ -0,0 +1,309 @@
+"""
+Compare inference backends for the Whisper and emotion models.
+
+    python -m benchmarks.backends --audio talk1.wav talk2.wav
+                                  [--reference talk1.txt talk2.txt]
+                                  [--sizes tiny base small] [--backends fp32 int8]
+                                  [--output results.json] [--from results.json]
+
+Every Whisper size runs under every backend (fp32, dynamic int8, and either
+one with the encoder torch.compile'd) on the given recordings. Each entry
+reports the load time, best wall time and real-time factor, and the word
+error rate against the reference transcripts, or, without them, against the
+fp32 transcript of config.WHISPER_MODEL. The emotion model runs under each
+backend too and is scored by how often its labels agree with fp32.
+
+The report recommends the fastest setting that is at least --min-speedup
+times faster than fp32 config.WHISPER_MODEL while adding at most
+--max-wer-increase to its error rate, and lists what each rung of
+config.WHISPER_SIZE_LADDER costs under the configured backend, flagging
+rungs over that error budget. Results are saved as JSON (by default
+under benchmarks/results/backends-<commit>.json); --from re-prints the
+report of a saved run without running any model.
+"""
+import argparse
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from audio_processing.emotion import analyze_emotion
+from audio_processing.transcriber import iter_transcription
+from audio_processing.vad import detect_voice_activity
+from benchmarks.run import RESULTS_DIR, git_commit
+from config.config import MODEL_COMPILE, MODEL_QUANTIZATION, WHISPER_MODEL, WHISPER_SIZE_LADDER
+from utils.audio_buffer import AudioBuffer
+from utils.model_registry import Loader, default_device, emotion_loader, registry, whisper_loader
+
+# Backend name -> (quantization, compile)
+BACKENDS = {
+    "fp32": ("none", False),
+    "int8": ("int8", False),
+    "fp32-compiled": ("none", True),
+    "int8-compiled": ("int8", True),
+}
+BASELINE_BACKEND = "fp32"
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """
+    Word error rate: word-level edit distance over the reference length.
+
+    Case and punctuation are ignored.
+
+    Args:
+        reference (str): Correct transcript
+        hypothesis (str): Transcript to score
+
+    Returns:
+        float: Substitutions, insertions and deletions per reference word
+    """
+    def words(text: str) -> List[str]:
+        return "".join(c if c.isalnum() or c.isspace() or c == "'" else " " for c in text.lower()).split()
+
+    ref, hyp = words(reference), words(hypothesis)
+    if not ref:
+        return float(len(hyp) > 0)
+    # One row of the Levenshtein table at a time
+    previous = np.arange(len(hyp) + 1)
+    for i, word in enumerate(ref, 1):
+        current = np.empty_like(previous)
+        current[0] = i
+        for j in range(1, len(hyp) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (word != hyp[j - 1]))
+        previous = current
+    return float(previous[-1]) / len(ref)
+
+@contextmanager
+def swapped_model(name: str, loader: Loader) -> Iterator[Tuple[Any, float]]:
+    """
+    Load a model through a temporary registry loader, restoring the
+    configured loader afterwards.
+
+    Yields:
+        Tuple[Any, float]: The model and its load time in seconds
+    """
+    previous = registry.loader(name)
+    registry.register(name, loader)
+    try:
+        model = registry.get(name)
+        yield model, registry.load_times[(name, default_device())]
+    finally:
+        registry.register(name, previous)
+
+def _best_time(func: Callable[[], Any], repeats: int) -> Tuple[float, Any]:
+    timings, result = [], None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+def bench_whisper(size: str, backend: str, buffers: List[AudioBuffer], repeats: int) -> Dict:
+    """Transcribe every recording with one size and backend."""
+    quantization, compile = BACKENDS[backend]
+    name = f"whisper-{size}"
+    with swapped_model(name, whisper_loader(size, quantization, compile)) as (model, load_seconds):
+        # The first call pays for compilation, when there is any
+        first_seconds, _ = _best_time(lambda: list(iter_transcription(buffers[0], model=model)), 1)
+        wall, transcripts = 0.0, []
+        for buffer in buffers:
+            seconds, segments = _best_time(lambda: list(iter_transcription(buffer, model=model)), repeats)
+            wall += seconds
+            transcripts.append("".join(segment["text"] for segment in segments).strip())
+    duration = sum(buffer.duration for buffer in buffers)
+    return {
+        "model": name,
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "first_call_seconds": first_seconds,
+        "wall_seconds": wall,
+        "rtf": wall / duration,
+        "transcripts": transcripts
+    }
+
+def bench_emotion(backend: str, buffers: List[AudioBuffer], voice_activity: List[Dict], repeats: int) -> Dict:
+    """Classify emotions in every recording with one backend."""
+    quantization, compile = BACKENDS[backend]
+    with swapped_model("emotion", emotion_loader(quantization, compile)) as (_, load_seconds):
+        wall, labels = 0.0, []
+        for buffer, activity in zip(buffers, voice_activity):
+            seconds, result = _best_time(lambda: analyze_emotion(buffer, activity), repeats)
+            wall += seconds
+            labels.append([entry["label"] for entry in result["timeline"]])
+    return {
+        "model": "emotion",
+        "backend": backend,
+        "load_seconds": load_seconds,
+        "wall_seconds": wall,
+        "rtf": wall / sum(buffer.duration for buffer in buffers),
+        "labels": labels
+    }
+
+def score(results: List[Dict], references: Optional[List[str]]) -> None:
+    """
+    Add speedup, wer and wer_increase (Whisper) or label_agreement
+    (emotion) to each entry, relative to the fp32 baseline.
+    """
+    whisper = [entry for entry in results if entry["model"] != "emotion"]
+    baseline = next((entry for entry in whisper
+                     if entry["model"] == f"whisper-{WHISPER_MODEL}" and entry["backend"] == BASELINE_BACKEND), None)
+    if baseline is None:
+        baseline = next(entry for entry in whisper if entry["backend"] == BASELINE_BACKEND)
+    truth = references or baseline["transcripts"]
+    for entry in whisper:
+        entry["speedup"] = baseline["wall_seconds"] / max(entry["wall_seconds"], 1e-9)
+        entry["wer"] = float(np.mean([word_error_rate(ref, hyp) for ref, hyp in zip(truth, entry["transcripts"])]))
+    for entry in whisper:
+        entry["wer_increase"] = entry["wer"] - baseline["wer"]
+
+    emotion = [entry for entry in results if entry["model"] == "emotion"]
+    emotion_baseline = next((entry for entry in emotion if entry["backend"] == BASELINE_BACKEND), None)
+    for entry in emotion:
+        entry["speedup"] = emotion_baseline["wall_seconds"] / max(entry["wall_seconds"], 1e-9) if emotion_baseline else None
+        pairs = [(a, b) for ours, theirs in zip(entry["labels"], emotion_baseline["labels"] if emotion_baseline else [])
+                 for a, b in zip(ours, theirs)]
+        entry["label_agreement"] = float(np.mean([a == b for a, b in pairs])) if pairs else None
+
+def recommend(results: List[Dict], min_speedup: float, max_wer_increase: float) -> Optional[Dict]:
+    """
+    Fastest Whisper setting that meets the speedup and accuracy targets.
+
+    Returns:
+        Optional[Dict]: The entry, or None when no setting qualifies
+    """
+    candidates = [entry for entry in results if entry["model"] != "emotion"
+                  and entry["speedup"] >= min_speedup and entry["wer_increase"] <= max_wer_increase]
+    return max(candidates, key=lambda entry: entry["speedup"], default=None)
+
+def ladder_costs(results: List[Dict], ladder: List[Tuple[float, str]], max_wer_increase: float) -> List[Dict]:
+    """
+    Speed and accuracy of each size ladder rung under the configured backend.
+
+    Returns:
+        List[Dict]: One entry per rung with limit, model, backend, speedup,
+            wer_increase and within_budget (None when the run lacks the rung)
+    """
+    backend = next((name for name, setting in BACKENDS.items() if setting == (MODEL_QUANTIZATION, MODEL_COMPILE)),
+                   BASELINE_BACKEND)
+    rungs = []
+    for limit, size in ladder:
+        entry = next((entry for entry in results
+                      if entry["model"] == f"whisper-{size}" and entry["backend"] == backend), None)
+        rungs.append({
+            "limit": limit,
+            "model": f"whisper-{size}",
+            "backend": backend,
+            "speedup": entry["speedup"] if entry else None,
+            "wer_increase": entry["wer_increase"] if entry else None,
+            "within_budget": entry["wer_increase"] <= max_wer_increase if entry else None
+        })
+    return rungs
+
+def render(report: Dict, min_speedup: float, max_wer_increase: float) -> str:
+    """Markdown tables of a scored run, followed by the recommendation."""
+    lines = ["| model | backend | load s | RTF | speedup | WER | WER change |",
+             "|---|---|---:|---:|---:|---:|---:|"]
+    for entry in report["results"]:
+        if entry["model"] == "emotion":
+            continue
+        lines.append(f"| {entry['model']} | {entry['backend']} | {entry['load_seconds']:.1f} | {entry['rtf']:.3f} "
+                     f"| {entry['speedup']:.2f}x | {entry['wer']:.1%} | {entry['wer_increase']:+.1%} |")
+    emotion = [entry for entry in report["results"] if entry["model"] == "emotion"]
+    if emotion:
+        lines += ["", "| emotion backend | load s | RTF | speedup | label agreement |", "|---|---:|---:|---:|---:|"]
+        for entry in emotion:
+            agreement = "-" if entry["label_agreement"] is None else f"{entry['label_agreement']:.0%}"
+            speedup = "-" if entry["speedup"] is None else f"{entry['speedup']:.2f}x"
+            lines.append(f"| {entry['backend']} | {entry['load_seconds']:.1f} | {entry['rtf']:.3f} | {speedup} | {agreement} |")
+
+    whisper = [entry for entry in report["results"] if entry["model"] != "emotion"]
+    if whisper:
+        lines += ["", "| size ladder rung | model | backend | speedup | WER change |", "|---|---|---|---:|---:|"]
+        for rung in ladder_costs(whisper, WHISPER_SIZE_LADDER, max_wer_increase):
+            if rung["within_budget"] is None:
+                speedup, change = "-", "not benchmarked"
+            else:
+                speedup = f"{rung['speedup']:.2f}x"
+                change = f"{rung['wer_increase']:+.1%}" + ("" if rung["within_budget"] else " (over budget)")
+            limit = f"up to {rung['limit']:g} s" if np.isfinite(rung["limit"]) else "longer"
+            lines.append(f"| {limit} | {rung['model']} | {rung['backend']} | {speedup} | {change} |")
+
+    best = recommend(report["results"], min_speedup, max_wer_increase)
+    target = f"at least {min_speedup:g}x faster than fp32 whisper-{WHISPER_MODEL} within {max_wer_increase:+.1%} WER"
+    if best:
+        lines += ["", f"Recommended: {best['model']} {best['backend']} ({best['speedup']:.2f}x, "
+                      f"{best['wer_increase']:+.1%} WER), {target}."]
+    else:
+        lines += ["", f"No setting is {target}."]
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--audio", nargs="+", help="Recordings to transcribe")
+    parser.add_argument("--reference", nargs="+", help="Reference transcript files, one per recording")
+    parser.add_argument("--sizes", nargs="+", default=sorted({size for _, size in WHISPER_SIZE_LADDER} | {WHISPER_MODEL}))
+    parser.add_argument("--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS))
+    parser.add_argument("--skip-emotion", action="store_true", help="Only benchmark Whisper")
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--min-speedup", type=float, default=2.0)
+    parser.add_argument("--max-wer-increase", type=float, default=0.02, help="Absolute WER increase allowed")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/backends-<commit>.json)")
+    parser.add_argument("--from", dest="saved", help="Re-print the report of a saved run")
+    args = parser.parse_args()
+
+    if args.saved:
+        with open(args.saved) as f:
+            print(render(json.load(f), args.min_speedup, args.max_wer_increase))
+        return
+    if not args.audio:
+        parser.error("--audio is required unless --from is given")
+    if args.reference and len(args.reference) != len(args.audio):
+        parser.error("give one --reference per --audio file")
+
+    references = None
+    if args.reference:
+        references = []
+        for path in args.reference:
+            with open(path) as f:
+                references.append(f.read())
+    buffers = [AudioBuffer.from_file(path) for path in args.audio]
+    backends = list(args.backends)
+    if BASELINE_BACKEND not in backends:
+        backends.insert(0, BASELINE_BACKEND)
+    sizes = list(args.sizes)
+    if WHISPER_MODEL not in sizes:
+        sizes.append(WHISPER_MODEL)
+
+    results = []
+    for size in sizes:
+        for backend in backends:
+            print(f"whisper-{size} {backend}")
+            results.append(bench_whisper(size, backend, buffers, args.repeats))
+    if not args.skip_emotion:
+        voice_activity = [detect_voice_activity(buffer) for buffer in buffers]
+        for backend in backends:
+            print(f"emotion {backend}")
+            results.append(bench_emotion(backend, buffers, voice_activity, args.repeats))
+    score(results, references)
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "cpu_count": os.cpu_count(),
+        "audio": args.audio,
+        "references": bool(references),
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"backends-{commit or 'results'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(render(report, args.min_speedup, args.max_wer_increase))
+    print(f"\nSaved {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Check that prosody analysis stays a small fraction of real time.
+
+    python -m benchmarks.bench_prosody [--seconds 600] [--max-seconds 1.0]
+
+Exits with an error if the best run over a fresh buffer (features included)
+takes longer than --max-seconds.
+"""
+import argparse
+import sys
+import time
+
+from audio_processing.prosody import analyze_prosody
+from benchmarks.synthetic import synthetic_speech
+from utils.audio_buffer import AudioBuffer
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=600)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=1.0)
+    args = parser.parse_args()
+
+    samples = synthetic_speech(args.seconds)
+    timings = []
+    for _ in range(args.repeats):
+        # A fresh buffer each time, so features memoized on it aren't reused
+        buffer = AudioBuffer(samples)
+        start = time.perf_counter()
+        result = analyze_prosody(buffer)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    print(f"{args.seconds:.0f} s of audio, {len(result['prosody_over_time']['time'])} windows")
+    print(f"  prosody      {best * 1000:8.1f} ms  RTF {best / args.seconds:.5f}")
+    print(f"  median pitch {result['median_pitch']:.1f} Hz, monotony {result['monotony_score']:.2f}")
+    if best > args.max_seconds:
+        sys.exit(f"Prosody analysis took {best:.2f} s, over the {args.max_seconds:.2f} s budget "
+                 f"(RTF {best / args.seconds:.5f} > {args.max_seconds / args.seconds:.5f})")
+
+if __name__ == "__main__":
+    main()
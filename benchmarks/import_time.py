@@ -0,0 +1,145 @@
+"""
+Measure cold-start import time of the app and its modules.
+
+    python -m benchmarks.import_time [--modules app audio_processing.pipeline]
+                                     [--repeats 5] [--output results.json]
+                                     [--compare baseline.json]
+
+Each module is imported in a fresh interpreter, so nothing is shared with
+earlier imports. Each entry reports the best wall time over --repeats runs,
+the peak RSS of the interpreter, and which heavy dependencies (torch,
+whisper, openai, ...) the import pulled in; those should only load when the
+stage needing them first runs. Results are saved as JSON (by default under
+benchmarks/results/imports-<commit>.json) so a later run can --compare
+against them: slower imports and newly loaded heavy dependencies are
+reported as regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+from benchmarks.run import RESULTS_DIR, git_commit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = [
+    "config.config",
+    "audio_processing.filler_words",
+    "audio_processing.pipeline",
+    "feedback.feedback_generator",
+    "jobs.worker",
+    "app",
+]
+# Dependencies that cost seconds or hundreds of MB to import
+HEAVY_MODULES = ["torch", "torchaudio", "transformers", "speechbrain", "whisper", "librosa", "openai", "sklearn", "numba"]
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+try:
+    # ru_maxrss survives exec on Linux, so it would report the parent's peak
+    with open("/proc/self/status") as f:
+        peak = next(int(line.split()[1]) * 1024 for line in f if line.startswith("VmHWM:"))
+except OSError:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = peak if sys.platform == "darwin" else peak * 1024
+print(json.dumps({{
+    "seconds": seconds,
+    "peak_rss_mb": peak / 2 ** 20,
+    "heavy_modules": sorted(name for name in {heavy!r} if name in sys.modules)
+}}))
+"""
+
+def measure_import(module: str, repeats: int = 3) -> Dict:
+    """
+    Import a module in fresh interpreters.
+
+    Args:
+        module (str): Dotted module name, importable from the repository root
+        repeats (int): Interpreters started; the fastest import is reported
+
+    Returns:
+        Dict: module, seconds, peak_rss_mb and heavy_modules (heavy
+            dependencies the import loaded)
+    """
+    runs = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module, heavy=HEAVY_MODULES)],
+            cwd=REPO_ROOT, capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Importing {module} failed:\n{completed.stderr}")
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda run: run["seconds"])
+    return {"module": module, **best}
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Print import-time changes against a saved run.
+
+    Returns:
+        List[str]: Modules slower than the baseline by more than `tolerance`
+            or loading heavy dependencies they didn't load before
+    """
+    previous = {entry["module"]: entry for entry in baseline["results"]}
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for entry in results:
+        old = previous.get(entry["module"])
+        if old is None:
+            continue
+        ratio = entry["seconds"] / max(old["seconds"], 1e-9)
+        added = sorted(set(entry["heavy_modules"]) - set(old["heavy_modules"]))
+        flag = ""
+        if ratio > 1 + tolerance or added:
+            flag = "  REGRESSION" + (f" (now imports {', '.join(added)})" if added else "")
+            regressions.append(entry["module"])
+        print(f"  {entry['module']:<36} {ratio:6.2f}x{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/imports-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier JSON results to compare import times against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    results = []
+    for module in args.modules:
+        entry = measure_import(module, args.repeats)
+        results.append(entry)
+        heavy = ", ".join(entry["heavy_modules"]) or "-"
+        print(f"  {module:<36} {entry['seconds'] * 1000:8.0f} ms  RSS {entry['peak_rss_mb']:7.1f} MB  heavy: {heavy}")
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": args.repeats,
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"imports-{commit or 'results'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(f"{len(regressions)} import regression(s): {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    main()
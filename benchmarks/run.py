@@ -0,0 +1,242 @@
+"""
+Time every analyzer and the full pipeline on synthetic speech.
+
+    python -m benchmarks.run [--durations 30 300 600] [--real-models]
+                             [--output results.json] [--compare baseline.json]
+
+Models are replaced by offline stubs (benchmarks.stubs) unless --real-models
+is given. Each entry reports the best wall time over --repeats runs, the
+real-time factor, peak RSS while it ran, and the peak of Python/NumPy
+allocations traced by tracemalloc in a separate run. Results are saved as
+JSON (by default under benchmarks/results/, named after the current commit)
+so a later run can --compare against them.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+import soundfile as sf
+
+from audio_processing.emotion import analyze_emotion
+from audio_processing.filler_words import detect_filler_words
+from audio_processing.pacing import analyze_pacing
+from audio_processing.pipeline import DEFAULT_STAGES, run_analysis
+from audio_processing.prosody import analyze_prosody
+from audio_processing.transcriber import transcribe_with_timestamps
+from audio_processing.vad import detect_voice_activity
+from benchmarks.stubs import model_stubs
+from benchmarks.synthetic import synthetic_speech
+from feedback.rules import generate_rule_feedback
+from utils.audio_buffer import AudioBuffer
+from utils.helpers import convert_audio_format, get_audio_duration, normalize_audio
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+class RSSSampler:
+    """Samples RSS in a background thread to find the peak during a block."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "RSSSampler":
+        self.peak = current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, current_rss())
+
+def measure(func: Callable[[], object], duration: float, repeats: int, trace: bool) -> Dict:
+    """
+    Time a call and record its memory use.
+
+    Args:
+        func (Callable[[], object]): Work to measure
+        duration (float): Audio duration in seconds, for the real-time factor
+        repeats (int): Timed runs; the fastest is reported
+        trace (bool): Also run once under tracemalloc
+
+    Returns:
+        Dict: wall_seconds, rtf, peak_rss_mb, rss_growth_mb and alloc_peak_mb
+            (None when not traced)
+    """
+    # One untimed call first, so lazy imports and JIT compilation aren't timed
+    func()
+    timings = []
+    gc.collect()
+    baseline = current_rss()
+    with RSSSampler() as sampler:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+
+    alloc_peak = None
+    if trace:
+        gc.collect()
+        tracemalloc.start()
+        try:
+            func()
+            alloc_peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+
+    wall = min(timings)
+    return {
+        "wall_seconds": wall,
+        "rtf": wall / duration,
+        "peak_rss_mb": sampler.peak / 2 ** 20,
+        "rss_growth_mb": max(sampler.peak - baseline, 0) / 2 ** 20,
+        "alloc_peak_mb": alloc_peak
+    }
+
+def benchmark_duration(seconds: float, workdir: str, repeats: int, trace: bool) -> List[Dict]:
+    """
+    Benchmark every function on one synthetic recording.
+
+    Inputs each function needs from earlier stages are computed up front, so
+    each entry times only that function. Functions that memoize features on
+    the buffer get a fresh buffer on every run.
+    """
+    samples = synthetic_speech(seconds)
+    path = os.path.join(workdir, f"speech_{int(seconds)}s.wav")
+    converted = os.path.join(workdir, f"converted_{int(seconds)}s.wav")
+    sf.write(path, samples, 16000)
+
+    buffer = AudioBuffer(samples)
+    transcript = transcribe_with_timestamps(buffer)
+    voice_activity = detect_voice_activity(buffer)
+    pacing = analyze_pacing(buffer, transcript, voice_activity)
+    filler_words = detect_filler_words(transcript)
+    emotions = analyze_emotion(buffer, voice_activity)
+    end_to_end_stages = [stage for stage in DEFAULT_STAGES if stage.name != "feedback"]
+
+    cases = {
+        "decode": lambda: AudioBuffer.from_file(path),
+        "convert_audio_format": lambda: convert_audio_format(path, converted),
+        "normalize_audio": lambda: normalize_audio(path),
+        "get_audio_duration": lambda: get_audio_duration(path),
+        "transcribe_with_timestamps": lambda: transcribe_with_timestamps(buffer),
+        "detect_voice_activity[webrtc]": lambda: detect_voice_activity(buffer, backend="webrtc"),
+        "detect_voice_activity[energy]": lambda: detect_voice_activity(AudioBuffer(samples), backend="energy"),
+        "analyze_pacing": lambda: analyze_pacing(buffer, transcript, voice_activity),
+        "detect_filler_words": lambda: detect_filler_words(transcript),
+        "analyze_emotion": lambda: analyze_emotion(buffer, voice_activity),
+        "analyze_prosody": lambda: analyze_prosody(AudioBuffer(samples), voice_activity),
+        "generate_rule_feedback": lambda: generate_rule_feedback(voice_activity, pacing, filler_words, emotions),
+        "end_to_end": lambda: run_analysis(AudioBuffer.from_file(path), end_to_end_stages),
+    }
+
+    results = []
+    for name, func in cases.items():
+        entry = {"duration": seconds, "function": name}
+        entry.update(measure(func, seconds, repeats, trace))
+        results.append(entry)
+        alloc = "" if entry["alloc_peak_mb"] is None else f"  alloc {entry['alloc_peak_mb']:8.1f} MB"
+        print(f"  {name:<32} {entry['wall_seconds'] * 1000:9.1f} ms  RTF {entry['rtf']:.5f}"
+              f"  RSS {entry['peak_rss_mb']:7.1f} MB (+{entry['rss_growth_mb']:.1f}){alloc}")
+    return results
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results: List[Dict], baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Print wall-time changes against a saved run.
+
+    Returns:
+        List[str]: Entries slower than the baseline by more than `tolerance`
+    """
+    previous = {(entry["duration"], entry["function"]): entry for entry in baseline["results"]}
+    regressions = []
+    print(f"\nCompared with {baseline.get('commit') or 'baseline'}:")
+    for entry in results:
+        old = previous.get((entry["duration"], entry["function"]))
+        if old is None:
+            continue
+        ratio = entry["wall_seconds"] / max(old["wall_seconds"], 1e-9)
+        label = f"{entry['function']} @ {entry['duration']:g}s"
+        flag = ""
+        if ratio > 1 + tolerance:
+            flag = "  REGRESSION"
+            regressions.append(label)
+        print(f"  {label:<44} {ratio:6.2f}x{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--durations", type=float, nargs="+", default=[30, 300, 600])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--real-models", action="store_true", help="Use the real Whisper and emotion models")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip the allocation-tracing runs")
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--compare", help="Earlier JSON results to compare wall times against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Slowdown ratio reported as a regression")
+    args = parser.parse_args()
+
+    commit = git_commit()
+    results = []
+    stubs = contextlib.nullcontext() if args.real_models else model_stubs()
+    with stubs, tempfile.TemporaryDirectory() as workdir:
+        for seconds in args.durations:
+            print(f"{seconds:g} s of synthetic speech")
+            results.extend(benchmark_duration(seconds, workdir, args.repeats, not args.no_tracemalloc))
+
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "stub_models": not args.real_models,
+        "repeats": args.repeats,
+        "results": results
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit or 'results'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            sys.exit(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Offline stand-ins for the Whisper, emotion and LLM models.
+
+They return deterministic, plausibly shaped results almost instantly, so
+benchmarks and tests can exercise every analyzer and the full pipeline
+without downloading weights or calling an API. Timings taken with stubs
+measure our own code around the models, not the models themselves.
+"""
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+import numpy as np
+import torch
+
+from config.config import SAMPLE_RATE
+from feedback import llm_client
+from utils.model_registry import WHISPER_SIZES, registry
+
+SCRIPT = ("so today I want to talk about um the results of our project and like "
+          "what we actually learned you know when we tested it").split()
+WORD_SECONDS = 0.4
+SEGMENT_SECONDS = 5.0
+
+class StubWhisper:
+    """Speaks one word of SCRIPT every WORD_SECONDS, in SEGMENT_SECONDS segments."""
+
+    def transcribe(self, audio, initial_prompt: Optional[str] = None, word_timestamps: bool = False, **kwargs) -> Dict:
+        duration = len(audio) / SAMPLE_RATE
+        segments = []
+        for start in np.arange(0, duration, SEGMENT_SECONDS):
+            end = min(start + SEGMENT_SECONDS, duration)
+            words = []
+            for word_start in np.arange(start, end - WORD_SECONDS / 2, WORD_SECONDS):
+                index = int(round(word_start / WORD_SECONDS))
+                words.append({
+                    "word": " " + SCRIPT[index % len(SCRIPT)],
+                    "start": float(word_start),
+                    "end": float(min(word_start + WORD_SECONDS * 0.8, end)),
+                    "probability": 0.9
+                })
+            segments.append({
+                "start": float(start),
+                "end": float(end),
+                "text": "".join(word["word"] for word in words),
+                "words": words if word_timestamps else []
+            })
+        return {"text": "".join(segment["text"] for segment in segments), "segments": segments}
+
+class _LabelEncoder:
+    ind2lab = {0: "neu", 1: "hap", 2: "sad", 3: "ang"}
+
+class _Hparams:
+    label_encoder = _LabelEncoder()
+
+class StubEmotionClassifier:
+    """Scores each window from its loudness: louder windows sound happier."""
+    hparams = _Hparams()
+
+    def classify_batch(self, wavs: torch.Tensor, wav_lens: Optional[torch.Tensor] = None):
+        lengths = (wav_lens * wavs.shape[1]).clamp(min=1) if wav_lens is not None else torch.full((len(wavs),), wavs.shape[1])
+        rms = torch.sqrt((wavs ** 2).sum(dim=1) / lengths)
+        loud = torch.clamp(rms * 10, 0, 1)
+        logits = torch.stack([1 - loud, loud, 0.5 * (1 - loud), 0.2 * loud], dim=1) * 4
+        out_prob = torch.log_softmax(logits, dim=-1)
+        score, index = out_prob.max(dim=-1)
+        return out_prob, score, index, None
+
+class StubLLMClient:
+    """Answers every prompt with the same short feedback."""
+    text = "Good structure overall. Slow down in the middle section and cut the filler words."
+
+    def complete(self, messages: List[Dict[str, str]], digest: Optional[str] = None) -> str:
+        return self.text
+
+    def stream(self, messages: List[Dict[str, str]], digest: Optional[str] = None) -> Iterator[str]:
+        for word in self.text.split(" "):
+            yield word + " "
+
+@contextmanager
+def model_stubs():
+    """
+    Swap the stubs into the model registry and LLM clients, restoring the
+    real loaders and clients afterwards.
+    """
+    names = [f"whisper-{size}" for size in WHISPER_SIZES] + ["emotion"]
+    loaders = {name: registry.loader(name) for name in names}
+    clients = dict(llm_client._clients)
+    for size in WHISPER_SIZES:
+        registry.register(f"whisper-{size}", lambda device: StubWhisper())
+    registry.register("emotion", lambda device: StubEmotionClassifier())
+    for backend in ("openai", "local"):
+        llm_client._clients[backend] = StubLLMClient()
+    try:
+        yield
+    finally:
+        for name, loader in loaders.items():
+            registry.register(name, loader)
+        llm_client._clients.clear()
+        llm_client._clients.update(clients)
@@ -11,11 +11,59 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 SAMPLE_RATE = 16000
 CHUNK_SIZE = 1024
 MAX_AUDIO_DURATION = 600  # 10 minutes in seconds
+IO_BLOCK_SECONDS = 10  # audio decoded per block when streaming files
+RESAMPLE_QUALITY = "HQ"  # soxr quality (librosa's default soxr_hq)
+
+# Admission Control Settings (uploads are screened before any model runs)
+MIN_AUDIO_DURATION = 1.0  # seconds
+MIN_SPEECH_SECONDS = 2.0  # uploads with less detected speech are rejected
+PRESCREEN_SAMPLE_RATE = 4000  # the screening pass decimates to this rate
+PRESCREEN_FRAME_SECONDS = 0.02
+PRESCREEN_SPEECH_DB = -35.0  # frames this loud (dBFS) count as speech whatever the noise floor
+TRIM_PADDING_SECONDS = 1.0  # silence kept before the first and after the last speech
+TRIM_MIN_SILENCE_SECONDS = 3.0  # shorter leading or trailing silence is left in place
+ANALYSIS_COST_RTF = 0.3  # estimated analysis seconds per second of trimmed audio
+ANALYSIS_COST_OVERHEAD = 5.0  # estimated fixed seconds per upload (decode, feedback)
 
 # Voice Activity Detection Settings
 VAD_AGGRESSIVENESS = 3
 MIN_SPEECH_DURATION = 0.5  # seconds
 MIN_SILENCE_DURATION = 0.5  # seconds
+VAD_FRAME_MS = 30  # WebRTC VAD accepts 10, 20 or 30 ms frames
+VAD_BACKEND = "webrtc"  # "webrtc" or "energy" (pure NumPy energy/zero-crossing detector)
+ENERGY_VAD_MARGIN_DB = 12.0  # speech must be this far above the estimated noise floor
+ENERGY_VAD_MIN_DB = -50.0  # absolute floor (dBFS) below which frames are never speech
+ENERGY_VAD_MAX_ZCR = 0.35  # quieter frames with more zero crossings than this are noise
+
+# Feature Extraction Settings (Whisper's front end: 25 ms window, 10 ms hop, 80 mel bins)
+FEATURE_N_FFT = 400
+FEATURE_HOP_LENGTH = 160
+FEATURE_N_MELS = 80
+F0_MIN = 65.0  # Hz, lowest pitch tracked
+F0_MAX = 400.0  # Hz, highest pitch tracked
+F0_SAMPLE_RATE = 4000  # audio is decimated to this rate for pitch tracking
+F0_FRAME_SECONDS = 0.05  # must hold two periods of F0_MIN
+F0_THRESHOLD = 0.1  # YIN dip threshold on the normalized difference function
+VOICED_MAX_DB_BELOW_PEAK = 35.0  # quieter frames get no pitch estimate
+
+# Prosody Settings
+PROSODY_WINDOW_SECONDS = 5.0
+PROSODY_HOP_SECONDS = 2.5
+PROSODY_MIN_VOICED_FRACTION = 0.2  # windows with less voiced audio are not scored
+EXPRESSIVE_PITCH_STD = 4.0  # semitones of pitch variation that count as fully expressive
+EXPRESSIVE_ENERGY_STD = 8.0  # dB of loudness variation that count as fully expressive
+MONOTONY_THRESHOLD = 0.6  # windows scoring above this are flagged as monotonous
+
+# Streaming Settings
+STREAM_UPDATE_INTERVAL = 0.25  # seconds of audio between metric updates
+STREAM_WINDOW_SECONDS = 10  # rolling window for "recent" metrics
+STREAM_RING_SECONDS = 30  # most recent audio kept for downstream consumers
+
+# Pacing Settings
+PACING_WINDOW_SECONDS = 10.0  # window for the speaking-rate time series
+PACING_HOP_SECONDS = 5.0
+LONG_PAUSE_DURATION = 2.0  # seconds
+PAUSE_HISTOGRAM_BINS = [0.5, 1.0, 2.0, 3.0]  # seconds; last bin is open-ended
 
 # Filler Word Detection
 COMMON_FILLER_WORDS = [
@@ -27,17 +75,105 @@ COMMON_FILLER_WORDS = [
 # Emotion Detection Settings
 EMOTION_MODEL = "audeering/wav2vec2-large-robust-12-ft-emotion"
 EMOTION_THRESHOLD = 0.5
+EMOTION_MODEL_SOURCE = "speechbrain/emotion-recognition-wav2vec2-IEMOCAP"
+EMOTION_MODEL_DIR = "models/emotion_recognition"
+EMOTION_SEGMENT_SECONDS = 8.0  # longest speech segment sent to the model
+EMOTION_MIN_SEGMENT_SECONDS = 1.0  # shorter segments are skipped (too little context)
+EMOTION_BATCH_SIZE = 8
+EMOTION_NUM_THREADS = 0  # torch intra-op threads on CPU; 0 keeps torch's default
+
+# Transcription Settings
+WHISPER_MODEL = "base"
+TRANSCRIBE_WINDOW_SECONDS = 30  # Whisper's native context length
+TRANSCRIBE_OVERLAP_SECONDS = 5
+TRANSCRIBE_PROMPT_CHARS = 200  # previous text carried into the next window
+# Whisper size picked from the upload's length: the first rung whose limit (seconds)
+# covers it, then one rung smaller per WHISPER_LADDER_QUEUE_STEP queued jobs
+WHISPER_AUTO_SIZE = os.getenv("WHISPER_AUTO_SIZE", "true").lower() == "true"
+# Talks of any ordinary length get WHISPER_MODEL; only recordings over half an
+# hour start a rung down. Smaller rungs trade accuracy for speed, so check the
+# WER each adds in the "Size ladder" table of `python -m benchmarks.backends`
+# before moving a limit
+WHISPER_SIZE_LADDER = [(1800, WHISPER_MODEL), (float("inf"), "tiny")]
+WHISPER_LADDER_QUEUE_STEP = 8
+
+# Inference Backend Settings
+INFERENCE_DEVICE = os.getenv("INFERENCE_DEVICE", "auto")  # "auto" (CUDA when available), "cpu" or "cuda"
+MODEL_QUANTIZATION = os.getenv("MODEL_QUANTIZATION", "int8")  # "int8" (dynamic, linear layers, CPU only) or "none"
+# torch.compile the heaviest submodules; the first call compiles for about a minute
+MODEL_COMPILE = os.getenv("MODEL_COMPILE", "false").lower() == "true"
+
+# Analysis Pipeline Settings
+PIPELINE_MAX_WORKERS = 4
+PIPELINE_PROCESS_STAGES = []  # stage names to run in a process pool instead of threads
+
+# Result Cache Settings
+CACHE_DIR = "cache"
+CACHE_MAX_MB = int(os.getenv("CACHE_MAX_MB", 512))
+
+# Model Registry Settings
+MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", 4096))
+# Only the default Whisper size; other ladder rungs load when first needed
+WARMUP_MODELS = [f"whisper-{WHISPER_MODEL}", "emotion"]
 
 # Feedback Generation Settings
 GPT_MODEL = "gpt-4"
 MAX_TOKENS = 1000
 TEMPERATURE = 0.7
+FEEDBACK_BACKEND = os.getenv("FEEDBACK_BACKEND", "openai")  # "openai" or "local" (any OpenAI-compatible server)
+LOCAL_LLM_BASE_URL = os.getenv("LOCAL_LLM_BASE_URL", "http://localhost:8000/v1")
+LOCAL_LLM_MODEL = os.getenv("LOCAL_LLM_MODEL", "llama-3-8b-instruct")
+LLM_TIMEOUT_SECONDS = 60.0
+LLM_MAX_RETRIES = 3
+LLM_BACKOFF_SECONDS = 1.0  # doubled after each failed attempt, with jitter
+
+# Rule-based Feedback Settings
+# "tiered": rule-based feedback at once, LLM feedback streamed after it
+# "rules": rule-based feedback only (no API calls)
+# "llm": LLM feedback only, falling back to the rules when the API is unavailable
+FEEDBACK_MODE = os.getenv("FEEDBACK_MODE", "tiered")
+TARGET_SPEECH_RATE = (130, 160)  # comfortable words per minute
+MAX_RATE_VARIABILITY = 0.3  # std/mean of the windowed speaking rate
+FILLER_PERCENTAGE_WARN = 3.0
+FILLER_PERCENTAGE_HIGH = 6.0
+MIN_VOICE_PERCENTAGE = 50.0
+PAUSE_PERCENTAGE_RANGE = (10.0, 35.0)
+MAX_LONG_PAUSES_PER_MINUTE = 1.0
 
 # File Paths
 TEMP_DIR = "temp"
 UPLOAD_DIR = "uploads"
 OUTPUT_DIR = "output"
 
-# Create necessary directories
-for directory in [TEMP_DIR, UPLOAD_DIR, OUTPUT_DIR]:
-    os.makedirs(directory, exist_ok=True) 
\ No newline at end of file
+# Job Queue Settings
+USE_JOB_QUEUE = os.getenv("USE_JOB_QUEUE", "false").lower() == "true"
+JOB_DB_PATH = os.path.join(OUTPUT_DIR, "jobs.sqlite3")
+JOB_MAX_QUEUE_DEPTH = 500  # submissions beyond this are rejected (backpressure)
+JOB_BATCH_SIZE = 4  # jobs a worker claims and batches together
+JOB_POLL_INTERVAL = 1.0  # seconds
+JOB_STALE_SECONDS = 1800  # running jobs older than this are requeued
+
+# Results Store Settings (per-student history of every analysis)
+RESULTS_DB_PATH = os.path.join(OUTPUT_DIR, "results.sqlite3")
+RESULTS_PERCENTILES = [10, 25, 50, 75, 90]  # cohort percentiles reported by aggregate queries
+
+# Worker Pool Settings
+# "throughput": many worker processes with a few torch threads each (most jobs per hour)
+# "latency": few processes with many threads each (fastest completion of a single job)
+WORKER_MODE = os.getenv("WORKER_MODE", "throughput")
+WORKER_PROCESSES = int(os.getenv("WORKER_PROCESSES", 0))  # 0 derives the count from WORKER_MODE
+WORKER_THREADS = int(os.getenv("WORKER_THREADS", 0))  # torch threads per process; 0 derives from WORKER_MODE
+WORKER_THROUGHPUT_THREADS = 2  # threads per process in throughput mode
+WORKER_LATENCY_PROCESSES = 1  # processes in latency mode
+
+# Instrumentation Settings
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Port of the Prometheus text endpoint (0 disables it); pool worker i serves on METRICS_PORT + i
+METRICS_PORT = int(os.getenv("METRICS_PORT", 0))
+METRICS_LOG_PATH = os.getenv("METRICS_LOG_PATH", "")  # JSON-lines event log; empty disables it
+METRICS_LATENCY_BUCKETS = [0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0]
+
+# Create necessary directories; entry points call this so importing config has no side effects
+def ensure_directories() -> None:
+    for directory in [TEMP_DIR, UPLOAD_DIR, OUTPUT_DIR]:
+        os.makedirs(directory, exist_ok=True)
@@ -1,19 +1,23 @@
-from typing import Dict
-import os
-from openai import OpenAI
+from typing import Dict, Iterator, List
+from feedback.llm_client import get_llm_client, metrics_digest
+from utils.instrumentation import record_error, timed
 
-# Initialize OpenAI client
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+FEEDBACK_UNAVAILABLE = "Unable to generate feedback at this time. Please try again later."
 
-def generate_feedback(
+SYSTEM_PROMPT = "You are an expert presentation coach providing constructive feedback."
+
+def normalize_metrics(
     transcription: str,
     voice_activity: Dict,
     pacing: Dict,
     filler_words: Dict,
     emotions: Dict
-) -> str:
+) -> Dict:
     """
-    Generate natural language feedback using GPT-4.
+    Reduce analysis results to the values the feedback prompt uses.
+    
+    Values are rounded to the precision shown in the prompt, so recordings
+    with the same metric profile produce the same prompt and cache key.
     
     Args:
         transcription (str): Transcribed text
@@ -23,33 +27,55 @@ def generate_feedback(
         emotions (Dict): Emotion analysis results
         
     Returns:
-        str: Generated feedback
+        Dict: JSON-serializable metrics
     """
-    try:
-        # Construct the prompt
-        prompt = f"""
+    return {
+        "transcription": " ".join(transcription[:500].split()),
+        "total_frames": int(voice_activity.get('total_frames', 0)),
+        "voice_percentage": round(float(voice_activity.get('voice_percentage', 0)), 2),
+        "speech_rate": round(float(pacing.get('speech_rate', 0)), 2),
+        "avg_pause_duration": round(float(pacing.get('avg_pause_duration', 0)), 2),
+        "pause_percentage": round(float(pacing.get('pause_percentage', 0)), 2),
+        "total_filler_words": int(filler_words.get('total_filler_words', 0)),
+        "filler_percentage": round(float(filler_words.get('filler_percentage', 0)), 2),
+        "most_common_fillers": [[word, int(count)] for word, count in filler_words.get('most_common_fillers', [])],
+        "dominant_emotion": emotions.get('dominant_emotion', 'neutral'),
+        "emotion_confidence": round(float(emotions.get('confidence', 0)), 2)
+    }
+
+def build_feedback_prompt(metrics: Dict) -> List[Dict[str, str]]:
+    """
+    Chat messages asking for feedback on normalized metrics.
+    
+    Args:
+        metrics (Dict): Output of normalize_metrics
+        
+    Returns:
+        List[Dict[str, str]]: System and user messages
+    """
+    prompt = f"""
         Based on the following presentation analysis, provide constructive feedback 
         to help improve the speaker's presentation skills:
 
-        Transcription: {transcription[:500]}...
+        Transcription: {metrics['transcription']}...
 
         Voice Activity:
-        - Total frames: {voice_activity.get('total_frames', 0)}
-        - Voice percentage: {voice_activity.get('voice_percentage', 0):.2f}%
+        - Total frames: {metrics['total_frames']}
+        - Voice percentage: {metrics['voice_percentage']:.2f}%
 
         Pacing:
-        - Speech rate: {pacing.get('speech_rate', 0):.2f} words per minute
-        - Average pause duration: {pacing.get('avg_pause_duration', 0):.2f} seconds
-        - Pause percentage: {pacing.get('pause_percentage', 0):.2f}%
+        - Speech rate: {metrics['speech_rate']:.2f} words per minute
+        - Average pause duration: {metrics['avg_pause_duration']:.2f} seconds
+        - Pause percentage: {metrics['pause_percentage']:.2f}%
 
         Filler Words:
-        - Total filler words: {filler_words.get('total_filler_words', 0)}
-        - Filler word percentage: {filler_words.get('filler_percentage', 0):.2f}%
-        - Most common fillers: {', '.join([f"{word} ({count})" for word, count in filler_words.get('most_common_fillers', [])])}
+        - Total filler words: {metrics['total_filler_words']}
+        - Filler word percentage: {metrics['filler_percentage']:.2f}%
+        - Most common fillers: {', '.join([f"{word} ({count})" for word, count in metrics['most_common_fillers']])}
 
         Emotional Analysis:
-        - Dominant emotion: {emotions.get('dominant_emotion', 'neutral')}
-        - Emotion confidence: {emotions.get('confidence', 0):.2f}
+        - Dominant emotion: {metrics['dominant_emotion']}
+        - Emotion confidence: {metrics['emotion_confidence']:.2f}
 
         Please provide specific, actionable feedback in the following areas:
         1. Speech Clarity and Voice
@@ -60,20 +86,73 @@ def generate_feedback(
 
         Format the feedback in a clear, constructive manner with specific suggestions for improvement.
         """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
 
-        # Generate feedback using GPT-4
-        response = client.chat.completions.create(
-            model="gpt-4",
-            messages=[
-                {"role": "system", "content": "You are an expert presentation coach providing constructive feedback."},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.7,
-            max_tokens=1000
-        )
+@timed("feedback")
+def generate_feedback(
+    transcription: str,
+    voice_activity: Dict,
+    pacing: Dict,
+    filler_words: Dict,
+    emotions: Dict
+) -> str:
+    """
+    Generate natural language feedback with the configured LLM backend.
+    
+    Identical metric profiles are answered from the cache instead of
+    calling the model again.
+    
+    Args:
+        transcription (str): Transcribed text
+        voice_activity (Dict): Voice activity detection results
+        pacing (Dict): Pacing analysis results
+        filler_words (Dict): Filler word analysis results
+        emotions (Dict): Emotion analysis results
         
-        return response.choices[0].message.content
+    Returns:
+        str: Generated feedback
+    """
+    try:
+        metrics = normalize_metrics(transcription, voice_activity, pacing, filler_words, emotions)
+        return get_llm_client().complete(build_feedback_prompt(metrics), metrics_digest(metrics))
+        
+    except Exception as e:
+        print(f"Error generating feedback: {str(e)}")
+        record_error("feedback", e)
+        return FEEDBACK_UNAVAILABLE
+
+def stream_feedback(
+    transcription: str,
+    voice_activity: Dict,
+    pacing: Dict,
+    filler_words: Dict,
+    emotions: Dict
+) -> Iterator[str]:
+    """
+    Stream feedback text as the model produces it.
+    
+    Args:
+        transcription (str): Transcribed text
+        voice_activity (Dict): Voice activity detection results
+        pacing (Dict): Pacing analysis results
+        filler_words (Dict): Filler word analysis results
+        emotions (Dict): Emotion analysis results
         
+    Yields:
+        str: Pieces of the feedback; FEEDBACK_UNAVAILABLE if nothing could be generated
+    """
+    streamed = False
+    try:
+        metrics = normalize_metrics(transcription, voice_activity, pacing, filler_words, emotions)
+        for piece in get_llm_client().stream(build_feedback_prompt(metrics), metrics_digest(metrics)):
+            streamed = True
+            yield piece
+            
     except Exception as e:
         print(f"Error generating feedback: {str(e)}")
-        return "Unable to generate feedback at this time. Please try again later." 
\ No newline at end of file
+        record_error("feedback", e)
+        if not streamed:
+            yield FEEDBACK_UNAVAILABLE
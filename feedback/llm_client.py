@@ -0,0 +1,251 @@
+import asyncio
+import hashlib
+import json
+import os
+import queue
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from config.config import (
+    FEEDBACK_BACKEND,
+    GPT_MODEL,
+    LLM_BACKOFF_SECONDS,
+    LLM_MAX_RETRIES,
+    LLM_TIMEOUT_SECONDS,
+    LOCAL_LLM_BASE_URL,
+    LOCAL_LLM_MODEL,
+    MAX_TOKENS,
+    TEMPERATURE,
+)
+from utils.instrumentation import record_llm_first_token, record_llm_retry
+from utils.result_cache import ResultCache, get_result_cache
+
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
+
+Messages = List[Dict[str, str]]
+
+_CACHE_STAGE = "llm_feedback"
+_DONE = object()
+
+
+def _retryable() -> Tuple[type, ...]:
+    # openai takes most of a second to import, so it is only imported once a
+    # request is actually made
+    import openai
+    return (openai.APIConnectionError, openai.APITimeoutError, openai.RateLimitError, openai.InternalServerError)
+
+
+class _LoopThread:
+    """
+    Event loop running in a daemon thread.
+
+    The async client and its connection pool belong to this one loop, so
+    synchronous callers on any thread reuse the same open connections.
+    """
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="llm-client", daemon=True)
+        self._thread.start()
+
+    def run(self, coro, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def iterate(self, agen: AsyncIterator[str]) -> Iterator[str]:
+        items: "queue.Queue" = queue.Queue()
+
+        async def pump():
+            try:
+                async for item in agen:
+                    items.put(item)
+            except BaseException as e:
+                items.put(e)
+            finally:
+                items.put(_DONE)
+
+        asyncio.run_coroutine_threadsafe(pump(), self.loop)
+        while True:
+            item = items.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+
+class LLMClient:
+    """
+    Async chat-completion client with streaming, retries and a response cache.
+
+    Works with the OpenAI API or any OpenAI-compatible server (llama.cpp,
+    vLLM, Ollama) given its base URL. Responses are cached by a caller
+    supplied key, so identical requests are only billed once.
+    """
+
+    def __init__(self, model: str, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 temperature: float = TEMPERATURE, max_tokens: int = MAX_TOKENS,
+                 timeout: float = LLM_TIMEOUT_SECONDS, max_retries: int = LLM_MAX_RETRIES,
+                 backoff: float = LLM_BACKOFF_SECONDS, cache: Optional[ResultCache] = None):
+        self.model = model
+        self.base_url = base_url
+        self.api_key = api_key
+        self.temperature = temperature
+        self.max_tokens = max_tokens
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = cache
+        self._client: Optional["AsyncOpenAI"] = None
+        self._loop: Optional[_LoopThread] = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> "AsyncOpenAI":
+        # Created on first use, inside the loop that will own its connections;
+        # retries are ours so that failed streams can be retried too
+        if self._client is None:
+            from openai import AsyncOpenAI
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                max_retries=0
+            )
+        return self._client
+
+    def cache_key(self, digest: str) -> str:
+        """
+        Cache key for a request digest under this client's model settings.
+
+        Args:
+            digest (str): Digest of the request content
+
+        Returns:
+            str: Hex SHA-256 key
+        """
+        settings = f"{self.base_url}|{self.model}|{self.temperature}|{self.max_tokens}|{digest}"
+        return hashlib.sha256(settings.encode()).hexdigest()
+
+    async def astream(self, messages: Messages, digest: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream a completion token by token.
+
+        A cached response is yielded as a single piece. Failures before the
+        first token are retried with exponential backoff; a response that
+        breaks off midway raises, since its text has already been shown.
+
+        Args:
+            messages (Messages): Chat messages
+            digest (Optional[str]): Request digest to cache the response under
+
+        Yields:
+            str: Pieces of the response text as they arrive
+        """
+        key = self.cache_key(digest) if digest is not None and self.cache is not None else None
+        if key is not None:
+            found, text = self.cache.lookup(_CACHE_STAGE, key)
+            if found:
+                yield text
+                return
+
+        pieces: List[str] = []
+        retryable = _retryable()
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                stream = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=messages,
+                    temperature=self.temperature,
+                    max_tokens=self.max_tokens,
+                    stream=True
+                )
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    piece = chunk.choices[0].delta.content
+                    if piece:
+                        if not pieces:
+                            record_llm_first_token(self.model, time.perf_counter() - start)
+                        pieces.append(piece)
+                        yield piece
+                break
+            except retryable as e:
+                if pieces or attempt == self.max_retries:
+                    raise
+                record_llm_retry(self.model, e)
+                await asyncio.sleep(self.backoff * 2 ** attempt * (0.5 + random.random()))
+
+        if key is not None:
+            self.cache.put(_CACHE_STAGE, key, "".join(pieces))
+
+    async def acomplete(self, messages: Messages, digest: Optional[str] = None) -> str:
+        """
+        Full completion text (cached when a digest is given).
+
+        Args:
+            messages (Messages): Chat messages
+            digest (Optional[str]): Request digest to cache the response under
+
+        Returns:
+            str: Response text
+        """
+        return "".join([piece async for piece in self.astream(messages, digest)])
+
+    def stream(self, messages: Messages, digest: Optional[str] = None) -> Iterator[str]:
+        """Synchronous wrapper of astream() for threads without an event loop."""
+        return self._loop_thread().iterate(self.astream(messages, digest))
+
+    def complete(self, messages: Messages, digest: Optional[str] = None) -> str:
+        """Synchronous wrapper of acomplete() for threads without an event loop."""
+        return self._loop_thread().run(self.acomplete(messages, digest))
+
+    def _loop_thread(self) -> _LoopThread:
+        with self._lock:
+            if self._loop is None:
+                self._loop = _LoopThread()
+            return self._loop
+
+
+def metrics_digest(metrics: Dict) -> str:
+    """
+    Digest of the analysis metrics a feedback prompt is built from.
+
+    Args:
+        metrics (Dict): Normalized metrics (JSON-serializable)
+
+    Returns:
+        str: Hex SHA-256 digest, independent of key order
+    """
+    return hashlib.sha256(json.dumps(metrics, sort_keys=True).encode()).hexdigest()
+
+
+_clients: Dict[str, LLMClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_llm_client(backend: str = FEEDBACK_BACKEND) -> LLMClient:
+    """
+    Process-wide client for the configured feedback backend.
+
+    Args:
+        backend (str): "openai" or "local" (an OpenAI-compatible server at
+            config.LOCAL_LLM_BASE_URL)
+
+    Returns:
+        LLMClient: The shared client
+    """
+    with _clients_lock:
+        if backend not in _clients:
+            if backend == "openai":
+                client = LLMClient(GPT_MODEL, api_key=os.getenv("OPENAI_API_KEY"), cache=get_result_cache())
+            elif backend == "local":
+                client = LLMClient(LOCAL_LLM_MODEL, base_url=LOCAL_LLM_BASE_URL,
+                                   api_key=os.getenv("LOCAL_LLM_API_KEY", "local"), cache=get_result_cache())
+            else:
+                raise ValueError(f"Unknown feedback backend: {backend}")
+            _clients[backend] = client
+        return _clients[backend]
@@ -0,0 +1,242 @@
+from typing import Callable, Dict, List, NamedTuple
+
+from config.config import (
+    FILLER_PERCENTAGE_HIGH,
+    FILLER_PERCENTAGE_WARN,
+    LONG_PAUSE_DURATION,
+    MAX_LONG_PAUSES_PER_MINUTE,
+    MAX_RATE_VARIABILITY,
+    MIN_VOICE_PERCENTAGE,
+    PAUSE_PERCENTAGE_RANGE,
+    TARGET_SPEECH_RATE,
+)
+from utils.instrumentation import timed
+
+AREAS = {
+    "voice": "Speech Clarity and Voice",
+    "pacing": "Pacing and Timing",
+    "fillers": "Filler Word Usage",
+    "emotion": "Emotional Delivery",
+}
+
+
+class Rule(NamedTuple):
+    """
+    One feedback template and the condition under which it applies.
+
+    `when` and `severity` receive the flattened facts from collect_facts();
+    `message` is formatted with the same facts. Rules with zero severity are
+    strengths, the rest are suggestions ranked by severity.
+    """
+    name: str
+    area: str
+    when: Callable[[Dict], bool]
+    message: str
+    severity: Callable[[Dict], float] = lambda facts: 0.0
+
+
+RULES = [
+    Rule(
+        "too_fast", "pacing",
+        lambda f: f["speech_rate"] > TARGET_SPEECH_RATE[1],
+        "You spoke at {speech_rate:.0f} words per minute, above the comfortable {rate_min}-{rate_max} range. "
+        "Slow down when you introduce a new idea and pause after key points.",
+        lambda f: (f["speech_rate"] - TARGET_SPEECH_RATE[1]) / TARGET_SPEECH_RATE[1] * 4
+    ),
+    Rule(
+        "too_slow", "pacing",
+        lambda f: 0 < f["speech_rate"] < TARGET_SPEECH_RATE[0],
+        "You spoke at {speech_rate:.0f} words per minute, below the comfortable {rate_min}-{rate_max} range. "
+        "Rehearse the transitions between points so they flow without hesitation.",
+        lambda f: (TARGET_SPEECH_RATE[0] - f["speech_rate"]) / TARGET_SPEECH_RATE[0] * 4
+    ),
+    Rule(
+        "good_rate", "pacing",
+        lambda f: TARGET_SPEECH_RATE[0] <= f["speech_rate"] <= TARGET_SPEECH_RATE[1],
+        "Your speaking rate of {speech_rate:.0f} words per minute is easy to follow."
+    ),
+    Rule(
+        "uneven_rate", "pacing",
+        lambda f: f["rate_variability"] > MAX_RATE_VARIABILITY,
+        "Your pace changed a lot during the talk (variability {rate_variability:.0%}). "
+        "Mark the sections where you tend to rush and practise them at a steady pace.",
+        lambda f: f["rate_variability"] / MAX_RATE_VARIABILITY - 1
+    ),
+    Rule(
+        "long_pauses", "pacing",
+        lambda f: f["long_pauses_per_minute"] > MAX_LONG_PAUSES_PER_MINUTE,
+        "You paused for more than {long_pause_seconds:.0f} seconds {long_pause_count} times. "
+        "Keep brief notes of each section's opening line to avoid losing your place.",
+        lambda f: f["long_pauses_per_minute"] / MAX_LONG_PAUSES_PER_MINUTE - 1
+    ),
+    Rule(
+        "few_pauses", "pacing",
+        lambda f: f["total_words"] > 0 and f["pause_percentage"] < PAUSE_PERCENTAGE_RANGE[0],
+        "Only {pause_percentage:.0f}% of the talk was pauses. "
+        "Short pauses between points give the audience time to absorb them.",
+        lambda f: (PAUSE_PERCENTAGE_RANGE[0] - f["pause_percentage"]) / PAUSE_PERCENTAGE_RANGE[0]
+    ),
+    Rule(
+        "many_pauses", "pacing",
+        lambda f: f["pause_percentage"] > PAUSE_PERCENTAGE_RANGE[1],
+        "{pause_percentage:.0f}% of the talk was silence. "
+        "Rehearse until you can move between points without long breaks.",
+        lambda f: (f["pause_percentage"] - PAUSE_PERCENTAGE_RANGE[1]) / PAUSE_PERCENTAGE_RANGE[1] * 2
+    ),
+    Rule(
+        "many_fillers", "fillers",
+        lambda f: f["filler_percentage"] >= FILLER_PERCENTAGE_HIGH,
+        "{filler_percentage:.1f}% of your words were fillers, most often \"{top_filler}\" ({top_filler_count} times). "
+        "Replace them with a silent pause; it sounds more confident than filling the gap.",
+        lambda f: 1 + f["filler_percentage"] / FILLER_PERCENTAGE_HIGH
+    ),
+    Rule(
+        "some_fillers", "fillers",
+        lambda f: FILLER_PERCENTAGE_WARN <= f["filler_percentage"] < FILLER_PERCENTAGE_HIGH,
+        "{filler_percentage:.1f}% of your words were fillers, most often \"{top_filler}\". "
+        "Notice where they cluster (often at the start of sentences) and pause there instead.",
+        lambda f: f["filler_percentage"] / FILLER_PERCENTAGE_HIGH
+    ),
+    Rule(
+        "few_fillers", "fillers",
+        lambda f: f["total_words"] > 0 and f["filler_percentage"] < FILLER_PERCENTAGE_WARN,
+        "You used very few filler words ({filler_percentage:.1f}% of words)."
+    ),
+    Rule(
+        "little_speech", "voice",
+        # No frames means voice activity detection failed, not a quiet talk
+        lambda f: f["total_frames"] > 0 and f["voice_percentage"] < MIN_VOICE_PERCENTAGE,
+        "Speech was detected in only {voice_percentage:.0f}% of the recording. "
+        "Speak closer to the microphone and with more projection, and trim long silences.",
+        lambda f: (MIN_VOICE_PERCENTAGE - f["voice_percentage"]) / MIN_VOICE_PERCENTAGE * 3
+    ),
+    Rule(
+        "flat_delivery", "emotion",
+        lambda f: f["dominant_emotion"] in ("neu", "neutral") and f["emotion_confidence"] >= 0.6,
+        "Your delivery sounded mostly neutral. Vary your tone and energy to highlight what matters most.",
+        lambda f: 0.5
+    ),
+    Rule(
+        "tense_delivery", "emotion",
+        lambda f: f["dominant_emotion"] in ("ang", "angry"),
+        "Your voice often sounded tense. Slow your breathing before you start and soften the ends of sentences.",
+        lambda f: 1.0
+    ),
+    Rule(
+        "low_energy", "emotion",
+        lambda f: f["dominant_emotion"] in ("sad",),
+        "Your voice often sounded low in energy. Stand up while presenting and lift your pitch on key points.",
+        lambda f: 1.0
+    ),
+    Rule(
+        "engaging_delivery", "emotion",
+        lambda f: f["dominant_emotion"] in ("hap", "happy"),
+        "Your delivery sounded upbeat and engaging."
+    ),
+]
+
+
+def collect_facts(voice_activity: Dict, pacing: Dict, filler_words: Dict, emotions: Dict) -> Dict:
+    """
+    Flatten the analyzer results into the values the rules test and quote.
+
+    Args:
+        voice_activity (Dict): Voice activity detection results
+        pacing (Dict): Pacing analysis results
+        filler_words (Dict): Filler word analysis results
+        emotions (Dict): Emotion analysis results
+
+    Returns:
+        Dict: Facts keyed by name
+    """
+    most_common = filler_words.get("most_common_fillers") or [("", 0)]
+    duration = pacing.get("total_duration", 0)
+    long_pause_count = pacing.get("long_pause_count", 0)
+    return {
+        "speech_rate": pacing.get("speech_rate", 0),
+        "rate_variability": pacing.get("rate_variability", 0),
+        "pause_percentage": pacing.get("pause_percentage", 0),
+        "long_pause_count": long_pause_count,
+        "long_pauses_per_minute": long_pause_count / (duration / 60) if duration > 0 else 0,
+        "long_pause_seconds": LONG_PAUSE_DURATION,
+        "total_words": filler_words.get("total_words", pacing.get("total_words", 0)),
+        "filler_percentage": filler_words.get("filler_percentage", 0),
+        "top_filler": most_common[0][0],
+        "top_filler_count": most_common[0][1],
+        "voice_percentage": voice_activity.get("voice_percentage", 0),
+        "total_frames": voice_activity.get("total_frames", 0),
+        "dominant_emotion": emotions.get("dominant_emotion", "neutral"),
+        "emotion_confidence": emotions.get("confidence", 0),
+        "rate_min": TARGET_SPEECH_RATE[0],
+        "rate_max": TARGET_SPEECH_RATE[1],
+    }
+
+
+def evaluate_rules(
+    voice_activity: Dict,
+    pacing: Dict,
+    filler_words: Dict,
+    emotions: Dict,
+    rules: List[Rule] = RULES
+) -> List[Dict]:
+    """
+    Apply the feedback rules to the analyzer results.
+
+    Args:
+        voice_activity (Dict): Voice activity detection results
+        pacing (Dict): Pacing analysis results
+        filler_words (Dict): Filler word analysis results
+        emotions (Dict): Emotion analysis results
+        rules (List[Rule]): Rules to apply (default: RULES)
+
+    Returns:
+        List[Dict]: Matching rules (rule, area, severity, message); suggestions
+            by descending severity, then strengths
+    """
+    facts = collect_facts(voice_activity, pacing, filler_words, emotions)
+    matches = []
+    for rule in rules:
+        if rule.when(facts):
+            matches.append({
+                "rule": rule.name,
+                "area": rule.area,
+                "severity": float(rule.severity(facts)),
+                "message": rule.message.format(**facts)
+            })
+    return sorted(matches, key=lambda match: -match["severity"])
+
+
+@timed("quick_feedback")
+def generate_rule_feedback(voice_activity: Dict, pacing: Dict, filler_words: Dict, emotions: Dict) -> str:
+    """
+    Deterministic feedback from thresholds on the analyzer results.
+
+    Needs no model or network call, so it can be shown as soon as the
+    analyzers finish and still works when the LLM API is unavailable.
+
+    Args:
+        voice_activity (Dict): Voice activity detection results
+        pacing (Dict): Pacing analysis results
+        filler_words (Dict): Filler word analysis results
+        emotions (Dict): Emotion analysis results
+
+    Returns:
+        str: Markdown feedback with ranked suggestions and strengths
+    """
+    matches = evaluate_rules(voice_activity, pacing, filler_words, emotions)
+    suggestions = [match for match in matches if match["severity"] > 0]
+    strengths = [match for match in matches if match["severity"] <= 0]
+
+    lines = []
+    if suggestions:
+        lines.append("**What to work on**")
+        lines.extend(
+            f"{rank}. *{AREAS[match['area']]}:* {match['message']}"
+            for rank, match in enumerate(suggestions, start=1)
+        )
+    if strengths:
+        if lines:
+            lines.append("")
+        lines.append("**What went well**")
+        lines.extend(f"- *{AREAS[match['area']]}:* {match['message']}" for match in strengths)
+    return "\n".join(lines) or "No speech was detected, so there is no feedback to give."
@@ -0,0 +1,257 @@
+import os
+import pickle
+import shutil
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.config import JOB_DB_PATH, JOB_MAX_QUEUE_DEPTH, JOB_STALE_SECONDS, TEMP_DIR
+from utils.records import dumps, is_serialized, loads
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    filename TEXT NOT NULL,
+    workspace TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    worker TEXT,
+    result BLOB,
+    error TEXT,
+    student TEXT,
+    assignment TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_by_claim_order ON jobs (status, priority DESC, created_at);
+"""
+
+
+class QueueFullError(Exception):
+    """Raised when a submission would exceed the configured queue depth."""
+
+
+def _load_result(blob: Optional[bytes]) -> Any:
+    if blob is None:
+        return None
+    # Jobs finished before results were stored as .npz hold pickles
+    return loads(blob) if is_serialized(blob) else pickle.loads(blob)
+
+
+class JobQueue:
+    """
+    Durable job queue for analysis submissions, backed by SQLite.
+
+    Every job gets its own workspace directory under config.TEMP_DIR, so
+    concurrent uploads never share files. Workers claim jobs atomically in
+    priority order; the UI polls get() for status and results.
+    """
+
+    def __init__(self, db_path: str = JOB_DB_PATH, workspace_root: str = os.path.join(TEMP_DIR, "jobs"),
+                 max_depth: int = JOB_MAX_QUEUE_DEPTH):
+        self.db_path = db_path
+        self.workspace_root = workspace_root
+        self.max_depth = max_depth
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        os.makedirs(workspace_root, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            # Queues created before jobs were labelled lack these columns
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column in ("student", "assignment"):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} TEXT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, audio_bytes: bytes, filename: str, priority: int = 0,
+               student: Optional[str] = None, assignment: Optional[str] = None) -> str:
+        """
+        Queue an uploaded recording for analysis.
+
+        Args:
+            audio_bytes (bytes): Raw uploaded file
+            filename (str): Original file name (its extension is kept)
+            priority (int): Higher values are processed first
+            student (Optional[str]): Student the recording is saved under
+            assignment (Optional[str]): Assignment the recording is saved under
+
+        Returns:
+            str: Job ID
+
+        Raises:
+            QueueFullError: If the queue already holds config.JOB_MAX_QUEUE_DEPTH jobs
+        """
+        job_id = uuid.uuid4().hex
+        workspace = os.path.join(self.workspace_root, job_id)
+        os.makedirs(workspace)
+        extension = os.path.splitext(filename)[1].lower() or ".wav"
+        with open(os.path.join(workspace, "input" + extension), "wb") as f:
+            f.write(audio_bytes)
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            depth = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (QUEUED,)).fetchone()[0]
+            if depth >= self.max_depth:
+                conn.execute("ROLLBACK")
+                shutil.rmtree(workspace, ignore_errors=True)
+                raise QueueFullError(f"Analysis queue is full ({depth} jobs waiting)")
+            conn.execute(
+                "INSERT INTO jobs (id, status, priority, filename, workspace, created_at, student, assignment) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, priority, filename, workspace, time.time(), student, assignment)
+            )
+            conn.execute("COMMIT")
+        return job_id
+
+    def claim(self, worker: str, limit: int = 1) -> List[Dict]:
+        """
+        Atomically move the highest-priority queued jobs to running.
+
+        Args:
+            worker (str): Worker identifier recorded on the jobs
+            limit (int): Maximum number of jobs to claim
+
+        Returns:
+            List[Dict]: Claimed jobs (id, filename, workspace, input_path,
+                created_at, student, assignment)
+        """
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            rows = conn.execute(
+                "SELECT id, filename, workspace, created_at, student, assignment FROM jobs WHERE status = ? "
+                "ORDER BY priority DESC, created_at LIMIT ?",
+                (QUEUED, limit)
+            ).fetchall()
+            now = time.time()
+            conn.executemany(
+                "UPDATE jobs SET status = ?, started_at = ?, worker = ? WHERE id = ?",
+                [(RUNNING, now, worker, row["id"]) for row in rows]
+            )
+            conn.execute("COMMIT")
+
+        jobs = []
+        for row in rows:
+            extension = os.path.splitext(row["filename"])[1].lower() or ".wav"
+            jobs.append({
+                "id": row["id"],
+                "filename": row["filename"],
+                "workspace": row["workspace"],
+                "input_path": os.path.join(row["workspace"], "input" + extension),
+                "created_at": row["created_at"],
+                "student": row["student"],
+                "assignment": row["assignment"]
+            })
+        return jobs
+
+    def complete(self, job_id: str, result: Any) -> None:
+        """
+        Store a job's results and remove its workspace.
+
+        Args:
+            job_id (str): Job ID
+            result (Any): Analysis results, serializable by utils.records.dumps
+        """
+        self._finish(job_id, DONE, result=dumps(result))
+
+    def fail(self, job_id: str, error: str) -> None:
+        """
+        Mark a job as failed and remove its workspace.
+
+        Args:
+            job_id (str): Job ID
+            error (str): Error message shown to the user
+        """
+        self._finish(job_id, FAILED, error=error)
+
+    def _finish(self, job_id: str, status: str, result: Optional[bytes] = None, error: Optional[str] = None) -> None:
+        with self._connect() as conn:
+            row = conn.execute("SELECT workspace FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ?, result = ?, error = ? WHERE id = ?",
+                (status, time.time(), result, error, job_id)
+            )
+        if row is not None:
+            shutil.rmtree(row["workspace"], ignore_errors=True)
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """
+        Poll a job's status.
+
+        Args:
+            job_id (str): Job ID
+
+        Returns:
+            Optional[Dict]: Status, queue position (while queued), timings,
+                and results or error once finished; None for unknown jobs
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+            position = None
+            if row["status"] == QUEUED:
+                position = conn.execute(
+                    "SELECT COUNT(*) FROM jobs WHERE status = ? AND "
+                    "(priority > ? OR (priority = ? AND created_at < ?))",
+                    (QUEUED, row["priority"], row["priority"], row["created_at"])
+                ).fetchone()[0]
+        return {
+            "id": row["id"],
+            "status": row["status"],
+            "filename": row["filename"],
+            "student": row["student"],
+            "assignment": row["assignment"],
+            "queue_position": position,
+            "created_at": row["created_at"],
+            "started_at": row["started_at"],
+            "finished_at": row["finished_at"],
+            "result": _load_result(row["result"]),
+            "error": row["error"]
+        }
+
+    def depth(self) -> Dict[str, int]:
+        """
+        Number of jobs in each status.
+
+        Returns:
+            Dict[str, int]: Counts keyed by status
+        """
+        with self._connect() as conn:
+            rows = conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+        counts.update({status: count for status, count in rows})
+        return counts
+
+    def requeue_stale(self, max_age: float = JOB_STALE_SECONDS) -> int:
+        """
+        Return jobs whose worker died mid-analysis to the queue.
+
+        Args:
+            max_age (float): Seconds a job may stay running
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, worker = NULL WHERE status = ? AND started_at < ?",
+                (QUEUED, RUNNING, time.time() - max_age)
+            )
+            return cursor.rowcount
@@ -0,0 +1,246 @@
+import argparse
+import gc
+import multiprocessing
+import os
+import pickle
+import time
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+
+from config.config import (
+    JOB_BATCH_SIZE,
+    JOB_DB_PATH,
+    METRICS_PORT,
+    WARMUP_MODELS,
+    WORKER_LATENCY_PROCESSES,
+    WORKER_MODE,
+    WORKER_PROCESSES,
+    WORKER_THREADS,
+    WORKER_THROUGHPUT_THREADS,
+)
+from audio_processing.pipeline import DEFAULT_STAGES, Stage
+from jobs.job_queue import JobQueue
+from jobs.worker import JobWorker
+from utils.instrumentation import start_metrics_server
+from utils.model_registry import warmup
+from utils.result_cache import get_result_cache
+from utils.results_store import get_results_store
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process may run on (respects container/cgroup affinity where supported)."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def plan_workers(
+    mode: str = WORKER_MODE,
+    cpu_count: Optional[int] = None,
+    processes: int = WORKER_PROCESSES,
+    threads: int = WORKER_THREADS
+) -> Tuple[int, int]:
+    """
+    Split the available cores between worker processes and torch threads.
+
+    "throughput" runs many processes with a few threads each, so many jobs
+    progress at once without oversubscribing cores. "latency" gives a few
+    processes most of the cores, so a single job finishes as fast as torch's
+    intra-op parallelism allows. Explicit process/thread counts win.
+
+    Args:
+        mode (str): "throughput" or "latency"
+        cpu_count (Optional[int]): Cores to plan for (default: available CPUs)
+        processes (int): Worker processes, or 0 to derive from mode
+        threads (int): Torch threads per process, or 0 to derive from mode
+
+    Returns:
+        Tuple[int, int]: Number of processes and torch threads per process
+    """
+    cpus = cpu_count or len(available_cpus())
+    if mode == "throughput":
+        threads = threads or min(WORKER_THROUGHPUT_THREADS, cpus)
+        processes = processes or max(1, cpus // threads)
+    elif mode == "latency":
+        processes = processes or WORKER_LATENCY_PROCESSES
+        threads = threads or max(1, cpus // processes)
+    else:
+        raise ValueError(f"Unknown worker mode: {mode}")
+    return processes, threads
+
+
+def configure_torch_threads(threads: int, cpus: Optional[Sequence[int]] = None) -> None:
+    """
+    Pin this process's torch intra-op threads and, optionally, its cores.
+
+    Args:
+        threads (int): Torch intra-op threads
+        cpus (Optional[Sequence[int]]): Cores to restrict the process to
+    """
+    import torch
+
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+    torch.set_num_threads(threads)
+
+
+def _stage_refs(stages: Sequence[Stage]) -> List[Union[str, Stage]]:
+    # Spawned workers receive their stages pickled. The default stages hold
+    # lambdas, which don't pickle, so they are sent by name and looked up
+    # again in the worker; any other stage must pickle as it is
+    refs = []
+    for stage in stages:
+        if any(stage is default for default in DEFAULT_STAGES):
+            refs.append(stage.name)
+            continue
+        try:
+            pickle.dumps(stage)
+        except Exception as e:
+            raise ValueError(f"Stage {stage.name!r} can't be sent to spawned workers: {e}") from e
+        refs.append(stage)
+    return refs
+
+
+def _resolve_stages(refs: Sequence[Union[str, Stage]]) -> List[Stage]:
+    defaults = {stage.name: stage for stage in DEFAULT_STAGES}
+    return [defaults[ref] if isinstance(ref, str) else ref for ref in refs]
+
+
+def _worker_main(index: int, threads: int, cpus: Optional[List[int]], db_path: str, batch_size: int,
+                 stages: Sequence[Union[str, Stage]], use_cache: bool, use_store: bool, preload: Sequence[str]) -> None:
+    configure_torch_threads(threads, cpus)
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT + index)
+    # Under fork the models were loaded by the parent and are already in the
+    # registry; under spawn each process loads its own copy here
+    warmup(preload)
+    worker = JobWorker(
+        JobQueue(db_path),
+        worker_id=f"pool-{index}-{os.getpid()}",
+        batch_size=batch_size,
+        stages=_resolve_stages(stages),
+        cache=get_result_cache() if use_cache else None,
+        store=get_results_store() if use_store else None
+    )
+    try:
+        worker.run()
+    except KeyboardInterrupt:
+        pass
+
+
+class WorkerPool:
+    """
+    Pool of analysis processes draining the job queue.
+
+    Models are loaded once in the parent before the workers are forked, so
+    every worker reads the same weight pages copy-on-write instead of holding
+    its own copy. Each worker pins its torch thread count (and, when the cores
+    divide evenly, its own set of cores) so concurrent jobs don't oversubscribe
+    the machine. Where fork is unavailable the workers are spawned and each
+    loads its own models.
+
+    Workers are not daemonic, so stages run in a process pool
+    (PIPELINE_PROCESS_STAGES) can start their own children; stop() shuts
+    them down.
+    """
+
+    def __init__(self, mode: str = WORKER_MODE, processes: int = WORKER_PROCESSES, threads: int = WORKER_THREADS,
+                 db_path: str = JOB_DB_PATH, batch_size: int = JOB_BATCH_SIZE,
+                 stages: Sequence[Stage] = DEFAULT_STAGES, use_cache: bool = True, use_store: bool = True,
+                 preload: Iterable[str] = WARMUP_MODELS, pin_cores: bool = True,
+                 start_method: Optional[str] = None):
+        self.cpus = available_cpus()
+        self.processes, self.threads = plan_workers(mode, len(self.cpus), processes, threads)
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.stages = list(stages)
+        self.use_cache = use_cache
+        self.use_store = use_store
+        self.preload = list(preload)
+        self.pin_cores = pin_cores and self.processes * self.threads <= len(self.cpus)
+        method = start_method or ("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+        self._context = multiprocessing.get_context(method)
+        self._stage_args = self.stages if method == "fork" else _stage_refs(self.stages)
+        self._workers: List[Optional[multiprocessing.Process]] = [None] * self.processes
+
+    def start(self) -> None:
+        """Load the shared models and start every worker process."""
+        JobQueue(self.db_path).requeue_stale()
+        if self._context.get_start_method() == "fork":
+            warmup(self.preload)
+            # Keep the garbage collector from writing to (and so copying) the
+            # pages of objects that existed before the fork
+            gc.freeze()
+        for index in range(self.processes):
+            self._spawn(index)
+
+    def _spawn(self, index: int) -> None:
+        cpus = None
+        if self.pin_cores:
+            cpus = self.cpus[index * self.threads:(index + 1) * self.threads]
+        process = self._context.Process(
+            target=_worker_main,
+            args=(index, self.threads, cpus, self.db_path, self.batch_size,
+                  self._stage_args, self.use_cache, self.use_store, self.preload),
+            name=f"analysis-worker-{index}"
+        )
+        process.start()
+        self._workers[index] = process
+
+    def alive(self) -> int:
+        """Number of worker processes currently running."""
+        return sum(1 for process in self._workers if process is not None and process.is_alive())
+
+    def supervise(self, poll_interval: float = 5.0, duration: Optional[float] = None) -> None:
+        """
+        Restart workers that exit, until interrupted or `duration` elapses.
+
+        Jobs held by a crashed worker return to the queue once they go stale.
+
+        Args:
+            poll_interval (float): Seconds between liveness checks
+            duration (Optional[float]): Stop supervising after this many seconds
+        """
+        deadline = None if duration is None else time.monotonic() + duration
+        while deadline is None or time.monotonic() < deadline:
+            for index, process in enumerate(self._workers):
+                if process is not None and not process.is_alive():
+                    print(f"Analysis worker {index} exited with code {process.exitcode}; restarting")
+                    self._spawn(index)
+            time.sleep(poll_interval)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Terminate every worker process."""
+        for process in self._workers:
+            if process is not None and process.is_alive():
+                process.terminate()
+        for process in self._workers:
+            if process is not None:
+                process.join(timeout)
+        self._workers = [None] * self.processes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a pool of analysis worker processes")
+    parser.add_argument("--mode", choices=["throughput", "latency"], default=WORKER_MODE)
+    parser.add_argument("--processes", type=int, default=WORKER_PROCESSES)
+    parser.add_argument("--threads", type=int, default=WORKER_THREADS)
+    parser.add_argument("--batch-size", type=int, default=JOB_BATCH_SIZE)
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or populate the result cache")
+    parser.add_argument("--no-store", action="store_true", help="Do not save results to the results store")
+    args = parser.parse_args()
+
+    pool = WorkerPool(args.mode, args.processes, args.threads, batch_size=args.batch_size,
+                      use_cache=not args.no_cache, use_store=not args.no_store)
+    print(f"Starting {pool.processes} worker(s) with {pool.threads} torch thread(s) each ({args.mode} mode)")
+    pool.start()
+    try:
+        pool.supervise()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
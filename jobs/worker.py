@@ -0,0 +1,174 @@
+import argparse
+import os
+import time
+import traceback
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from config.config import JOB_BATCH_SIZE, JOB_POLL_INTERVAL, METRICS_PORT, PIPELINE_MAX_WORKERS
+from audio_processing.vad import detect_voice_activity
+from audio_processing.emotion import analyze_emotion_batch
+from audio_processing.prescreen import AdmissionError, admit
+from audio_processing.pipeline import DEFAULT_STAGES, Stage, run_analysis, stage_keys
+from jobs.job_queue import QUEUED, JobQueue
+from utils.audio_buffer import AudioBuffer
+from utils.inference import set_queue_load
+from utils.instrumentation import record_error, set_queue_depth, start_metrics_server, timed
+from utils.model_registry import warmup
+from utils.result_cache import ResultCache, get_result_cache
+from utils.results_store import ResultsStore, get_results_store
+
+
+class JobWorker:
+    """
+    Worker that drains the job queue in batches.
+
+    Each batch is pre-screened and decoded up front (rejected uploads fail
+    without reaching a model) and its emotion windows from every job
+    share the same forward passes (only for jobs whose emotions aren't
+    already in the result cache). Whisper keeps its state on the model
+    while decoding, so transcription runs job after job on one warm model
+    rather than across jobs at once. Run more workers to scale throughput.
+    """
+
+    def __init__(self, queue: JobQueue, worker_id: Optional[str] = None, batch_size: int = JOB_BATCH_SIZE,
+                 stages: Sequence[Stage] = DEFAULT_STAGES, cache: Optional[ResultCache] = None,
+                 max_workers: int = PIPELINE_MAX_WORKERS, store: Optional[ResultsStore] = None):
+        self.queue = queue
+        self.worker_id = worker_id or f"worker-{os.getpid()}"
+        self.batch_size = batch_size
+        self.stages = list(stages)
+        self.cache = cache
+        self.max_workers = max_workers
+        self.store = store
+
+    def run_once(self) -> int:
+        """
+        Claim and process one batch of jobs.
+
+        Returns:
+            int: Number of jobs claimed
+        """
+        jobs = self.queue.claim(self.worker_id, self.batch_size)
+        depth = self.queue.depth()
+        set_queue_depth(depth)
+        set_queue_load(depth[QUEUED])
+        if jobs:
+            self.process_batch(jobs)
+        return len(jobs)
+
+    def run(self, poll_interval: float = JOB_POLL_INTERVAL, max_batches: Optional[int] = None) -> None:
+        """
+        Process jobs until interrupted, sleeping while the queue is empty.
+
+        Args:
+            poll_interval (float): Seconds to wait when no job is queued
+            max_batches (Optional[int]): Stop after this many batches
+        """
+        batches = 0
+        self.queue.requeue_stale()
+        while max_batches is None or batches < max_batches:
+            if self.run_once():
+                batches += 1
+            else:
+                time.sleep(poll_interval)
+
+    @timed("job_batch")
+    def process_batch(self, jobs: List[Dict]) -> None:
+        """
+        Analyze claimed jobs and record each result or failure.
+
+        Args:
+            jobs (List[Dict]): Jobs returned by JobQueue.claim()
+        """
+        buffers: Dict[str, AudioBuffer] = {}
+        screens: Dict[str, Dict] = {}
+        for job in jobs:
+            try:
+                buffers[job["id"]], screens[job["id"]] = admit(job["input_path"])
+            except AdmissionError as e:
+                self.queue.fail(job["id"], str(e))
+            except Exception as e:
+                record_error("decode", e)
+                self.queue.fail(job["id"], f"Could not decode audio: {str(e)}")
+
+        seeded = self._batch_emotions(buffers)
+
+        for job_id, buffer in buffers.items():
+            try:
+                result = run_analysis(buffer, self.stages, self.max_workers, self.cache, seeded[job_id])
+                result["prescreen"] = screens[job_id]
+            except Exception as e:
+                traceback.print_exc()
+                record_error("job", e)
+                self.queue.fail(job_id, str(e))
+            else:
+                self.queue.complete(job_id, result)
+                if self.store is not None:
+                    job = next(job for job in jobs if job["id"] == job_id)
+                    self.store.save(result, job["student"], job["assignment"], recorded_at=job["created_at"],
+                                    source=job_id, filename=job["filename"], stages=self.stages)
+
+    def _batch_emotions(self, buffers: Dict[str, AudioBuffer]) -> Dict[str, Dict[str, Any]]:
+        # Emotion windows of every job that misses the cache go through the
+        # same forward passes; the results are seeded into each job's run
+        seeded: Dict[str, Dict[str, Any]] = {job_id: {} for job_id in buffers}
+        by_name = {stage.name: stage for stage in self.stages}
+        if "emotions" not in by_name or "voice_activity" not in by_name:
+            return seeded
+
+        keys = {job_id: stage_keys(buffer.digest(), self.stages) for job_id, buffer in buffers.items()}
+        misses = []
+        for job_id in buffers:
+            found, _ = self._lookup("emotions", keys[job_id])
+            if found:
+                # run_analysis reads it from the cache like any other stage
+                continue
+            found, voice_activity = self._lookup("voice_activity", keys[job_id])
+            if not found:
+                voice_activity = detect_voice_activity(buffers[job_id])
+                self._store(by_name["voice_activity"], keys[job_id], voice_activity)
+                seeded[job_id]["voice_activity"] = voice_activity
+            misses.append((job_id, voice_activity))
+        if not misses:
+            return seeded
+
+        emotions = analyze_emotion_batch([buffers[job_id] for job_id, _ in misses],
+                                         [voice_activity for _, voice_activity in misses])
+        for (job_id, _), result in zip(misses, emotions):
+            self._store(by_name["emotions"], keys[job_id], result)
+            seeded[job_id]["emotions"] = result
+        return seeded
+
+    def _lookup(self, name: str, keys: Dict[str, str]) -> Tuple[bool, Any]:
+        if self.cache is None:
+            return False, None
+        return self.cache.lookup(name, keys[name])
+
+    def _store(self, stage: Stage, keys: Dict[str, str], result: Any) -> None:
+        if self.cache is not None and (stage.cache_if is None or stage.cache_if(result)):
+            self.cache.put(stage.name, keys[stage.name], result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Process queued presentation analysis jobs")
+    parser.add_argument("--batch-size", type=int, default=JOB_BATCH_SIZE)
+    parser.add_argument("--worker-id")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or populate the result cache")
+    parser.add_argument("--no-store", action="store_true", help="Do not save results to the results store")
+    args = parser.parse_args()
+
+    if METRICS_PORT:
+        start_metrics_server(METRICS_PORT)
+    warmup()
+    worker = JobWorker(
+        JobQueue(),
+        worker_id=args.worker_id,
+        batch_size=args.batch_size,
+        cache=None if args.no_cache else get_result_cache(),
+        store=None if args.no_store else get_results_store()
+    )
+    worker.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import soundfile as sf
+from utils.audio_buffer import AudioBuffer, as_audio_buffer
+from audio_processing.vad import detect_voice_activity
+from audio_processing.pacing import analyze_pacing
+
+class TestAudioBuffer(unittest.TestCase):
+    def setUp(self):
+        t = np.arange(16000 * 2) / 16000
+        self.samples = (0.5 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+        self.buffer = AudioBuffer(self.samples)
+
+    def test_views_are_zero_copy_and_read_only(self):
+        view = self.buffer.samples
+        self.assertTrue(np.shares_memory(view, self.buffer.samples))
+        self.assertFalse(view.flags.writeable)
+        sliced = self.buffer.view(0.5, 1.0)
+        self.assertEqual(len(sliced), 8000)
+        self.assertTrue(np.shares_memory(sliced.samples, view))
+
+    def test_pcm16_memoryview(self):
+        pcm = self.buffer.pcm16
+        self.assertIsInstance(pcm, memoryview)
+        self.assertEqual(len(pcm), len(self.samples) * 2)
+        self.assertIs(self.buffer.pcm16_array, self.buffer.pcm16_array)
+
+    def test_from_file_resamples_to_mono(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "stereo.wav")
+            stereo = np.stack([self.samples, self.samples], axis=1)
+            sf.write(path, np.repeat(stereo, 2, axis=0), 32000)
+            buffer = as_audio_buffer(path)
+        self.assertEqual(buffer.sample_rate, 16000)
+        self.assertEqual(buffer.samples.dtype, np.float32)
+        self.assertEqual(buffer.samples.ndim, 1)
+        self.assertAlmostEqual(buffer.duration, 2.0, places=2)
+
+    def test_analyzers_accept_buffer(self):
+        result = detect_voice_activity(self.buffer)
+        self.assertEqual(result['total_frames'], 66)
+        result = analyze_pacing(self.buffer)
+        self.assertAlmostEqual(result['total_duration'], 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,66 +1,83 @@
 import unittest
 import os
+import shutil
+import tempfile
 import numpy as np
+import soundfile as sf
 from audio_processing.transcriber import transcribe_audio
 from audio_processing.vad import detect_voice_activity
 from audio_processing.pacing import analyze_pacing
 from audio_processing.filler_words import detect_filler_words
 from audio_processing.emotion import analyze_emotion
+from benchmarks.stubs import model_stubs
+from benchmarks.synthetic import synthetic_speech
 from utils.helpers import convert_audio_format, get_audio_duration, normalize_audio
+from utils.records import EmotionResult, FillerWordsResult, PacingResult, VoiceActivityResult
 
 class TestAudioProcessing(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        # Deterministic synthetic speech instead of a sample file that may be missing
+        cls.tmp = tempfile.mkdtemp()
+        cls.test_audio_path = os.path.join(cls.tmp, "test.wav")
+        sf.write(cls.test_audio_path, synthetic_speech(12), 16000)
+
+    @classmethod
+    def tearDownClass(cls):
+        shutil.rmtree(cls.tmp, ignore_errors=True)
+
     def setUp(self):
-        # Create a test audio file path
-        self.test_audio_path = "assets/sample_audio/test.wav"
+        # Offline model stubs keep these tests fast and independent of downloads
+        stubs = model_stubs()
+        stubs.__enter__()
+        self.addCleanup(stubs.__exit__, None, None, None)
         
     def test_transcribe_audio(self):
-        if os.path.exists(self.test_audio_path):
-            result = transcribe_audio(self.test_audio_path)
-            self.assertIsInstance(result, str)
+        result = transcribe_audio(self.test_audio_path)
+        self.assertIsInstance(result, str)
+        self.assertTrue(result)
             
     def test_detect_voice_activity(self):
-        if os.path.exists(self.test_audio_path):
-            result = detect_voice_activity(self.test_audio_path)
-            self.assertIsInstance(result, dict)
-            self.assertIn('voice_percentage', result)
+        result = detect_voice_activity(self.test_audio_path)
+        self.assertIsInstance(result, VoiceActivityResult)
+        self.assertIn('voice_percentage', result)
+        self.assertGreater(result['voice_percentage'], 30)
             
     def test_analyze_pacing(self):
-        if os.path.exists(self.test_audio_path):
-            result = analyze_pacing(self.test_audio_path)
-            self.assertIsInstance(result, dict)
-            self.assertIn('speech_rate', result)
+        result = analyze_pacing(self.test_audio_path)
+        self.assertIsInstance(result, PacingResult)
+        self.assertIn('speech_rate', result)
+        self.assertAlmostEqual(result['total_duration'], 12.0, places=2)
             
     def test_detect_filler_words(self):
         test_text = "Um, like, you know, this is a test."
         result = detect_filler_words(test_text)
-        self.assertIsInstance(result, dict)
+        self.assertIsInstance(result, FillerWordsResult)
         self.assertIn('total_filler_words', result)
         
     def test_analyze_emotion(self):
-        if os.path.exists(self.test_audio_path):
-            result = analyze_emotion(self.test_audio_path)
-            self.assertIsInstance(result, dict)
-            self.assertIn('dominant_emotion', result)
+        result = analyze_emotion(self.test_audio_path)
+        self.assertIsInstance(result, EmotionResult)
+        self.assertIn('dominant_emotion', result)
+        self.assertTrue(result['timeline'])
             
     def test_convert_audio_format(self):
-        if os.path.exists(self.test_audio_path):
-            output_path = "temp/test_converted.wav"
-            result = convert_audio_format(self.test_audio_path, output_path)
-            self.assertTrue(result)
-            self.assertTrue(os.path.exists(output_path))
+        output_path = os.path.join(self.tmp, "test_converted.wav")
+        result = convert_audio_format(self.test_audio_path, output_path)
+        self.assertTrue(result)
+        self.assertTrue(os.path.exists(output_path))
             
     def test_get_audio_duration(self):
-        if os.path.exists(self.test_audio_path):
-            duration = get_audio_duration(self.test_audio_path)
-            self.assertIsInstance(duration, float)
-            self.assertGreater(duration, 0)
+        duration = get_audio_duration(self.test_audio_path)
+        self.assertIsInstance(duration, float)
+        self.assertGreater(duration, 0)
             
     def test_normalize_audio(self):
-        if os.path.exists(self.test_audio_path):
-            data, sr = normalize_audio(self.test_audio_path)
-            self.assertIsInstance(data, np.ndarray)
-            self.assertIsInstance(sr, int)
-            self.assertGreater(sr, 0)
+        data, sr = normalize_audio(self.test_audio_path)
+        self.assertIsInstance(data, np.ndarray)
+        self.assertIsInstance(sr, int)
+        self.assertGreater(sr, 0)
+        self.assertAlmostEqual(float(np.max(np.abs(data))), 1.0)
 
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+import tempfile
+from benchmarks.run import benchmark_duration, compare
+from benchmarks.stubs import model_stubs
+
+class TestBenchmarks(unittest.TestCase):
+    def test_short_run_and_comparison(self):
+        with model_stubs(), tempfile.TemporaryDirectory() as workdir:
+            results = benchmark_duration(3, workdir, repeats=1, trace=False)
+        functions = [entry["function"] for entry in results]
+        self.assertIn("end_to_end", functions)
+        self.assertIn("normalize_audio", functions)
+        for entry in results:
+            self.assertGreater(entry["wall_seconds"], 0)
+            self.assertAlmostEqual(entry["rtf"], entry["wall_seconds"] / 3)
+            self.assertIsNone(entry["alloc_peak_mb"])
+
+        slower = [dict(entry, wall_seconds=entry["wall_seconds"] / 2) for entry in results]
+        regressions = compare(results, {"commit": "abc", "results": slower}, tolerance=0.25)
+        self.assertEqual(len(regressions), len(results))
+        self.assertEqual(compare(results, {"results": results}, tolerance=0.25), [])
+
+if __name__ == '__main__':
+    unittest.main()
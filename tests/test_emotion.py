@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+import numpy as np
+import torch
+from audio_processing.emotion import analyze_emotion, analyze_emotion_batch, speech_windows
+from utils.audio_buffer import AudioBuffer
+
+class FakeLabelEncoder:
+    ind2lab = {0: "neu", 1: "hap"}
+
+class FakeHparams:
+    label_encoder = FakeLabelEncoder()
+
+class FakeClassifier:
+    """Loud windows are "hap", quiet ones "neu"."""
+    hparams = FakeHparams()
+
+    def __init__(self):
+        self.batch_shapes = []
+
+    def classify_batch(self, wavs, wav_lens=None):
+        self.batch_shapes.append(tuple(wavs.shape))
+        self.assert_padding(wavs, wav_lens)
+        loud = (wavs.abs().amax(dim=1) > 0.5).float()
+        logits = torch.stack([1 - loud, loud], dim=1) * 4
+        out_prob = torch.log_softmax(logits, dim=-1)
+        score, index = out_prob.max(dim=-1)
+        return out_prob, score, index, None
+
+    @staticmethod
+    def assert_padding(wavs, wav_lens):
+        assert float(wav_lens.max()) == 1.0
+        for row, length in zip(wavs, wav_lens):
+            assert not row[int(round(float(length) * wavs.shape[1])):].any()
+
+class TestEmotion(unittest.TestCase):
+    def setUp(self):
+        sr = 16000
+        samples = np.zeros(sr * 20, dtype=np.float32)
+        samples[1 * sr:4 * sr] = 0.2   # quiet speech
+        samples[6 * sr:18 * sr] = 0.9  # loud speech, longer than one window
+        self.buffer = AudioBuffer(samples)
+        self.voice_activity = {"speech_segments": [(1.0, 4.0), (6.0, 18.0), (19.0, 19.5)]}
+
+    def test_speech_windows_split_and_filter(self):
+        windows = speech_windows(20.0, self.voice_activity["speech_segments"], max_seconds=8, min_seconds=1)
+        self.assertEqual(windows, [(1.0, 4.0), (6.0, 12.0), (12.0, 18.0)])
+        self.assertEqual(speech_windows(20.0, None, max_seconds=8), [(0.0, 20 / 3), (20 / 3, 40 / 3), (40 / 3, 20.0)])
+
+    def test_batched_timeline_and_aggregate(self):
+        classifier = FakeClassifier()
+        with mock.patch("audio_processing.emotion.get_model", return_value=classifier):
+            result = analyze_emotion(self.buffer, self.voice_activity, batch_size=2)
+        self.assertEqual([w["label"] for w in result["timeline"]], ["neu", "hap", "hap"])
+        self.assertEqual(result["dominant_emotion"], "hap")
+        self.assertAlmostEqual(sum(result["emotion_distribution"].values()), 100)
+        self.assertEqual(len(classifier.batch_shapes), 2)
+        self.assertTrue(all(shape[1] <= 6 * 16000 for shape in classifier.batch_shapes))
+
+    def test_batch_shares_forward_passes_across_recordings(self):
+        classifier = FakeClassifier()
+        quiet = AudioBuffer(np.full(16000 * 3, 0.2, dtype=np.float32))
+        with mock.patch("audio_processing.emotion.get_model", return_value=classifier):
+            results = analyze_emotion_batch([self.buffer, quiet], [self.voice_activity, None], batch_size=8)
+        self.assertEqual(len(classifier.batch_shapes), 1)
+        self.assertEqual(results[0]["dominant_emotion"], "hap")
+        self.assertEqual(results[1]["dominant_emotion"], "neu")
+        self.assertEqual([w["end"] for w in results[1]["timeline"]], [3.0])
+
+if __name__ == '__main__':
+    unittest.main()
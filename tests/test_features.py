@@ -0,0 +1,59 @@
+import unittest
+import threading
+import numpy as np
+import torch
+import whisper
+from audio_processing.features import FrameFeatures, get_features
+from utils.audio_buffer import AudioBuffer
+
+SAMPLE_RATE = 16000
+
+class TestFeatures(unittest.TestCase):
+    def setUp(self):
+        t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+        tone = 0.3 * np.sin(2 * np.pi * 150 * t) + 0.1 * np.sin(2 * np.pi * 300 * t)
+        samples = np.concatenate([tone, np.zeros(SAMPLE_RATE)])
+        self.buffer = AudioBuffer(samples)
+
+    def test_shared_grid_and_dtype(self):
+        features = get_features(self.buffer)
+        self.assertIs(get_features(self.buffer), features)
+        features["rms"]
+        self.assertFalse(features.is_computed("f0"))
+        self.assertEqual(set(features), {"stft_magnitude", "power", "log_mel", "rms", "rms_db", "zcr", "f0", "voiced"})
+        for name in ("stft_magnitude", "log_mel", "rms", "zcr", "f0"):
+            value = features[name]
+            self.assertEqual(value.dtype, np.float32, name)
+            self.assertEqual(value.shape[-1], features.n_frames, name)
+            self.assertFalse(value.flags.writeable, name)
+        self.assertEqual(features["log_mel"].shape[0], 80)
+
+    def test_log_mel_matches_whisper(self):
+        features = FrameFeatures(self.buffer)
+        expected = whisper.log_mel_spectrogram(torch.from_numpy(self.buffer.samples.copy())).numpy()
+        np.testing.assert_allclose(features["log_mel"][:, :-1], expected, atol=1e-3)
+
+    def test_energy_and_pitch(self):
+        features = FrameFeatures(self.buffer)
+        times = features.frame_times()
+        tone, silence = (times > 0.1) & (times < 1.9), times > 2.1
+        self.assertGreater(features["rms_db"][tone].min(), -20)
+        self.assertLess(features["rms_db"][silence].max(), -90)
+        self.assertAlmostEqual(float(np.nanmedian(features["f0"][tone])), 150, delta=3)
+        self.assertTrue(np.isnan(features["f0"][silence]).all())
+
+    def test_computed_once_under_concurrency(self):
+        features = FrameFeatures(self.buffer)
+        calls = []
+        original = features._extractors["stft_magnitude"]
+        features._extractors["stft_magnitude"] = lambda: calls.append(1) or original()
+        threads = [threading.Thread(target=lambda: features["power"]) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(features.is_computed("power"))
+
+if __name__ == '__main__':
+    unittest.main()
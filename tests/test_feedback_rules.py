@@ -0,0 +1,48 @@
+import unittest
+import time
+from feedback.rules import RULES, evaluate_rules, generate_rule_feedback
+
+VOICE = {"voice_percentage": 72.0, "total_frames": 4000}
+PACING = {"speech_rate": 145.0, "rate_variability": 0.1, "pause_percentage": 20.0,
+          "long_pause_count": 0, "total_duration": 120.0, "total_words": 290}
+FILLERS = {"total_words": 290, "filler_percentage": 8.3, "most_common_fillers": [("um", 14), ("like", 10)]}
+EMOTIONS = {"dominant_emotion": "hap", "confidence": 0.7}
+
+class TestFeedbackRules(unittest.TestCase):
+    def test_suggestions_ranked_before_strengths(self):
+        matches = evaluate_rules(VOICE, PACING, FILLERS, EMOTIONS)
+        self.assertEqual(matches[0]["rule"], "many_fillers")
+        self.assertIn('"um" (14 times)', matches[0]["message"])
+        self.assertEqual({m["rule"] for m in matches[1:]}, {"good_rate", "engaging_delivery"})
+
+    def test_severity_orders_several_problems(self):
+        pacing = dict(PACING, speech_rate=210.0, long_pause_count=6)
+        rules = [m["rule"] for m in evaluate_rules(dict(VOICE, voice_percentage=30.0), pacing, FILLERS, EMOTIONS)]
+        self.assertEqual(rules[:4], ["many_fillers", "long_pauses", "too_fast", "little_speech"])
+
+    def test_failed_voice_activity_is_not_little_speech(self):
+        # detect_voice_activity's error fallback: no frames and 0% speech
+        failed = {"voice_percentage": 0, "total_frames": 0}
+        rules = [m["rule"] for m in evaluate_rules(failed, PACING, FILLERS, EMOTIONS)]
+        self.assertNotIn("little_speech", rules)
+
+    def test_markdown_and_empty_results(self):
+        text = generate_rule_feedback(VOICE, PACING, FILLERS, EMOTIONS)
+        self.assertTrue(text.startswith("**What to work on**\n1. *Filler Word Usage:*"))
+        self.assertIn("**What went well**", text)
+        self.assertIn("No speech", generate_rule_feedback({"voice_percentage": 100}, {}, {}, {}))
+
+    def test_every_template_formats(self):
+        facts_pacing = dict(PACING, speech_rate=100.0, rate_variability=0.6, pause_percentage=50.0, long_pause_count=9)
+        for emotion in ("neu", "ang", "sad", "hap"):
+            evaluate_rules(dict(VOICE, voice_percentage=10.0), facts_pacing, FILLERS, {"dominant_emotion": emotion, "confidence": 0.9})
+        self.assertEqual(len({rule.name for rule in RULES}), len(RULES))
+
+    def test_fast_enough_for_instant_feedback(self):
+        start = time.perf_counter()
+        for _ in range(1000):
+            generate_rule_feedback(VOICE, PACING, FILLERS, EMOTIONS)
+        self.assertLess((time.perf_counter() - start) / 1000, 1e-3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from audio_processing.filler_words import FillerMatcher, detect_filler_words
+
+class TestFillerWords(unittest.TestCase):
+    def test_counts_single_words_and_phrases(self):
+        result = detect_filler_words("Um, like, you know, this is kind of a test. So, basically done.")
+        counts = result["filler_counts"]
+        self.assertEqual(counts["um"], 1)
+        self.assertEqual(counts["like"], 1)
+        self.assertEqual(counts["you know"], 1)
+        self.assertEqual(counts["kind of"], 1)
+        self.assertEqual(counts["so"], 1)
+        self.assertEqual(counts["basically"], 1)
+        self.assertEqual(result["total_filler_words"], 6)
+        self.assertEqual(result["total_words"], 13)
+
+    def test_positions(self):
+        text = "Well you know it works"
+        result = detect_filler_words(text)
+        positions = result["positions"]
+        self.assertEqual([p["filler"] for p in positions], ["well", "you know"])
+        self.assertEqual(text[positions[1]["char_start"]:positions[1]["char_end"]], "you know")
+        self.assertEqual(positions[1]["word_index"], 1)
+
+    def test_no_partial_word_matches(self):
+        result = detect_filler_words("Someone knows the unlikely wellness routine")
+        self.assertEqual(result["total_filler_words"], 0)
+
+    def test_word_timestamps(self):
+        transcript = {
+            "text": " I kind of agree",
+            "words": [
+                {"word": " I", "start": 0.0, "end": 0.2},
+                {"word": " kind", "start": 0.3, "end": 0.5},
+                {"word": " of", "start": 0.5, "end": 0.6},
+                {"word": " agree", "start": 0.7, "end": 1.1},
+            ]
+        }
+        positions = detect_filler_words(transcript)["positions"]
+        self.assertEqual(len(positions), 1)
+        self.assertEqual((positions[0]["start"], positions[0]["end"]), (0.3, 0.6))
+
+    def test_incremental_feed_matches_across_segments(self):
+        matcher = FillerMatcher()
+        self.assertEqual(matcher.feed(" Right, I think you"), [{"filler": "right", "char_start": 1, "char_end": 7,
+                                                                 "word_index": 0, "start": None, "end": None}])
+        found = matcher.feed(" know what I mean")
+        self.assertEqual([m["filler"] for m in found], ["you know"])
+        matcher.flush()
+        self.assertEqual(matcher.result(), detect_filler_words(" Right, I think you know what I mean"))
+
+if __name__ == '__main__':
+    unittest.main()
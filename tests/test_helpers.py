@@ -0,0 +1,80 @@
+import unittest
+import os
+import tempfile
+import tracemalloc
+import librosa
+import numpy as np
+import soundfile as sf
+from utils.helpers import (
+    convert_audio_format,
+    get_audio_duration,
+    iter_audio_blocks,
+    load_audio,
+    normalize_audio,
+    normalize_audio_file,
+)
+
+class TestStreamingHelpers(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.mkdtemp()
+        # Two minutes of stereo 22.05 kHz: 21 MB once decoded to float32
+        sr = 22050
+        t = np.arange(120 * sr) / sr
+        cls.stereo = np.stack([0.4 * np.sin(2 * np.pi * 220 * t), 0.2 * np.sin(2 * np.pi * 330 * t)], axis=1)
+        cls.decoded_bytes = cls.stereo.size * 4
+        cls.path = os.path.join(cls.tmp, "stereo.wav")
+        sf.write(cls.path, cls.stereo, sr)
+
+    @classmethod
+    def tearDownClass(cls):
+        for name in os.listdir(cls.tmp):
+            os.remove(os.path.join(cls.tmp, name))
+        os.rmdir(cls.tmp)
+
+    def test_streamed_resampling_matches_whole_file(self):
+        streamed, sr = load_audio(self.path, 16000)
+        expected, _ = librosa.load(self.path, sr=16000, mono=True)
+        self.assertEqual(sr, 16000)
+        self.assertEqual(len(streamed), len(expected))
+        np.testing.assert_allclose(streamed, expected, atol=1e-5)
+
+    def test_blocks_cover_the_file(self):
+        blocks = [block for block, sr in iter_audio_blocks(self.path, block_seconds=7)]
+        self.assertEqual(sum(len(block) for block in blocks), len(self.stereo))
+        self.assertLessEqual(max(len(block) for block in blocks), 7 * 22050)
+
+    def test_duration_from_header(self):
+        self.assertAlmostEqual(get_audio_duration(self.path), 120.0)
+
+    def test_convert_resamples_in_bounded_memory(self):
+        output = os.path.join(self.tmp, "converted.wav")
+        tracemalloc.start()
+        try:
+            self.assertTrue(convert_audio_format(self.path, output, 16000))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        info = sf.info(output)
+        self.assertEqual((info.samplerate, info.channels), (16000, 1))
+        self.assertAlmostEqual(info.duration, 120.0, places=2)
+        self.assertLess(peak, 0.5 * self.decoded_bytes)
+
+    def test_two_pass_normalization(self):
+        data, sr = normalize_audio(self.path)
+        self.assertEqual(sr, 22050)
+        self.assertAlmostEqual(float(np.max(np.abs(data))), 1.0, places=5)
+
+        output = os.path.join(self.tmp, "normalized.wav")
+        self.assertTrue(normalize_audio_file(self.path, output))
+        normalized, _ = sf.read(output, dtype="float32")
+        np.testing.assert_allclose(normalized, data, atol=1e-6)
+
+    def test_silence_is_left_unscaled(self):
+        path = os.path.join(self.tmp, "silence.wav")
+        sf.write(path, np.zeros(1000), 16000)
+        data, _ = normalize_audio(path)
+        self.assertFalse(np.isnan(data).any())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import unittest
+import os
+import subprocess
+import sys
+import tempfile
+from benchmarks.import_time import REPO_ROOT, compare, measure_import
+
+class TestColdStart(unittest.TestCase):
+    def test_analysis_modules_import_without_heavy_dependencies(self):
+        # Models and their frameworks load when a stage first runs, not on import
+        for module in ["audio_processing.pipeline", "feedback.feedback_generator", "jobs.worker"]:
+            entry = measure_import(module, repeats=1)
+            self.assertEqual(entry["heavy_modules"], [], module)
+
+    def test_importing_config_creates_nothing(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+            subprocess.run([sys.executable, "-c", "import config.config"], cwd=cwd, env=env, check=True)
+            self.assertEqual(os.listdir(cwd), [])
+
+    def test_new_heavy_dependency_is_a_regression(self):
+        baseline = {"results": [{"module": "app", "seconds": 1.0, "heavy_modules": []}]}
+        self.assertEqual(compare([{"module": "app", "seconds": 1.0, "heavy_modules": ["torch"]}], baseline, 0.25), ["app"])
+        self.assertEqual(compare([{"module": "app", "seconds": 1.1, "heavy_modules": []}], baseline, 0.25), [])
+
+if __name__ == '__main__':
+    unittest.main()
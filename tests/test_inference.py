@@ -0,0 +1,105 @@
+import unittest
+from unittest import mock
+import torch
+import whisper.model
+from config import config
+from benchmarks.backends import ladder_costs, recommend, render, word_error_rate
+from utils.inference import choose_whisper_size, optimize_model, whisper_size_policy
+
+LADDER = [(60, "small"), (300, "base"), (float("inf"), "tiny")]
+
+def tiny_whisper():
+    torch.manual_seed(0)
+    dims = whisper.model.ModelDimensions(
+        n_mels=80, n_audio_ctx=50, n_audio_state=64, n_audio_head=4, n_audio_layer=2,
+        n_vocab=51865, n_text_ctx=32, n_text_state=64, n_text_head=4, n_text_layer=2
+    )
+    return whisper.model.Whisper(dims).eval()
+
+class TestSizeLadder(unittest.TestCase):
+    def setUp(self):
+        patches = [mock.patch("utils.inference.WHISPER_AUTO_SIZE", True),
+                   mock.patch("utils.inference.WHISPER_SIZE_LADDER", LADDER),
+                   mock.patch("utils.inference.WHISPER_LADDER_QUEUE_STEP", 8)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def test_longer_recordings_get_smaller_models(self):
+        self.assertEqual(choose_whisper_size(45, queue_depth=0), "small")
+        self.assertEqual(choose_whisper_size(60, queue_depth=0), "small")
+        self.assertEqual(choose_whisper_size(200, queue_depth=0), "base")
+        self.assertEqual(choose_whisper_size(600, queue_depth=0), "tiny")
+
+    def test_busy_queue_steps_down(self):
+        self.assertEqual(choose_whisper_size(45, queue_depth=7), "small")
+        self.assertEqual(choose_whisper_size(45, queue_depth=8), "base")
+        self.assertEqual(choose_whisper_size(45, queue_depth=100), "tiny")
+
+    def test_default_ladder_keeps_configured_size_for_ordinary_talks(self):
+        with mock.patch("utils.inference.WHISPER_SIZE_LADDER", config.WHISPER_SIZE_LADDER):
+            self.assertEqual(choose_whisper_size(20 * 60, queue_depth=0), config.WHISPER_MODEL)
+            self.assertEqual(choose_whisper_size(2 * 3600, queue_depth=0), "tiny")
+            self.assertEqual(choose_whisper_size(20 * 60, queue_depth=8), "tiny")
+
+    def test_fixed_size_when_disabled(self):
+        with mock.patch("utils.inference.WHISPER_AUTO_SIZE", False), \
+             mock.patch("utils.inference.WHISPER_MODEL", "medium"):
+            self.assertEqual(choose_whisper_size(45, queue_depth=0), "medium")
+            self.assertEqual(whisper_size_policy(), "medium")
+
+    def test_policy_names_the_whole_ladder(self):
+        # Part of the transcript cache version, so changing the ladder invalidates it
+        self.assertEqual(whisper_size_policy(), "auto-small@60,base@300,tiny@inf")
+
+class TestQuantization(unittest.TestCase):
+    def test_int8_encoder_stays_close_to_fp32(self):
+        model = tiny_whisper()
+        mel = torch.randn(1, 80, 100)
+        with torch.no_grad():
+            expected = model.encoder(mel)
+            optimize_model(model, "cpu", quantization="int8", compile=False)
+            actual = model.encoder(mel)
+
+        quantized = [module for module in model.modules() if isinstance(module, torch.ao.nn.quantized.dynamic.Linear)]
+        self.assertGreater(len(quantized), 0)
+        self.assertFalse(any(type(module) is whisper.model.Linear for module in model.modules()))
+        cosine = torch.nn.functional.cosine_similarity(expected.flatten(), actual.flatten(), dim=0)
+        self.assertGreater(float(cosine), 0.99)
+
+    def test_no_quantization_off_cpu_or_when_disabled(self):
+        for device, quantization in [("cpu", "none"), ("cuda", "int8")]:
+            model = tiny_whisper()
+            optimize_model(model, device, quantization=quantization, compile=False)
+            self.assertTrue(any(type(module) is whisper.model.Linear for module in model.modules()))
+
+    def test_unknown_quantization(self):
+        with self.assertRaises(ValueError):
+            optimize_model(tiny_whisper(), "cpu", quantization="int4", compile=False)
+
+class TestBackendReport(unittest.TestCase):
+    def test_word_error_rate(self):
+        self.assertEqual(word_error_rate("Hello, world!", "hello world"), 0.0)
+        self.assertAlmostEqual(word_error_rate("the cat sat down", "the cat sat"), 0.25)
+        self.assertAlmostEqual(word_error_rate("the cat sat", "a cat sat on"), 2 / 3)
+
+    def test_recommends_fastest_setting_within_accuracy_budget(self):
+        results = [
+            {"model": "whisper-base", "backend": "fp32", "load_seconds": 1.0, "rtf": 0.4, "speedup": 1.0, "wer": 0.10, "wer_increase": 0.0},
+            {"model": "whisper-base", "backend": "int8", "load_seconds": 1.2, "rtf": 0.3, "speedup": 1.3, "wer": 0.10, "wer_increase": 0.0},
+            {"model": "whisper-tiny", "backend": "int8", "load_seconds": 0.5, "rtf": 0.1, "speedup": 4.0, "wer": 0.16, "wer_increase": 0.06},
+            {"model": "whisper-small", "backend": "int8", "load_seconds": 2.0, "rtf": 0.2, "speedup": 2.1, "wer": 0.11, "wer_increase": 0.01},
+        ]
+        best = recommend(results, min_speedup=2.0, max_wer_increase=0.02)
+        self.assertEqual((best["model"], best["backend"]), ("whisper-small", "int8"))
+        self.assertIsNone(recommend(results, min_speedup=5.0, max_wer_increase=0.02))
+        self.assertIn("Recommended: whisper-small int8", render({"results": results}, 2.0, 0.02))
+
+        with mock.patch("benchmarks.backends.MODEL_QUANTIZATION", "int8"), \
+             mock.patch("benchmarks.backends.MODEL_COMPILE", False):
+            rungs = ladder_costs(results, [(1800, "base"), (float("inf"), "tiny"), (float("inf"), "large")], 0.02)
+        self.assertEqual([rung["within_budget"] for rung in rungs], [True, False, None])
+        self.assertEqual(rungs[0]["backend"], "int8")
+
+if __name__ == '__main__':
+    unittest.main()
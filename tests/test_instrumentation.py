@@ -0,0 +1,121 @@
+import unittest
+import json
+import os
+import tempfile
+import time
+import urllib.request
+import numpy as np
+from audio_processing.prosody import analyze_prosody
+from benchmarks.synthetic import synthetic_speech
+from utils.audio_buffer import AudioBuffer
+from utils.instrumentation import (
+    STAGE_ERRORS,
+    STAGE_SECONDS,
+    Histogram,
+    MetricsRegistry,
+    configure_json_log,
+    metrics,
+    start_metrics_server,
+    timed,
+)
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        metrics.clear()
+
+    def test_histogram_buckets_and_quantiles(self):
+        histogram = Histogram([0.1, 1.0, 10.0])
+        for value in [0.05, 0.1, 0.5, 0.5, 20.0]:
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 2, 0, 1])
+        self.assertAlmostEqual(histogram.sum, 21.15)
+        self.assertAlmostEqual(histogram.quantile(0.4), 0.1)
+        self.assertAlmostEqual(histogram.quantile(0.6), 0.55)
+
+    def test_prometheus_text(self):
+        registry = MetricsRegistry([0.5, 1.0])
+        registry.observe("latency_seconds", 0.2, stage="vad")
+        registry.observe("latency_seconds", 0.7, stage="vad")
+        registry.inc("errors_total", stage='say "hi"')
+        registry.set("depth", 3)
+        text = registry.render()
+        self.assertIn('latency_seconds_bucket{stage="vad",le="0.5"} 1', text)
+        self.assertIn('latency_seconds_bucket{stage="vad",le="+Inf"} 2', text)
+        self.assertIn('latency_seconds_count{stage="vad"} 2', text)
+        self.assertIn('errors_total{stage="say \\"hi\\""} 1', text)
+        self.assertIn("# TYPE depth gauge\ndepth 3", text)
+
+    def test_timed_records_latency_and_errors(self):
+        @timed("unit")
+        def work(fail=False):
+            if fail:
+                raise RuntimeError("boom")
+            return 42
+
+        self.assertEqual(work(), 42)
+        with self.assertRaises(RuntimeError):
+            work(fail=True)
+        with timed("unit"):
+            pass
+        self.assertEqual(metrics.histogram(STAGE_SECONDS, stage="unit").count, 3)
+        self.assertEqual(metrics.value(STAGE_ERRORS, stage="unit", error="RuntimeError"), 1)
+
+    def test_swallowed_analyzer_error_is_counted(self):
+        buffer = AudioBuffer(synthetic_speech(2))
+        # A voice activity result without its frame duration
+        result = analyze_prosody(buffer, {"speech_mask": np.ones(10, dtype=bool)})
+        self.assertTrue(np.isnan(result["monotony_score"]))
+        self.assertEqual(metrics.value(STAGE_ERRORS, stage="prosody", error="KeyError"), 1)
+        self.assertEqual(metrics.histogram(STAGE_SECONDS, stage="prosody").count, 1)
+
+    def test_silence_is_not_an_error(self):
+        silence = AudioBuffer(np.zeros(16000, dtype=np.float32))
+        self.assertEqual(analyze_prosody(silence)["voiced_duration"], 0)
+        self.assertIsNone(metrics.value(STAGE_ERRORS, stage="prosody", error="ValueError"))
+        self.assertEqual(metrics.histogram(STAGE_SECONDS, stage="prosody").count, 1)
+
+    def test_json_log(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "metrics.jsonl")
+            configure_json_log(path)
+            try:
+                with self.assertRaises(ValueError):
+                    with timed("logged"):
+                        raise ValueError("bad input")
+            finally:
+                configure_json_log(None)
+            with open(path) as f:
+                events = [json.loads(line) for line in f]
+        self.assertEqual([event["event"] for event in events], ["error", "stage"])
+        self.assertEqual(events[0]["message"], "bad input")
+        self.assertEqual(events[1]["status"], "error")
+
+    def test_metrics_endpoint(self):
+        metrics.inc(STAGE_ERRORS, stage="vad", error="OSError")
+        server = start_metrics_server(0, "127.0.0.1")
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as response:
+                text = response.read().decode()
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics.json") as response:
+                snapshot = json.load(response)
+        finally:
+            server.shutdown()
+        self.assertIn('speech_stage_errors_total{error="OSError",stage="vad"} 1', text)
+        self.assertEqual(snapshot[STAGE_ERRORS]['{error="OSError",stage="vad"}'], 1)
+
+    def test_overhead_per_call(self):
+        @timed("overhead")
+        def noop():
+            return None
+
+        calls = 20000
+        start = time.perf_counter()
+        for _ in range(calls):
+            noop()
+        per_call = (time.perf_counter() - start) / calls
+        # Under 1% of a 5 ms stage, the fastest analyzer stage we time
+        self.assertLess(per_call, 50e-6)
+
+if __name__ == '__main__':
+    unittest.main()
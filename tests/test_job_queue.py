@@ -0,0 +1,142 @@
+import unittest
+import os
+import pickle
+import tempfile
+import time
+from unittest import mock
+import numpy as np
+import soundfile as sf
+from audio_processing.pipeline import DEFAULT_STAGES, Stage
+from benchmarks.synthetic import synthetic_speech
+from jobs.job_queue import DONE, FAILED, QUEUED, RUNNING, JobQueue, QueueFullError
+from jobs.worker import JobWorker
+from utils.result_cache import ResultCache
+from utils.results_store import ResultsStore
+
+def wav_bytes(seconds, path, silent=False):
+    samples = np.zeros(int(16000 * seconds), dtype=np.float32) if silent else synthetic_speech(seconds)
+    sf.write(path, samples, 16000)
+    with open(path, "rb") as f:
+        return f.read()
+
+class TestJobQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.queue = JobQueue(
+            os.path.join(self.tmp.name, "jobs.sqlite3"),
+            os.path.join(self.tmp.name, "workspaces"),
+            max_depth=3
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_claim_follows_priority_then_submission_order(self):
+        low = self.queue.submit(b"a", "low.wav")
+        high = self.queue.submit(b"b", "high.mp3", priority=5)
+        later = self.queue.submit(b"c", "later.wav")
+        self.assertEqual(self.queue.get(later)["queue_position"], 2)
+
+        claimed = self.queue.claim("w1", limit=2)
+        self.assertEqual([job["id"] for job in claimed], [high, low])
+        self.assertEqual(self.queue.claim("w2", limit=5)[0]["id"], later)
+        self.assertEqual(self.queue.depth()[RUNNING], 3)
+
+    def test_each_job_has_its_own_workspace(self):
+        first = self.queue.submit(b"first", "talk.m4a")
+        second = self.queue.submit(b"second", "talk.m4a")
+        paths = {job["id"]: job["input_path"] for job in self.queue.claim("w", limit=2)}
+        self.assertNotEqual(paths[first], paths[second])
+        self.assertTrue(paths[first].endswith(".m4a"))
+        with open(paths[second], "rb") as f:
+            self.assertEqual(f.read(), b"second")
+
+    def test_backpressure(self):
+        for i in range(3):
+            self.queue.submit(b"x", f"{i}.wav")
+        with self.assertRaises(QueueFullError):
+            self.queue.submit(b"x", "overflow.wav")
+        self.assertEqual(len(os.listdir(self.queue.workspace_root)), 3)
+
+    def test_results_and_cleanup(self):
+        job_id = self.queue.submit(b"x", "talk.wav")
+        job = self.queue.claim("w")[0]
+        self.queue.complete(job_id, {"pacing": {"speech_rate": 120.0}})
+        status = self.queue.get(job_id)
+        self.assertEqual(status["status"], DONE)
+        self.assertEqual(status["result"], {"pacing": {"speech_rate": 120.0}})
+        self.assertFalse(os.path.exists(job["workspace"]))
+        self.assertIsNone(self.queue.get("unknown"))
+
+    def test_reads_pickled_results_of_earlier_versions(self):
+        job_id = self.queue.submit(b"x", "talk.wav")
+        self.queue.claim("w")
+        self.queue._finish(job_id, DONE, result=pickle.dumps({"pacing": {"speech_rate": 120.0}}))
+        self.assertEqual(self.queue.get(job_id)["result"], {"pacing": {"speech_rate": 120.0}})
+
+    def test_requeue_stale(self):
+        job_id = self.queue.submit(b"x", "talk.wav")
+        self.queue.claim("w")
+        self.assertEqual(self.queue.requeue_stale(max_age=60), 0)
+        time.sleep(0.01)
+        self.assertEqual(self.queue.requeue_stale(max_age=0), 1)
+        self.assertEqual(self.queue.get(job_id)["status"], QUEUED)
+
+    def test_worker_processes_batch(self):
+        good = self.queue.submit(wav_bytes(6, os.path.join(self.tmp.name, "a.wav")), "a.wav")
+        bad = self.queue.submit(b"not audio", "b.wav")
+        silent = self.queue.submit(wav_bytes(6, os.path.join(self.tmp.name, "c.wav"), silent=True), "c.wav")
+        stages = [
+            Stage("duration", lambda audio: audio.duration),
+            Stage("summary", lambda duration: f"{duration:.1f}s", deps=("duration",), uses_audio=False),
+        ]
+        worker = JobWorker(self.queue, "w", batch_size=4, stages=stages)
+        self.assertEqual(worker.run_once(), 3)
+        result = self.queue.get(good)["result"]
+        screen = result["prescreen"]
+        self.assertAlmostEqual(result["duration"], screen["trim_end"] - screen["trim_start"], places=2)
+        self.assertEqual(result["summary"], f"{result['duration']:.1f}s")
+        self.assertEqual(self.queue.get(bad)["status"], FAILED)
+        self.assertEqual(self.queue.get(silent)["error"], "No speech was detected in the recording.")
+        self.assertEqual(worker.run_once(), 0)
+
+    def test_worker_saves_labelled_results(self):
+        job_id = self.queue.submit(wav_bytes(6, os.path.join(self.tmp.name, "a.wav")), "a.wav",
+                                   student="ana", assignment="week-1")
+        self.assertEqual(self.queue.get(job_id)["student"], "ana")
+        store = ResultsStore(os.path.join(self.tmp.name, "results.sqlite3"))
+        stages = [Stage("pacing", lambda audio: {"speech_rate": 130.0, "total_duration": audio.duration})]
+        JobWorker(self.queue, "w", stages=stages, store=store).run_once()
+        [recording] = store.recordings(student="ana", assignment="week-1")
+        self.assertEqual(recording["source"], job_id)
+        self.assertEqual(recording["recorded_at"], self.queue.get(job_id)["created_at"])
+        self.assertEqual(store.metrics(recording["id"])["pacing.speech_rate"], 130.0)
+
+    def test_worker_batches_emotions_only_for_cache_misses(self):
+        path = os.path.join(self.tmp.name, "a.wav")
+        audio = wav_bytes(6, path)
+        stages = [stage for stage in DEFAULT_STAGES if stage.name in ("voice_activity", "emotions")]
+        cache = ResultCache(os.path.join(self.tmp.name, "cache"))
+        emotions = {"dominant_emotion": "neu", "all_emotions": {"neu": 1.0}}
+        with mock.patch("jobs.worker.analyze_emotion_batch", side_effect=lambda buffers, _: [emotions] * len(buffers)) as batch:
+            worker = JobWorker(self.queue, "w", batch_size=4, stages=stages, cache=cache)
+            first = self.queue.submit(audio, "a.wav")
+            worker.run_once()
+            self.assertEqual(self.queue.get(first)["result"]["emotions"], emotions)
+            self.assertEqual(len(batch.call_args[0][0]), 1)
+
+            # The same recording again plus a new one: only the new one is inferred
+            repeat = self.queue.submit(audio, "a.wav")
+            other = self.queue.submit(wav_bytes(8, os.path.join(self.tmp.name, "b.wav")), "b.wav")
+            worker.run_once()
+            self.assertEqual(batch.call_count, 2)
+            self.assertEqual(len(batch.call_args[0][0]), 1)
+            self.assertEqual(self.queue.get(repeat)["result"]["emotions"], emotions)
+            self.assertEqual(self.queue.get(other)["result"]["emotions"], emotions)
+
+            repeat = self.queue.submit(audio, "a.wav")
+            worker.run_once()
+            self.assertEqual(batch.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from feedback.feedback_generator import build_feedback_prompt, normalize_metrics
+from feedback.llm_client import LLMClient, metrics_digest
+from utils.result_cache import ResultCache
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal OpenAI-compatible streaming chat endpoint."""
+    pieces = ["Slow ", "down ", "a little."]
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        server.requests.append(body)
+        if server.failures > 0:
+            server.failures -= 1
+            self.send_response(503)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(b'{"error": {"message": "overloaded"}}')
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for piece in self.pieces:
+            chunk = {
+                "id": "stand-in", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, *args):
+        pass
+
+class TestLLMClient(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.requests = []
+        self.server.failures = 0
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = LLMClient(
+            "stand-in-model",
+            base_url=f"http://127.0.0.1:{self.server.server_port}/v1",
+            api_key="local",
+            backoff=0.01,
+            cache=ResultCache(os.path.join(self.tmp.name, "cache"))
+        )
+        metrics = normalize_metrics(
+            "Hello   everyone.", {"voice_percentage": 61.234}, {"speech_rate": 151.0},
+            {"total_filler_words": 2, "most_common_fillers": [("um", 2)]}, {"dominant_emotion": "neu"}
+        )
+        self.messages = build_feedback_prompt(metrics)
+        self.digest = metrics_digest(metrics)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_streams_pieces_in_order(self):
+        pieces = list(self.client.stream(self.messages))
+        self.assertEqual(pieces, StandInHandler.pieces)
+        self.assertEqual(self.server.requests[0]["model"], "stand-in-model")
+        self.assertTrue(self.server.requests[0]["stream"])
+
+    def test_identical_metrics_are_not_requested_twice(self):
+        first = self.client.complete(self.messages, self.digest)
+        second = self.client.complete(self.messages, self.digest)
+        self.assertEqual(first, "Slow down a little.")
+        self.assertEqual(second, first)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_retries_server_errors_with_backoff(self):
+        self.server.failures = 2
+        self.assertEqual(self.client.complete(self.messages), "Slow down a little.")
+        self.assertEqual(len(self.server.requests), 3)
+
+        self.server.failures = 10
+        with self.assertRaises(Exception):
+            self.client.complete(self.messages)
+
+    def test_normalized_metrics_share_a_digest(self):
+        digests = {
+            metrics_digest(normalize_metrics(text, {"voice_percentage": voice}, {}, {}, {}))
+            for text, voice in [("Hello  everyone.", 61.2341), ("Hello everyone.", 61.2338)]
+        }
+        self.assertEqual(len(digests), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import unittest
+import threading
+import time
+from utils.model_registry import ModelRegistry
+
+class FakeTensor:
+    def __init__(self, nbytes):
+        self.nbytes = nbytes
+
+    def numel(self):
+        return self.nbytes
+
+    def element_size(self):
+        return 1
+
+class FakeModel:
+    def __init__(self, device, nbytes=0):
+        self.device = device
+        self.nbytes = nbytes
+
+    def parameters(self):
+        return [FakeTensor(self.nbytes)]
+
+    def buffers(self):
+        return []
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+        self.registry = ModelRegistry(memory_budget_mb=1)
+
+    def make_loader(self, name, nbytes=0, delay=0.0):
+        def load(device):
+            time.sleep(delay)
+            self.loads.append((name, device))
+            return FakeModel(device, nbytes)
+        return load
+
+    def test_loads_once_per_name_and_device(self):
+        self.registry.register("whisper-base", self.make_loader("whisper-base"))
+        first = self.registry.get("whisper-base", "cpu")
+        second = self.registry.get("whisper-base", "cpu")
+        self.assertIs(first, second)
+        self.registry.get("whisper-base", "cuda")
+        self.assertEqual(self.loads, [("whisper-base", "cpu"), ("whisper-base", "cuda")])
+
+    def test_concurrent_get_loads_once(self):
+        self.registry.register("emotion", self.make_loader("emotion", delay=0.05))
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.registry.get("emotion", "cpu")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.loads), 1)
+        self.assertTrue(all(model is results[0] for model in results))
+
+    def test_lru_eviction_under_budget(self):
+        half_mb = 512 * 1024 + 1
+        for name in ["a", "b", "c"]:
+            self.registry.register(name, self.make_loader(name, nbytes=half_mb))
+        self.registry.get("a", "cpu")
+        self.registry.get("b", "cpu")
+        self.assertFalse(self.registry.is_loaded("a", "cpu"))
+        self.registry.get("c", "cpu")
+        self.assertFalse(self.registry.is_loaded("b", "cpu"))
+        self.assertTrue(self.registry.is_loaded("c", "cpu"))
+        self.assertLessEqual(self.registry.memory_used(), self.registry.memory_budget)
+
+    def test_warmup_skips_failing_models(self):
+        def broken(device):
+            raise RuntimeError("no weights")
+        self.registry.register("ok", self.make_loader("ok"))
+        self.registry.register("broken", broken)
+        loaded = self.registry.warmup(["ok", "broken"], device="cpu")
+        self.assertEqual(loaded, ["ok"])
+
+    def test_unknown_model(self):
+        with self.assertRaises(KeyError):
+            self.registry.get("missing", "cpu")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import unittest
+import numpy as np
+from audio_processing.pacing import analyze_pacing
+
+class TestPacing(unittest.TestCase):
+    def setUp(self):
+        # 20 s talk: speech 0-8 s, a 2 s pause, speech 10-19 s, 1 s of trailing silence
+        frame = 0.03
+        times = np.arange(int(20 / frame)) * frame
+        mask = ((times < 8) | ((times >= 10) & (times < 19)))
+        self.voice_activity = {
+            "total_frames": len(mask),
+            "frame_duration": frame,
+            "speech_mask": mask
+        }
+        starts = np.concatenate([np.arange(0, 8, 0.4), np.arange(10, 19, 0.4)])
+        self.transcript = {
+            "text": " ".join(["word"] * len(starts)),
+            "words": [{"word": " word", "start": s, "end": s + 0.3} for s in starts]
+        }
+
+    def test_rate_from_word_timestamps(self):
+        result = analyze_pacing(transcript=self.transcript, voice_activity=self.voice_activity)
+        self.assertEqual(result["total_words"], 43)
+        self.assertAlmostEqual(result["total_duration"], 19.98, places=2)
+        self.assertAlmostEqual(result["speech_rate"], 43 / 19.98 * 60, places=3)
+        self.assertAlmostEqual(result["articulation_rate"], 150, delta=3)
+
+    def test_pauses_from_speech_mask(self):
+        result = analyze_pacing(transcript=self.transcript, voice_activity=self.voice_activity)
+        self.assertEqual(result["pause_count"], 1)
+        self.assertAlmostEqual(result["avg_pause_duration"], 2.0, delta=0.05)
+        self.assertEqual(result["long_pause_count"], 1)
+        self.assertEqual(sum(result["pause_histogram"].values()), 1)
+
+    def test_rate_over_time_series(self):
+        result = analyze_pacing(transcript=self.transcript, voice_activity=self.voice_activity)
+        series = result["rate_over_time"]
+        self.assertEqual(series["wpm"].dtype, np.float32)
+        self.assertEqual(len(series["time"]), len(series["wpm"]))
+        self.assertAlmostEqual(float(series["wpm"][0]), 120, delta=1)
+
+    def test_pauses_from_word_gaps_without_vad(self):
+        voice_activity = {"total_frames": 666, "frame_duration": 0.03}
+        result = analyze_pacing(transcript=self.transcript, voice_activity=voice_activity)
+        self.assertEqual(result["pause_count"], 1)
+        self.assertAlmostEqual(result["avg_pause_duration"], 2.1, delta=0.05)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+import os
+import tempfile
+import time
+import numpy as np
+from audio_processing.filler_words import detect_filler_words
+from audio_processing.pipeline import DEFAULT_STAGES, Stage, iter_analysis, run_analysis, validate_stages
+from utils.audio_buffer import AudioBuffer
+from utils.result_cache import ResultCache
+
+def slow_duration(audio):
+    time.sleep(0.2)
+    return audio.duration
+
+def slow_length(audio):
+    time.sleep(0.2)
+    return len(audio)
+
+def describe(duration, length):
+    return f"{length} samples over {duration:.1f}s"
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.audio = AudioBuffer(np.zeros(16000, dtype=np.float32))
+        self.stages = [
+            Stage("duration", slow_duration),
+            Stage("length", slow_length),
+            Stage("summary", describe, deps=("duration", "length"), uses_audio=False),
+        ]
+
+    def test_independent_stages_run_concurrently(self):
+        start = time.perf_counter()
+        results = run_analysis(self.audio, self.stages)
+        elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 0.35)
+        self.assertEqual(results["summary"], "16000 samples over 1.0s")
+
+    def test_dependents_are_yielded_last(self):
+        order = [name for name, _ in iter_analysis(self.audio, self.stages)]
+        self.assertEqual(order[-1], "summary")
+        self.assertEqual(sorted(order[:2]), ["duration", "length"])
+
+    def test_cached_stages_are_not_rerun(self):
+        calls = []
+        def counted(audio):
+            calls.append(1)
+            return len(audio)
+        stages = [
+            Stage("length", counted),
+            Stage("summary", lambda length: f"{length} samples", deps=("length",), uses_audio=False),
+        ]
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResultCache(os.path.join(tmp, "cache"))
+            first = run_analysis(self.audio, stages, cache=cache)
+            second = run_analysis(AudioBuffer(self.audio.samples.copy()), stages, cache=cache)
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()["summary"]["hits"], 1)
+
+    def test_validate_rejects_cycles_and_unknown_deps(self):
+        with self.assertRaises(ValueError):
+            validate_stages([Stage("a", describe, deps=("b",)), Stage("b", describe, deps=("a",))])
+        with self.assertRaises(ValueError):
+            validate_stages([Stage("a", describe, deps=("missing",))])
+    def test_fallback_filler_results_are_not_cached(self):
+        cache_if = next(stage.cache_if for stage in DEFAULT_STAGES if stage.name == "filler_words")
+        self.assertTrue(cache_if(detect_filler_words("um so this is a test")))
+        # The error fallback (and an empty transcript) counts no words
+        self.assertFalse(cache_if(detect_filler_words(None)))
+        self.assertFalse(cache_if(detect_filler_words("")))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+import soundfile as sf
+from audio_processing.prescreen import AdmissionError, admit, prescreen
+from benchmarks.synthetic import synthetic_speech
+from config.config import MAX_AUDIO_DURATION, TRIM_PADDING_SECONDS
+
+SAMPLE_RATE = 16000
+
+class TestPrescreen(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write(self, name, samples, subtype="FLOAT"):
+        path = os.path.join(self.tmp.name, name)
+        sf.write(path, samples, SAMPLE_RATE, subtype=subtype)
+        return path
+
+    def test_trims_leading_and_trailing_silence(self):
+        speech = synthetic_speech(20)
+        path = self.write("padded.wav", np.concatenate([np.zeros(5 * SAMPLE_RATE), speech, np.zeros(4 * SAMPLE_RATE)]))
+        screen = prescreen(path)
+        self.assertTrue(screen["admitted"])
+        self.assertAlmostEqual(screen["duration"], 29.0)
+        self.assertAlmostEqual(screen["trim_start"], 5 - TRIM_PADDING_SECONDS, delta=0.3)
+        self.assertAlmostEqual(screen["trim_end"], 25 + TRIM_PADDING_SECONDS, delta=0.6)
+        self.assertGreater(screen["estimated_seconds"], 0)
+
+        buffer, _ = admit(path)
+        self.assertAlmostEqual(buffer.duration, screen["trim_end"] - screen["trim_start"], places=2)
+
+    def test_counts_continuous_speech(self):
+        # No pauses: the quietest frames are speech too, not a noise floor
+        t = np.arange(20 * SAMPLE_RATE) / SAMPLE_RATE
+        phase = 2 * np.pi * np.cumsum(140 * 2 ** (3 * np.sin(2 * np.pi * 0.5 * t) / 12)) / SAMPLE_RATE
+        source = sum(np.sin(k * phase) / k for k in range(1, 8))
+        samples = 0.1 * source * (0.25 + 0.75 * np.abs(np.sin(2 * np.pi * 2 * t)))
+        screen = prescreen(self.write("lecture.wav", samples.astype(np.float32)))
+        self.assertTrue(screen["admitted"])
+        self.assertGreater(screen["speech_percentage"], 90)
+        self.assertEqual((screen["trim_start"], screen["trim_end"]), (0.0, screen["duration"]))
+
+    def test_keeps_short_leading_silence(self):
+        path = self.write("onset.wav", np.concatenate([np.zeros(2 * SAMPLE_RATE), synthetic_speech(10)]))
+        self.assertEqual(prescreen(path)["trim_start"], 0.0)
+
+    def test_rejects_silence_and_noise(self):
+        for name, samples in [("silence.wav", np.zeros(10 * SAMPLE_RATE)),
+                              ("hiss.wav", 0.01 * np.random.default_rng(0).standard_normal(10 * SAMPLE_RATE))]:
+            screen = prescreen(self.write(name, samples))
+            self.assertFalse(screen["admitted"], name)
+            self.assertEqual(screen["reason"], "no_speech")
+
+    def test_rejects_long_files_from_header(self):
+        path = self.write("long.wav", np.zeros(int((MAX_AUDIO_DURATION + 1) * SAMPLE_RATE), dtype=np.int16), "PCM_16")
+        screen = prescreen(path)
+        self.assertEqual(screen["reason"], "too_long")
+        # Rejected on the header alone: no speech was measured
+        self.assertEqual(screen["speech_duration"], 0.0)
+        with self.assertRaises(AdmissionError):
+            admit(path)
+
+    def test_rejects_unreadable_files(self):
+        path = os.path.join(self.tmp.name, "notes.wav")
+        with open(path, "w") as f:
+            f.write("not audio")
+        self.assertEqual(prescreen(path)["reason"], "unreadable")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+from audio_processing.features import yin_pitch
+from audio_processing.pipeline import DEFAULT_STAGES
+from audio_processing.prosody import analyze_prosody
+from benchmarks.synthetic import synthetic_speech
+from utils.audio_buffer import AudioBuffer
+from utils.results_store import extract_metrics
+
+SAMPLE_RATE = 16000
+
+def voice(pitch, seconds, loudness=None):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(pitch(t)) / SAMPLE_RATE
+    source = sum(np.sin(k * phase) / k for k in range(1, 8))
+    envelope = loudness(t) if loudness else 1.0
+    return (0.2 * source * envelope).astype(np.float32)
+
+class TestProsody(unittest.TestCase):
+    def test_yin_pitch_recovers_tones(self):
+        t = np.arange(200) / 4000
+        frames = np.stack([np.sin(2 * np.pi * f * t) for f in (80, 150, 310)]).astype(np.float32)
+        np.testing.assert_allclose(yin_pitch(frames, 4000), [80, 150, 310], rtol=0.01)
+
+    def test_monotone_scores_higher_than_expressive(self):
+        monotone = analyze_prosody(AudioBuffer(voice(lambda t: np.full_like(t, 140.0), 20)))
+        expressive = analyze_prosody(AudioBuffer(voice(
+            lambda t: 160 * 2 ** (6 * np.sin(2 * np.pi * 0.4 * t) / 12), 20,
+            lambda t: 0.55 + 0.45 * np.sin(2 * np.pi * 0.3 * t)
+        )))
+        self.assertAlmostEqual(monotone["median_pitch"], 140, delta=2)
+        self.assertLess(monotone["pitch_range"], 0.5)
+        self.assertGreater(expressive["pitch_range"], 8)
+        self.assertGreater(monotone["monotony_score"], 0.8)
+        self.assertLess(expressive["monotony_score"], 0.4)
+        self.assertEqual(monotone["monotonous_percentage"], 100)
+
+    def test_windowed_series_and_speech_mask(self):
+        buffer = AudioBuffer(synthetic_speech(30))
+        result = analyze_prosody(buffer)
+        series = result["prosody_over_time"]
+        self.assertEqual(len(series["time"]), 11)
+        self.assertEqual(series["monotony"].dtype, np.float32)
+        self.assertTrue(np.all(np.diff(series["time"]) > 0))
+
+        no_speech = {"speech_mask": np.zeros(1000, dtype=bool), "frame_duration": 0.03}
+        self.assertEqual(analyze_prosody(buffer, no_speech)["voiced_duration"], 0)
+
+    def test_no_scored_window_has_no_monotony_score(self):
+        # Voiced, but in bursts too short for any window to be scored
+        samples = voice(lambda t: np.full_like(t, 140.0), 20)
+        samples[(np.arange(len(samples)) // (SAMPLE_RATE // 4)) % 8 != 0] = 0
+        result = analyze_prosody(AudioBuffer(samples))
+        self.assertGreater(result["voiced_duration"], 0)
+        self.assertTrue(np.isnan(result["monotony_score"]))
+        self.assertTrue(np.isnan(result["monotonous_percentage"]))
+        prosody = next(stage for stage in DEFAULT_STAGES if stage.name == "prosody")
+        self.assertFalse(prosody.cache_if(result))
+        self.assertNotIn("prosody.median_pitch", extract_metrics({"prosody": result}))
+
+if __name__ == '__main__':
+    unittest.main()
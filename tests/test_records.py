@@ -0,0 +1,82 @@
+import unittest
+import pickle
+import numpy as np
+from utils.records import (
+    EmotionResult, EmotionTimeline, PacingResult, RateSeries, VoiceActivityResult, dumps, is_serialized, loads
+)
+
+def voice_activity(frames=1000):
+    mask = np.zeros(frames, dtype=bool)
+    mask[100:400] = True
+    return VoiceActivityResult(
+        total_frames=frames, voice_frames=300, voice_percentage=30.0, has_speech=True,
+        frame_duration=0.03, speech_mask=mask, speech_segments=[(3.0, 12.0)]
+    )
+
+def emotions():
+    timeline = EmotionTimeline([0.0, 6.0], [6.0, 9.0], ("neu", "hap"), [[0.8, 0.2], [0.3, 0.7]])
+    return EmotionResult("neu", 0.6, {"neu": 60.0, "hap": 40.0}, {"neu": 0.6, "hap": 0.4}, timeline)
+
+class TestRecords(unittest.TestCase):
+    def test_records_read_like_dicts(self):
+        result = voice_activity()
+        self.assertEqual(result["voice_percentage"], result.voice_percentage)
+        self.assertEqual(result.get("missing", 0), 0)
+        self.assertIn("speech_mask", result)
+        self.assertEqual(list(result)[:2], ["total_frames", "voice_frames"])
+        self.assertFalse(hasattr(result, "__dict__"))
+        with self.assertRaises(KeyError):
+            result["missing"]
+
+    def test_series_are_float32(self):
+        series = RateSeries(time=[5.0, 10.0], wpm=np.array([120, 130]))
+        self.assertEqual(series.wpm.dtype, np.float32)
+        self.assertEqual(len(RateSeries.empty()["time"]), 0)
+
+    def test_emotion_timeline_iterates_as_windows(self):
+        timeline = emotions().timeline
+        self.assertEqual([window["label"] for window in timeline], ["neu", "hap"])
+        self.assertEqual(timeline[1]["end"], 9.0)
+        self.assertAlmostEqual(timeline[1]["scores"]["hap"], 0.7, places=6)
+        self.assertEqual(len(timeline[1:]), 1)
+        self.assertFalse(EmotionTimeline.empty())
+
+    def test_round_trip(self):
+        results = {
+            "voice_activity": voice_activity(),
+            "pacing": PacingResult(150.0, 170.0, 300, 0.1, 0.8, 12.0, 120.0, 10.0, 15, 1, 0.7, 1.9,
+                                   {"0.5-1s": 10, ">3s": 0}, RateSeries([5.0], [np.nan])),
+            "emotions": emotions(),
+            "transcript": {"text": "so um", "words": [{"word": f" w{i}", "start": i * 0.4, "end": i * 0.4 + 0.3,
+                                                     "probability": 0.9} for i in range(20)]},
+            "quick_feedback": "Slow down.",
+            "raw": b"\x00\x01",
+            "counts": {1: "int keys", "__array__": "marker-like key"},
+        }
+        data = dumps(results)
+        self.assertTrue(is_serialized(data))
+        loaded = loads(data)
+        self.assertEqual(loaded, results)
+        self.assertIsInstance(loaded["pacing"].rate_over_time, RateSeries)
+        self.assertEqual(loaded["voice_activity"]["speech_segments"], [(3.0, 12.0)])
+        self.assertEqual(loaded["voice_activity"]["speech_mask"].dtype, bool)
+        self.assertEqual(type(loaded["transcript"]["words"][3]["start"]), float)
+
+    def test_smaller_than_pickled_dicts(self):
+        result = voice_activity(20000)
+        legacy = {key: result[key] for key in result}
+        self.assertLess(len(dumps(result)), len(pickle.dumps(legacy)) / 4)
+
+    def test_records_still_pickle(self):
+        # Process-pool stages send their results back pickled
+        result = emotions()
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+
+    def test_rejects_arbitrary_objects(self):
+        with self.assertRaises(TypeError):
+            dumps({"callback": print})
+        with self.assertRaises(TypeError):
+            dumps(np.array([object()]))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from utils.result_cache import ResultCache, stage_key
+
+class TestResultCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_hits_and_misses(self):
+        cache = ResultCache(self.cache_dir)
+        key = stage_key("audio", "pacing", "1")
+        self.assertEqual(cache.lookup("pacing", key), (False, None))
+        cache.put("pacing", key, {"speech_rate": 120.0})
+        self.assertEqual(cache.get("pacing", key), {"speech_rate": 120.0})
+        self.assertEqual(cache.stats()["pacing"], {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_persists_across_instances(self):
+        key = stage_key("audio", "transcription", "whisper-base:1")
+        ResultCache(self.cache_dir).put("transcription", key, "hello")
+        self.assertEqual(ResultCache(self.cache_dir).get("transcription", key), "hello")
+
+    def test_drops_pickled_entries(self):
+        os.makedirs(os.path.join(self.cache_dir, "pacing"))
+        legacy = os.path.join(self.cache_dir, "pacing", "old.pkl")
+        with open(legacy, "wb") as f:
+            f.write(b"\x80\x05N.")
+        ResultCache(self.cache_dir)
+        self.assertFalse(os.path.exists(legacy))
+
+    def test_version_change_invalidates_dependents_only(self):
+        transcript = stage_key("audio", "transcription", "whisper-base:1")
+        fillers = stage_key("audio", "filler_words", "1", [transcript])
+        vad = stage_key("audio", "voice_activity", "1")
+        new_transcript = stage_key("audio", "transcription", "whisper-small:1")
+        self.assertNotEqual(fillers, stage_key("audio", "filler_words", "1", [new_transcript]))
+        self.assertEqual(vad, stage_key("audio", "voice_activity", "1"))
+
+    def test_lru_eviction(self):
+        cache = ResultCache(self.cache_dir, max_mb=0.01)
+        # Random bytes, so the compressed entries stay about this size
+        payload = np.random.default_rng(0).bytes(4000)
+        for name in ["a", "b"]:
+            cache.put("stage", name, payload)
+        cache.get("stage", "a")
+        cache.put("stage", "c", payload)
+        self.assertIsNone(cache.get("stage", "b"))
+        self.assertEqual(cache.get("stage", "a"), payload)
+        self.assertLessEqual(cache.size(), cache.max_bytes)
+
+    def test_budget_is_shared_by_caches_on_one_directory(self):
+        # Each worker process has its own ResultCache on the same directory
+        first = ResultCache(self.cache_dir, max_mb=0.01)
+        second = ResultCache(self.cache_dir, max_mb=0.01)
+        payload = np.random.default_rng(0).bytes(4000)
+        first.put("stage", "a", payload)
+        first.put("stage", "b", payload)
+        second.get("stage", "a")
+        second.put("stage", "c", payload)
+        self.assertIsNone(first.get("stage", "b"))
+        self.assertEqual(first.get("stage", "a"), payload)
+        on_disk = sum(entry.stat().st_size for entry in os.scandir(os.path.join(self.cache_dir, "stage")))
+        self.assertLessEqual(on_disk, first.max_bytes)
+        self.assertEqual(first.size(), second.size())
+
+    def test_indexes_entries_written_before_the_index(self):
+        key = stage_key("audio", "pacing", "1")
+        ResultCache(self.cache_dir).put("pacing", key, {"speech_rate": 120.0})
+        os.remove(os.path.join(self.cache_dir, "index.sqlite3"))
+        cache = ResultCache(self.cache_dir)
+        self.assertGreater(cache.size(), 0)
+        cache.clear()
+        self.assertEqual(cache.size(), 0)
+        self.assertIsNone(cache.get("pacing", key))
+
+if __name__ == '__main__':
+    unittest.main()
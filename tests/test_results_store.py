@@ -0,0 +1,107 @@
+import unittest
+import os
+import tempfile
+import numpy as np
+from audio_processing.emotion import _neutral_result as neutral_emotions
+from audio_processing.prosody import _neutral_result as neutral_prosody
+from utils.results_store import ResultsStore, extract_metrics
+
+DAY = 86400.0
+
+def analysis(filler_percentage, speech_rate, monotony=0.4):
+    return {
+        "pacing": {
+            "speech_rate": speech_rate,
+            "total_duration": 120.0,
+            "rate_over_time": {"time": np.array([5.0, 10.0, 15.0], dtype=np.float32),
+                               "wpm": np.array([speech_rate - 5, speech_rate, speech_rate + 5], dtype=np.float32)}
+        },
+        "filler_words": {"filler_percentage": filler_percentage, "total_filler_words": 3, "total_words": 300, "positions": []},
+        "prosody": {"monotony_score": monotony, "median_pitch": float("nan"), "voiced_duration": 80.0},
+        "emotions": {"confidence": 0.7, "emotion_distribution": {"neu": 60.0, "hap": 40.0},
+                     "all_emotions": {"neu": 0.6, "hap": 0.4}, "timeline": []},
+        "transcription": "not a metric",
+    }
+
+class TestResultsStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = ResultsStore(os.path.join(self.tmp.name, "results.sqlite3"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_extracts_finite_scalars_only(self):
+        metrics = extract_metrics(analysis(4.0, 140.0))
+        self.assertEqual(metrics["filler_words.filler_percentage"], 4.0)
+        self.assertEqual(metrics["emotions.neu"], 60.0)
+        self.assertNotIn("prosody.median_pitch", metrics)
+        self.assertFalse(any(name.startswith("transcription") for name in metrics))
+
+    def test_skips_fallback_results(self):
+        # Silent or failed stages return zeroed results, which aren't measurements
+        results = dict(analysis(4.0, 140.0), prosody=neutral_prosody(), emotions=neutral_emotions())
+        metrics = extract_metrics(results)
+        self.assertNotIn("prosody.monotony_score", metrics)
+        self.assertFalse(any(name.startswith("emotions.") for name in metrics))
+        self.assertEqual(metrics["pacing.speech_rate"], 140.0)
+        recording_id = self.store.save(results, "ana", "week-1")
+        self.assertIsNone(self.store.series(recording_id, "prosody.monotony"))
+
+    def test_round_trip(self):
+        recording_id = self.store.save(analysis(4.0, 140.0), "ana", "week-1", recorded_at=DAY, filename="talk.wav")
+        self.assertEqual(self.store.metrics(recording_id)["pacing.speech_rate"], 140.0)
+        times, wpm = self.store.series(recording_id, "pacing.wpm")
+        np.testing.assert_array_equal(times, [5.0, 10.0, 15.0])
+        np.testing.assert_array_equal(wpm, [135.0, 140.0, 145.0])
+        self.assertIsNone(self.store.series(recording_id, "pacing.unknown"))
+        [recording] = self.store.recordings(student="ana")
+        self.assertEqual((recording["assignment"], recording["duration"], recording["filename"]), ("week-1", 120.0, "talk.wav"))
+
+    def test_saving_a_source_again_replaces_it(self):
+        self.store.save(analysis(4.0, 140.0), "ana", "week-1", recorded_at=DAY, source="job-1")
+        self.store.save(analysis(2.0, 150.0), "ana", "week-1", source="job-1")
+        [recording] = self.store.recordings()
+        # The submission time stays that of the first save
+        self.assertEqual(recording["recorded_at"], DAY)
+        # The replaced recording's metrics and series went with it
+        np.testing.assert_array_equal(self.store.values("pacing.speech_rate"), [150.0])
+        np.testing.assert_array_equal(self.store.values("filler_words.filler_percentage"), [2.0])
+
+    def test_student_history_is_chronological(self):
+        self.store.save(analysis(6.0, 120.0), "ana", "week-3", recorded_at=3 * DAY)
+        self.store.save(analysis(9.0, 110.0), "ana", "week-1", recorded_at=DAY)
+        self.store.save(analysis(1.0, 150.0), "ben", "week-1", recorded_at=DAY)
+        history = self.store.history(["filler_words.filler_percentage", "prosody.median_pitch"], student="ana")
+        self.assertEqual(list(history["assignment"]), ["week-1", "week-3"])
+        np.testing.assert_array_equal(history["filler_words.filler_percentage"], [9.0, 6.0])
+        self.assertTrue(np.isnan(history["prosody.median_pitch"]).all())
+        self.assertEqual(len(self.store.history(["pacing.speech_rate"], since=2 * DAY)["id"]), 1)
+
+    def test_class_trend_and_cohort_percentiles(self):
+        rng = np.random.default_rng(0)
+        for week in range(1, 4):
+            for student in range(20):
+                # The class says fewer filler words every week
+                filler = 10.0 - 2 * week + rng.uniform(-1, 1)
+                self.store.save(analysis(filler, 130.0), f"s{student}", f"week-{week}", recorded_at=week * 7 * DAY + student)
+
+        trend = self.store.aggregate("filler_words.filler_percentage", by="assignment")
+        self.assertEqual([entry["group"] for entry in trend], ["week-1", "week-2", "week-3"])
+        self.assertTrue(all(entry["count"] == 20 for entry in trend))
+        medians = [entry["p50"] for entry in trend]
+        self.assertEqual(medians, sorted(medians, reverse=True))
+        self.assertAlmostEqual(trend[0]["mean"], 8.0, delta=0.5)
+        self.assertLessEqual(trend[0]["p10"], trend[0]["p90"])
+
+        self.assertEqual(self.store.percentile_rank("filler_words.filler_percentage", 0.0, "week-1"), 0.0)
+        self.assertEqual(self.store.percentile_rank("filler_words.filler_percentage", 100.0, "week-1"), 100.0)
+        self.assertIsNone(self.store.percentile_rank("filler_words.filler_percentage", 5.0, "week-9"))
+
+        per_student = self.store.aggregate("filler_words.filler_percentage", by="student", assignment="week-2")
+        self.assertEqual(len(per_student), 20)
+        with self.assertRaises(ValueError):
+            self.store.aggregate("filler_words.filler_percentage", by="filename")
+
+if __name__ == '__main__':
+    unittest.main()
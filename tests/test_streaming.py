@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+from audio_processing.streaming import RingBuffer, StreamingAnalyzer, stream_analysis
+
+SAMPLE_RATE = 16000
+
+def speech_like(seconds, rng):
+    # Harmonic "voice" with a 4 Hz syllable-like envelope
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    f0 = 140 + 20 * np.sin(2 * np.pi * 0.5 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 10))
+    envelope = 0.5 * (1 - np.cos(2 * np.pi * 4 * t))
+    return 0.2 * voice * envelope + 0.001 * rng.standard_normal(len(t))
+
+def chunks_of(signal, size=1024):
+    pcm = (np.clip(signal, -1, 1) * 32767).astype(np.int16)
+    for start in range(0, len(pcm), size):
+        yield pcm[start:start + size].tobytes()
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        silence = np.zeros(SAMPLE_RATE)
+        self.signal = np.concatenate([speech_like(2, rng), silence, speech_like(2, rng), silence, speech_like(2, rng)])
+
+    def test_ring_buffer_keeps_latest(self):
+        ring = RingBuffer(5)
+        ring.write(np.arange(3, dtype=np.int16))
+        ring.write(np.arange(3, 7, dtype=np.int16))
+        np.testing.assert_array_equal(ring.latest(), [2, 3, 4, 5, 6])
+        np.testing.assert_array_equal(ring.latest(2), [5, 6])
+
+    def test_pauses_and_cadence(self):
+        updates = list(stream_analysis(chunks_of(self.signal)))
+        times = [update["time"] for update in updates]
+        self.assertLess(max(np.diff(times)), 0.3)
+        final = updates[-1]
+        self.assertEqual(final["pause_count"], 2)
+        self.assertAlmostEqual(final["avg_pause_duration"], 1.0, delta=0.3)
+        self.assertGreater(final["speech_rate"], 0)
+        self.assertGreater(final["voice_percentage"], 50)
+
+    def test_memory_is_bounded(self):
+        analyzer = StreamingAnalyzer(window_seconds=1, ring_seconds=2)
+        for _ in range(3):
+            for chunk in chunks_of(self.signal):
+                analyzer.feed(chunk)
+        self.assertEqual(analyzer.ring.capacity, 2 * SAMPLE_RATE)
+        self.assertLessEqual(len(analyzer._window), analyzer._window.maxlen)
+        self.assertEqual(analyzer.ring.total_written, 3 * len(self.signal))
+
+if __name__ == '__main__':
+    unittest.main()
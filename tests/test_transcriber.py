@@ -0,0 +1,114 @@
+import unittest
+from unittest import mock
+import numpy as np
+from audio_processing.transcriber import ChunkedTranscriber, iter_transcription, transcribe_with_timestamps
+from utils.audio_buffer import AudioBuffer
+
+SAMPLE_RATE = 16000
+
+class FakeWhisper:
+    """Emits one 2-second segment per 2 s of window, labelled by absolute second."""
+
+    def __init__(self):
+        self.prompts = []
+
+    def transcribe(self, audio, initial_prompt=None, **kwargs):
+        self.prompts.append(initial_prompt)
+        duration = len(audio) / SAMPLE_RATE
+        segments = []
+        for start in np.arange(0, duration, 2.0):
+            end = min(start + 2.0, duration)
+            label = int(float(audio[int(start * SAMPLE_RATE)]))
+            segments.append({
+                "start": start,
+                "end": end,
+                "text": f" s{label}",
+                "words": [{"word": f" s{label}", "start": start, "end": end, "probability": 0.9}]
+            })
+        return {"segments": segments}
+
+class ScriptedWhisper:
+    """Returns fixed segments (window-relative times) keyed by the window's first second."""
+
+    def __init__(self, script):
+        self.script = script
+
+    def transcribe(self, audio, **kwargs):
+        segments = []
+        for text, words in self.script[int(float(audio[0]))]:
+            segments.append({
+                "start": words[0][1],
+                "end": words[-1][2],
+                "text": text,
+                "words": [{"word": word, "start": start, "end": end, "probability": 0.9} for word, start, end in words]
+            })
+        return {"segments": segments}
+
+class TestChunkedTranscription(unittest.TestCase):
+    def setUp(self):
+        # Each sample holds its absolute second so segments can be traced back
+        samples = np.repeat(np.arange(25, dtype=np.float32), SAMPLE_RATE)
+        self.buffer = AudioBuffer(samples)
+
+    def test_segments_are_stitched_in_order_without_duplicates(self):
+        model = FakeWhisper()
+        segments = list(iter_transcription(self.buffer, model, window_seconds=10, overlap_seconds=3))
+        labels = [int(segment["text"][2:]) for segment in segments]
+        self.assertEqual(labels, sorted(set(labels)))
+        for previous, current in zip(segments, segments[1:]):
+            self.assertGreater(current["end"], previous["end"])
+        self.assertAlmostEqual(segments[-1]["end"], 25.0)
+        for segment in segments:
+            self.assertEqual(segment["text"], f" s{int(segment['start'])}")
+            self.assertEqual(segment["words"][0]["start"], segment["start"])
+
+    def test_words_straddling_the_commit_point_are_stitched_once(self):
+        # Windows start at 0 s and 6 s; the first commits words starting
+        # before 8 s. The second window re-segments the overlap, starting its
+        # segment with "four" (already committed) slightly earlier than before
+        script = {
+            0: [(" one two", [(" one", 0.5, 2.0), (" two", 2.2, 4.0)]),
+                (" three four five", [(" three", 6.0, 7.0), (" four", 7.4, 8.3), (" five", 8.6, 9.8)])],
+            6: [(" four five six", [(" four", 1.3, 2.3), (" five", 2.6, 3.8), (" six", 4.0, 5.0)]),
+                (" seven", [(" seven", 6.0, 9.0)])],
+        }
+        buffer = AudioBuffer(self.buffer.samples[:16 * SAMPLE_RATE])
+        segments = list(iter_transcription(buffer, ScriptedWhisper(script), window_seconds=10, overlap_seconds=4))
+        words = [word["word"] for segment in segments for word in segment["words"]]
+        self.assertEqual("".join(words), " one two three four five six seven")
+        self.assertEqual([segment["text"] for segment in segments], [" one two", " three four", " five six", " seven"])
+        self.assertEqual((segments[1]["start"], segments[1]["end"]), (6.0, 8.3))
+        self.assertAlmostEqual(segments[2]["start"], 8.6)
+
+    def test_previous_text_is_used_as_prompt(self):
+        model = FakeWhisper()
+        list(iter_transcription(self.buffer, model, window_seconds=10, overlap_seconds=3))
+        self.assertIsNone(model.prompts[0])
+        self.assertIn("s0", model.prompts[1])
+
+    def test_live_feed_matches_buffer(self):
+        expected = [s["text"] for s in iter_transcription(self.buffer, FakeWhisper(), window_seconds=10, overlap_seconds=3)]
+        transcriber = ChunkedTranscriber(FakeWhisper(), window_seconds=10, overlap_seconds=3)
+        texts = []
+        for start in range(0, len(self.buffer), 4000):
+            texts.extend(s["text"] for s in transcriber.feed(self.buffer.samples[start:start + 4000]))
+        texts.extend(s["text"] for s in transcriber.flush())
+        self.assertEqual(texts, expected)
+
+class TestTranscriptModelSize(unittest.TestCase):
+    def test_busy_queue_marks_transcript_stepped_down(self):
+        buffer = AudioBuffer(np.zeros(SAMPLE_RATE * 4, dtype=np.float32))
+        ladder = [(60, "base"), (float("inf"), "tiny")]
+        with mock.patch("utils.inference.WHISPER_AUTO_SIZE", True), \
+             mock.patch("utils.inference.WHISPER_SIZE_LADDER", ladder), \
+             mock.patch("audio_processing.transcriber.get_model", return_value=FakeWhisper()) as get_model:
+            with mock.patch("utils.inference._queue_depth", 0):
+                idle = transcribe_with_timestamps(buffer)
+            with mock.patch("utils.inference._queue_depth", 100):
+                busy = transcribe_with_timestamps(buffer)
+        self.assertEqual((idle["model_size"], idle["stepped_down"]), ("base", False))
+        self.assertEqual((busy["model_size"], busy["stepped_down"]), ("tiny", True))
+        self.assertEqual([call.args[0] for call in get_model.call_args_list], ["whisper-base", "whisper-tiny"])
+
+if __name__ == '__main__':
+    unittest.main()
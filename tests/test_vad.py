@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+from audio_processing.vad import detect_voice_activity, frame_signal, mask_to_segments
+from utils.audio_buffer import AudioBuffer
+
+SAMPLE_RATE = 16000
+
+def voiced(seconds):
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    phase = 2 * np.pi * np.cumsum(140 + 20 * np.sin(2 * np.pi * 0.5 * t)) / SAMPLE_RATE
+    return 0.3 * sum(np.sin(k * phase) / k for k in range(1, 10)) * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+
+class TestVoiceActivity(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        silence = np.zeros(SAMPLE_RATE)
+        signal = np.concatenate([silence, voiced(2), silence, voiced(2), silence])
+        self.buffer = AudioBuffer(signal + 0.001 * rng.standard_normal(len(signal)))
+
+    def test_frame_signal_is_zero_copy(self):
+        samples = np.arange(1000, dtype=np.int16)
+        frames = frame_signal(samples, 480)
+        self.assertEqual(frames.shape, (2, 480))
+        self.assertTrue(np.shares_memory(frames, samples))
+        self.assertEqual(frames[1, 0], 480)
+
+    def test_mask_to_segments_merges_short_gaps(self):
+        mask = np.array([0, 1, 1, 0, 1, 1, 0, 0, 0, 0, 1], dtype=bool)
+        segments = mask_to_segments(mask, 0.1)
+        np.testing.assert_allclose(segments, [(0.1, 0.3), (0.4, 0.6), (1.0, 1.1)])
+        merged = mask_to_segments(mask, 0.1, min_gap=0.2)
+        self.assertEqual(len(merged), 2)
+        self.assertAlmostEqual(merged[0][1], 0.6)
+
+    def test_backends_find_both_phrases(self):
+        for backend in ["webrtc", "energy"]:
+            result = detect_voice_activity(self.buffer, backend=backend)
+            self.assertEqual(result["total_frames"], len(result["speech_mask"]))
+            segments = [s for s in result["speech_segments"] if s[1] - s[0] > 0.5]
+            self.assertEqual(len(segments), 2, backend)
+            self.assertAlmostEqual(segments[0][0], 1.0, delta=0.2)
+            self.assertAlmostEqual(segments[1][1], 6.0, delta=0.3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import os
+import tempfile
+import time
+import soundfile as sf
+import torch
+import pickle
+from audio_processing.pipeline import DEFAULT_STAGES, Stage
+from benchmarks.synthetic import synthetic_speech
+from jobs.job_queue import DONE, JobQueue
+from jobs.pool import WorkerPool, _resolve_stages, plan_workers
+
+def torch_threads(audio):
+    return torch.get_num_threads()
+
+def worker_pid(audio):
+    return os.getpid()
+
+class TestWorkerPool(unittest.TestCase):
+    def test_plan_modes(self):
+        self.assertEqual(plan_workers("throughput", 32, 0, 0), (16, 2))
+        self.assertEqual(plan_workers("latency", 32, 0, 0), (1, 32))
+        self.assertEqual(plan_workers("latency", 32, 2, 0), (2, 16))
+        self.assertEqual(plan_workers("throughput", 1, 0, 0), (1, 1))
+        with self.assertRaises(ValueError):
+            plan_workers("fastest", 8, 0, 0)
+
+    def test_workers_drain_queue_with_pinned_threads(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            db_path = os.path.join(tmp, "jobs.sqlite3")
+            queue = JobQueue(db_path, os.path.join(tmp, "workspaces"))
+            path = os.path.join(tmp, "talk.wav")
+            sf.write(path, synthetic_speech(4), 16000)
+            with open(path, "rb") as f:
+                audio_bytes = f.read()
+            job_ids = [queue.submit(audio_bytes, "talk.wav") for _ in range(4)]
+
+            pool = WorkerPool(processes=2, threads=1, db_path=db_path, batch_size=1,
+                              stages=[Stage("threads", torch_threads), Stage("pid", worker_pid),
+                                      Stage("child_pid", worker_pid, executor="process")],
+                              use_cache=False, use_store=False, preload=[], pin_cores=False)
+            pool.start()
+            try:
+                deadline = time.monotonic() + 60
+                while queue.depth()[DONE] < len(job_ids) and time.monotonic() < deadline:
+                    time.sleep(0.2)
+                self.assertEqual(pool.alive(), 2)
+            finally:
+                pool.stop()
+
+            results = [queue.get(job_id)["result"] for job_id in job_ids]
+            self.assertTrue(all(result["threads"] == 1 for result in results))
+            self.assertNotIn(os.getpid(), {result["pid"] for result in results})
+            # Workers may start process pools of their own
+            self.assertTrue(all(result["child_pid"] != result["pid"] for result in results))
+
+    def test_spawned_workers_get_default_stages_by_name(self):
+        pool = WorkerPool(processes=1, threads=1, preload=[], start_method="spawn")
+        self.assertEqual(_resolve_stages(pickle.loads(pickle.dumps(pool._stage_args))), DEFAULT_STAGES)
+        with self.assertRaises(ValueError):
+            WorkerPool(processes=1, threads=1, preload=[], start_method="spawn",
+                       stages=[Stage("local", lambda audio: None)])
+
+if __name__ == '__main__':
+    unittest.main()
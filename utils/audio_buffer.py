@@ -0,0 +1,135 @@
+import hashlib
+import numpy as np
+from typing import Optional, Union
+
+from config.config import SAMPLE_RATE
+from utils.helpers import load_audio
+
+
+class AudioBuffer:
+    """
+    Mono float32 audio decoded once and shared by every analyzer.
+
+    Analyzers get read-only NumPy views (or an int16 PCM memoryview for
+    WebRTC VAD) of the same samples instead of decoding the file themselves.
+    `features` holds the buffer's shared frame features once an analyzer has
+    asked for them (see audio_processing.features.get_features).
+    """
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = SAMPLE_RATE, source_path: Optional[str] = None):
+        samples = np.ascontiguousarray(samples, dtype=np.float32)
+        if samples.ndim != 1:
+            raise ValueError("AudioBuffer expects mono (1-D) samples")
+        self._samples = samples
+        self.sample_rate = sample_rate
+        self.source_path = source_path
+        self._pcm16: Optional[np.ndarray] = None
+        self._digest: Optional[str] = None
+        self.features = None
+
+    @classmethod
+    def from_file(cls, audio_path: str, sample_rate: int = SAMPLE_RATE) -> "AudioBuffer":
+        """
+        Decode an audio file once, resampled to mono float32.
+
+        Args:
+            audio_path (str): Path to the audio file
+            sample_rate (int): Target sample rate (default: config.SAMPLE_RATE)
+
+        Returns:
+            AudioBuffer: Decoded audio
+        """
+        samples, sr = load_audio(audio_path, sample_rate)
+        return cls(samples, sr, source_path=audio_path)
+
+    @property
+    def samples(self) -> np.ndarray:
+        """Read-only float32 view of the samples."""
+        view = self._samples.view()
+        view.setflags(write=False)
+        return view
+
+    @property
+    def pcm16_array(self) -> np.ndarray:
+        """Read-only int16 PCM copy of the samples, computed once."""
+        if self._pcm16 is None:
+            pcm = np.clip(self._samples, -1.0, 1.0) * 32767
+            self._pcm16 = pcm.astype(np.int16)
+            self._pcm16.setflags(write=False)
+        return self._pcm16
+
+    @property
+    def pcm16(self) -> memoryview:
+        """Byte-addressed memoryview of the int16 PCM samples."""
+        return memoryview(self.pcm16_array).cast('B')
+
+    @property
+    def duration(self) -> float:
+        return len(self._samples) / self.sample_rate if self.sample_rate else 0.0
+
+    def digest(self) -> str:
+        """
+        Content hash of the decoded samples, computed once.
+
+        Returns:
+            str: Hex SHA-256 of the sample rate and float32 samples
+        """
+        if self._digest is None:
+            hasher = hashlib.sha256(str(self.sample_rate).encode())
+            hasher.update(memoryview(self._samples).cast('B'))
+            self._digest = hasher.hexdigest()
+        return self._digest
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def view(self, start: float = 0.0, end: Optional[float] = None) -> "AudioBuffer":
+        """
+        Zero-copy slice of the buffer between two times.
+
+        Args:
+            start (float): Start time in seconds
+            end (Optional[float]): End time in seconds (default: end of audio)
+
+        Returns:
+            AudioBuffer: Buffer sharing memory with this one
+        """
+        first = max(0, int(round(start * self.sample_rate)))
+        last = len(self._samples) if end is None else min(len(self._samples), int(round(end * self.sample_rate)))
+        sliced = AudioBuffer.__new__(AudioBuffer)
+        sliced._samples = self._samples[first:max(first, last)]
+        sliced.sample_rate = self.sample_rate
+        sliced.source_path = self.source_path
+        sliced._pcm16 = None if self._pcm16 is None else self._pcm16[first:max(first, last)]
+        sliced._digest = None
+        sliced.features = None
+        return sliced
+
+    def as_tensor(self):
+        """
+        Torch tensor sharing memory with the samples.
+
+        Returns:
+            torch.Tensor: 1-D float32 tensor
+        """
+        import torch
+        return torch.from_numpy(self._samples)
+
+
+AudioSource = Union[str, AudioBuffer]
+
+
+def as_audio_buffer(source: AudioSource, sample_rate: int = SAMPLE_RATE) -> AudioBuffer:
+    """
+    Accept either a path or an already decoded buffer.
+
+    Args:
+        source (AudioSource): Path to an audio file or an AudioBuffer
+        sample_rate (int): Target sample rate when decoding a path
+
+    Returns:
+        AudioBuffer: Decoded audio
+    """
+    if isinstance(source, AudioBuffer):
+        return source
+    return AudioBuffer.from_file(source, sample_rate)
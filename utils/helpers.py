@@ -1,11 +1,103 @@
 import os
 import soundfile as sf
+import soxr
 import numpy as np
-from typing import Tuple
+from typing import Iterator, Optional, Tuple
+from config.config import IO_BLOCK_SECONDS, RESAMPLE_QUALITY
+from utils.instrumentation import record_error, timed
 
+def iter_audio_blocks(
+    audio_path: str,
+    target_sr: Optional[int] = None,
+    block_seconds: float = IO_BLOCK_SECONDS
+) -> Iterator[Tuple[np.ndarray, int]]:
+    """
+    Decode an audio file block by block as mono float32.
+    
+    Only one block (plus the resampler's small internal state) is held at a
+    time, so memory does not grow with the length of the file. Resampling
+    uses a streaming soxr resampler, which gives the same output as
+    resampling the whole signal at once.
+    
+    Args:
+        audio_path (str): Path to an audio file libsndfile can read (wav, flac, ogg, mp3)
+        target_sr (Optional[int]): Output sample rate (default: the file's own)
+        block_seconds (float): Audio decoded per block
+        
+    Yields:
+        Tuple[np.ndarray, int]: Mono float32 block and its sample rate
+    """
+    with sf.SoundFile(audio_path) as f:
+        sr = f.samplerate
+        out_sr = target_sr or sr
+        resampler = soxr.ResampleStream(sr, out_sr, 1, dtype="float32", quality=RESAMPLE_QUALITY) if out_sr != sr else None
+        # One read buffer is reused for every block
+        out = np.empty((max(1, int(block_seconds * sr)), f.channels), dtype=np.float32)
+        for block in f.blocks(out=out, dtype="float32", always_2d=True):
+            if block.shape[1] > 1:
+                mono = block.mean(axis=1, dtype=np.float32)
+            elif resampler is None:
+                mono = block[:, 0].copy()
+            else:
+                mono = block[:, 0]
+            if resampler is not None:
+                mono = resampler.resample_chunk(mono)
+            if len(mono):
+                yield mono, out_sr
+        if resampler is not None:
+            tail = resampler.resample_chunk(np.zeros(0, dtype=np.float32), last=True)
+            if len(tail):
+                yield tail, out_sr
+
+def _peak(audio_path: str) -> float:
+    # First pass of peak normalization, at the file's own sample rate
+    peak = 0.0
+    for block, _ in iter_audio_blocks(audio_path):
+        peak = max(peak, float(np.max(np.abs(block))))
+    return peak
+
+@timed("decode")
+def load_audio(audio_path: str, target_sr: int = 16000) -> Tuple[np.ndarray, int]:
+    """
+    Decode an audio file to mono float32 at the target sample rate.
+    
+    Files libsndfile can read are decoded block by block straight into the
+    output array, so peak memory is the 16 kHz mono result rather than the
+    whole recording at its original rate and channel count. Other formats
+    (m4a, ...) go through librosa's audioread fallback.
+    
+    Args:
+        audio_path (str): Path to audio file (wav, mp3, m4a, ...)
+        target_sr (int): Target sample rate (default: 16000)
+        
+    Returns:
+        Tuple[np.ndarray, int]: Mono float32 samples and sample rate
+    """
+    try:
+        info = sf.info(audio_path)
+    except sf.LibsndfileError:
+        # Containers libsndfile can't read (mp3/m4a on older builds) go through librosa's audioread path
+        import librosa
+        data, sr = librosa.load(audio_path, sr=target_sr, mono=True, dtype=np.float32)
+        return data, sr
+    
+    expected = int(np.ceil(info.frames * target_sr / info.samplerate))
+    data = np.empty(expected, dtype=np.float32)
+    filled = 0
+    for block, _ in iter_audio_blocks(audio_path, target_sr):
+        if filled + len(block) > len(data):
+            data = np.resize(data, filled + len(block))
+        data[filled:filled + len(block)] = block
+        filled += len(block)
+    return data[:filled], target_sr
+
+@timed("convert_audio")
 def convert_audio_format(input_path: str, output_path: str, target_sr: int = 16000) -> bool:
     """
-    Convert audio file to WAV format with target sample rate.
+    Convert audio file to mono 16-bit WAV at the target sample rate.
+    
+    The file is decoded, mixed down and resampled block by block, so
+    recordings of any length convert in constant memory.
     
     Args:
         input_path (str): Path to input audio file
@@ -16,25 +108,24 @@ def convert_audio_format(input_path: str, output_path: str, target_sr: int = 160
         bool: True if conversion successful, False otherwise
     """
     try:
-        # Read audio file
-        data, sr = sf.read(input_path)
-        
-        # Convert to mono if stereo
-        if len(data.shape) > 1:
-            data = np.mean(data, axis=1)
-        
-        # Save as WAV with target sample rate
-        sf.write(output_path, data, target_sr)
+        with sf.SoundFile(output_path, "w", samplerate=target_sr, channels=1, format="WAV", subtype="PCM_16") as out:
+            for block, _ in iter_audio_blocks(input_path, target_sr):
+                out.write(block)
         return True
         
     except Exception as e:
         print(f"Error converting audio format: {str(e)}")
+        record_error("convert_audio", e)
         return False
 
+@timed("audio_duration")
 def get_audio_duration(audio_path: str) -> float:
     """
     Get duration of audio file in seconds.
     
+    Reads only the file header; formats libsndfile can't open fall back to
+    librosa, which also avoids decoding when the container states its length.
+    
     Args:
         audio_path (str): Path to audio file
         
@@ -42,16 +133,26 @@ def get_audio_duration(audio_path: str) -> float:
         float: Duration in seconds
     """
     try:
-        data, sr = sf.read(audio_path)
-        return len(data) / sr
+        try:
+            info = sf.info(audio_path)
+            return info.frames / info.samplerate
+        except sf.LibsndfileError:
+            import librosa
+            return float(librosa.get_duration(path=audio_path))
     except Exception as e:
         print(f"Error getting audio duration: {str(e)}")
+        record_error("audio_duration", e)
         return 0.0
 
+@timed("normalize_audio")
 def normalize_audio(audio_path: str) -> Tuple[np.ndarray, int]:
     """
     Normalize audio file to have consistent volume levels.
     
+    The peak is found in a first streaming pass, then the blocks are scaled
+    into one preallocated float32 array, so only the result is held in
+    memory. Use normalize_audio_file to normalize without holding the audio.
+    
     Args:
         audio_path (str): Path to audio file
         
@@ -59,18 +160,46 @@ def normalize_audio(audio_path: str) -> Tuple[np.ndarray, int]:
         Tuple[np.ndarray, int]: Normalized audio data and sample rate
     """
     try:
-        # Read audio file
-        data, sr = sf.read(audio_path)
+        peak = _peak(audio_path)
+        info = sf.info(audio_path)
+        data = np.empty(info.frames, dtype=np.float32)
+        filled = 0
+        for block, _ in iter_audio_blocks(audio_path):
+            data[filled:filled + len(block)] = block / peak if peak > 0 else block
+            filled += len(block)
+        return data[:filled], info.samplerate
         
-        # Convert to mono if stereo
-        if len(data.shape) > 1:
-            data = np.mean(data, axis=1)
-        
-        # Normalize
-        data = data / np.max(np.abs(data))
+    except Exception as e:
+        print(f"Error normalizing audio: {str(e)}")
+        record_error("normalize_audio", e)
+        return np.array([]), 0
+
+@timed("normalize_audio")
+def normalize_audio_file(input_path: str, output_path: str, target_sr: Optional[int] = None) -> bool:
+    """
+    Peak-normalize an audio file into a mono WAV file in constant memory.
+    
+    Two streaming passes: the first finds the peak, the second scales (and
+    optionally resamples) each block as it is written.
+    
+    Args:
+        input_path (str): Path to input audio file
+        output_path (str): Path to save the normalized WAV file
+        target_sr (Optional[int]): Output sample rate (default: the input's own)
         
-        return data, sr
+    Returns:
+        bool: True if normalization successful, False otherwise
+    """
+    try:
+        peak = _peak(input_path)
+        scale = 1.0 / peak if peak > 0 else 1.0
+        out_sr = target_sr or sf.info(input_path).samplerate
+        with sf.SoundFile(output_path, "w", samplerate=out_sr, channels=1, format="WAV", subtype="FLOAT") as out:
+            for block, _ in iter_audio_blocks(input_path, out_sr):
+                out.write(block * scale)
+        return True
         
     except Exception as e:
         print(f"Error normalizing audio: {str(e)}")
-        return np.array([]), 0 
\ No newline at end of file
+        record_error("normalize_audio", e)
+        return False
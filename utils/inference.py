@@ -0,0 +1,171 @@
+import threading
+from typing import Any, Optional, Sequence
+
+from config.config import (
+    INFERENCE_DEVICE,
+    MODEL_COMPILE,
+    MODEL_QUANTIZATION,
+    WHISPER_AUTO_SIZE,
+    WHISPER_LADDER_QUEUE_STEP,
+    WHISPER_MODEL,
+    WHISPER_SIZE_LADDER,
+)
+
+_queue_depth = 0
+_queue_lock = threading.Lock()
+
+
+def resolve_device(device: str = INFERENCE_DEVICE) -> str:
+    """
+    Device models run on.
+
+    Args:
+        device (str): "auto", "cpu" or "cuda"
+
+    Returns:
+        str: "cuda" for "auto" when a GPU is available, otherwise "cpu"
+    """
+    if device != "auto":
+        return device
+    try:
+        import torch
+    except ImportError:
+        return "cpu"
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+def _linear_subclasses():
+    # Linear layers that only cast their weights to the input dtype; they are
+    # plain nn.Linear in fp32 and must be typed as such to be quantized
+    classes = []
+    try:
+        from whisper.model import Linear as WhisperLinear
+        classes.append(WhisperLinear)
+    except ImportError:
+        pass
+    return tuple(classes)
+
+
+def quantize_linear_layers(model: Any) -> Any:
+    """
+    Dynamically quantize a model's linear layers to int8, in place.
+
+    Weights are stored as int8 and activations are quantized on the fly, so
+    the matrix multiplies in attention and feed-forward blocks run on int8
+    kernels. Convolutions, embeddings and norms stay in fp32. CPU only.
+
+    Args:
+        model (Any): torch.nn.Module in eval mode
+
+    Returns:
+        Any: The same model with quantized linear layers
+    """
+    import torch
+
+    casting = _linear_subclasses()
+    for module in model.modules():
+        if casting and type(module) in casting:
+            module.__class__ = torch.nn.Linear
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def compile_submodules(model: Any, names: Sequence[str]) -> Any:
+    """
+    Replace submodules with torch.compile'd versions.
+
+    Compilation happens on the first call; if it fails, torch falls back to
+    running the submodule eagerly instead of raising.
+
+    Args:
+        model (Any): torch.nn.Module
+        names (Sequence[str]): Dotted paths of the submodules to compile
+
+    Returns:
+        Any: The same model
+    """
+    import torch
+    import torch._dynamo
+
+    torch._dynamo.config.suppress_errors = True
+    for name in names:
+        parent_name, _, child = name.rpartition(".")
+        parent = model.get_submodule(parent_name) if parent_name else model
+        setattr(parent, child, torch.compile(getattr(parent, child), dynamic=True))
+    return model
+
+
+def optimize_model(
+    model: Any,
+    device: str,
+    module: Optional[Any] = None,
+    compile_targets: Sequence[str] = (),
+    quantization: str = MODEL_QUANTIZATION,
+    compile: bool = MODEL_COMPILE
+) -> Any:
+    """
+    Apply the configured inference backend to a freshly loaded model.
+
+    Args:
+        model (Any): Loaded model, returned as is apart from the changes below
+        device (str): Device the model was loaded on
+        module (Optional[Any]): The torch.nn.Module inside `model` to
+            optimize (default: `model` itself)
+        compile_targets (Sequence[str]): Submodules of `module` worth compiling
+        quantization (str): "int8" or "none"; int8 only applies on CPU
+        compile (bool): Compile `compile_targets` with torch.compile
+
+    Returns:
+        Any: The optimized model
+    """
+    if quantization not in ("int8", "none"):
+        raise ValueError(f"Unknown quantization: {quantization}")
+    module = model if module is None else module
+    module.eval()
+    if quantization == "int8" and device == "cpu":
+        quantize_linear_layers(module)
+    if compile and compile_targets:
+        compile_submodules(module, compile_targets)
+    return model
+
+
+def set_queue_load(depth: int) -> None:
+    """Record how many jobs are waiting, for choose_whisper_size()."""
+    global _queue_depth
+    with _queue_lock:
+        _queue_depth = depth
+
+
+def whisper_size_policy() -> str:
+    """
+    Tag of how Whisper sizes are chosen, for cache versions.
+
+    Returns:
+        str: The fixed size, or the whole ladder when sizes are automatic
+    """
+    if not WHISPER_AUTO_SIZE:
+        return WHISPER_MODEL
+    return "auto-" + ",".join(f"{size}@{limit:g}" for limit, size in WHISPER_SIZE_LADDER)
+
+
+def choose_whisper_size(duration: Optional[float] = None, queue_depth: Optional[int] = None) -> str:
+    """
+    Whisper model size for a recording, from config.WHISPER_SIZE_LADDER.
+
+    Short recordings get the most accurate model; longer ones and busy
+    queues step down to faster ones, so turnaround stays bounded.
+
+    Args:
+        duration (Optional[float]): Recording length in seconds (unknown: config.WHISPER_MODEL)
+        queue_depth (Optional[int]): Jobs waiting (default: the last set_queue_load())
+
+    Returns:
+        str: Model size, e.g. "base"
+    """
+    if not WHISPER_AUTO_SIZE or duration is None:
+        return WHISPER_MODEL
+    rung = next(index for index, (limit, _) in enumerate(WHISPER_SIZE_LADDER) if duration <= limit)
+    if queue_depth is None:
+        with _queue_lock:
+            queue_depth = _queue_depth
+    rung = min(rung + queue_depth // WHISPER_LADDER_QUEUE_STEP, len(WHISPER_SIZE_LADDER) - 1)
+    return WHISPER_SIZE_LADDER[rung][1]
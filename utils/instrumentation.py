@@ -0,0 +1,418 @@
+import bisect
+import functools
+import json
+import math
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+from config.config import METRICS_ENABLED, METRICS_LATENCY_BUCKETS, METRICS_LOG_PATH
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+STAGE_SECONDS = "speech_stage_duration_seconds"
+STAGE_ERRORS = "speech_stage_errors_total"
+CACHE_REQUESTS = "speech_cache_requests_total"
+MODEL_LOAD_SECONDS = "speech_model_load_seconds"
+QUEUE_DEPTH = "speech_job_queue_depth"
+LLM_FIRST_TOKEN_SECONDS = "speech_llm_first_token_seconds"
+LLM_RETRIES = "speech_llm_retries_total"
+ADMISSION_REJECTIONS = "speech_admission_rejections_total"
+
+_HELP = {
+    STAGE_SECONDS: "Wall time of each analysis stage",
+    STAGE_ERRORS: "Errors raised or swallowed by each analysis stage",
+    CACHE_REQUESTS: "Result cache lookups by stage and outcome",
+    MODEL_LOAD_SECONDS: "Time to load each model",
+    QUEUE_DEPTH: "Jobs in the analysis queue by status",
+    LLM_FIRST_TOKEN_SECONDS: "Time from an LLM request to its first streamed token",
+    LLM_RETRIES: "LLM requests retried after a transient error",
+    ADMISSION_REJECTIONS: "Uploads rejected by the pre-screen, by reason",
+}
+
+_json_log: Optional[TextIO] = None
+_json_log_lock = threading.Lock()
+
+
+class Histogram:
+    """Fixed-bucket latency histogram, as exposed by Prometheus."""
+
+    def __init__(self, buckets: Sequence[float] = METRICS_LATENCY_BUCKETS):
+        self.buckets = sorted(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation within its bucket.
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            float: Estimated value (NaN without observations)
+        """
+        if not self.count:
+            return math.nan
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                if index == len(self.buckets):
+                    return self.buckets[-1]
+                low = self.buckets[index - 1] if index else 0.0
+                return low + (self.buckets[index] - low) * (rank - seen) / count
+            seen += count
+        return self.buckets[-1]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in key]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    """
+    Thread-safe counters, gauges and histograms of one process.
+
+    Metrics are identified by name plus keyword labels. Every update is a
+    dictionary lookup and a few additions under one lock, which is
+    negligible next to the analysis stages being measured.
+    """
+
+    def __init__(self, buckets: Sequence[float] = METRICS_LATENCY_BUCKETS):
+        self.buckets = list(buckets)
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._histograms: Dict[str, Dict[LabelKey, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def value(self, name: str, **labels) -> Optional[float]:
+        """Current value of a counter or gauge, or None if never set."""
+        key = _label_key(labels)
+        with self._lock:
+            for metrics in (self._counters, self._gauges):
+                if key in metrics.get(name, {}):
+                    return metrics[name][key]
+        return None
+
+    def histogram(self, name: str, **labels) -> Optional[Histogram]:
+        """Copy of a histogram, or None if nothing was observed."""
+        key = _label_key(labels)
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(key)
+            if histogram is None:
+                return None
+            copy = Histogram(histogram.buckets)
+            copy.counts, copy.count, copy.sum = list(histogram.counts), histogram.count, histogram.sum
+            return copy
+
+    def render(self) -> str:
+        """
+        All metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text, one sample per line
+        """
+        lines: List[str] = []
+        with self._lock:
+            for kind, metrics in (("counter", self._counters), ("gauge", self._gauges)):
+                for name in sorted(metrics):
+                    lines.extend(_header(name, kind))
+                    for key, value in sorted(metrics[name].items()):
+                        lines.append(f"{name}{_format_labels(key)} {_format_number(value)}")
+            for name in sorted(self._histograms):
+                lines.extend(_header(name, "histogram"))
+                for key, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets + [math.inf], histogram.counts):
+                        cumulative += count
+                        le = f'le="{_format_number(bound)}"'
+                        lines.append(f"{name}_bucket{_format_labels(key, le)} {cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Summary of every series, keyed by metric name then label string.
+
+        Histograms are summarized as count, sum, p50 and p95.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: JSON-serializable metric values
+        """
+        summary: Dict[str, Dict[str, Any]] = {}
+        with self._lock:
+            for metrics in (self._counters, self._gauges):
+                for name, series in metrics.items():
+                    summary[name] = {_format_labels(key): value for key, value in series.items()}
+            for name, series in self._histograms.items():
+                summary[name] = {
+                    _format_labels(key): {
+                        "count": histogram.count,
+                        "sum": histogram.sum,
+                        "p50": histogram.quantile(0.5),
+                        "p95": histogram.quantile(0.95)
+                    }
+                    for key, histogram in series.items()
+                }
+        return summary
+
+    def clear(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+def _header(name: str, kind: str) -> List[str]:
+    return [f"# HELP {name} {_HELP.get(name, name)}", f"# TYPE {name} {kind}"]
+
+
+metrics = MetricsRegistry()
+
+
+def configure_json_log(path: Optional[str]) -> None:
+    """
+    Append structured events to a JSON-lines file, or stop logging them.
+
+    Args:
+        path (Optional[str]): Log file path, or None to close the current log
+    """
+    global _json_log
+    with _json_log_lock:
+        if _json_log is not None:
+            _json_log.close()
+        _json_log = open(path, "a", buffering=1) if path else None
+
+
+def log_event(event: str, **fields) -> None:
+    """
+    Write one structured event to the JSON log, if one is configured.
+
+    Args:
+        event (str): Event type, e.g. "stage" or "error"
+        **fields: JSON-serializable event fields
+    """
+    if _json_log is None:
+        return
+    line = json.dumps({"ts": round(time.time(), 3), "event": event, **fields}, default=str)
+    with _json_log_lock:
+        if _json_log is not None:
+            _json_log.write(line + "\n")
+
+
+class timed:
+    """
+    Record the wall time of a stage, as a decorator or a context manager.
+
+        @timed("prosody")
+        def analyze_prosody(...): ...
+
+        with timed("decode"):
+            buffer = AudioBuffer.from_file(path)
+
+    Each run is observed in the stage latency histogram and logged as a
+    "stage" event; an exception escaping the stage is also counted as an
+    error. Errors an analyzer catches itself should be reported with
+    record_error().
+    """
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self._starts = threading.local()
+
+    def __call__(self, func: Callable) -> Callable:
+        if not METRICS_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except BaseException as e:
+                self._finish(start, e)
+                raise
+            self._finish(start, None)
+            return result
+        return wrapper
+
+    def __enter__(self) -> "timed":
+        # A stack per thread, so one instance can be entered re-entrantly
+        if not hasattr(self._starts, "stack"):
+            self._starts.stack = []
+        self._starts.stack.append(time.perf_counter())
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        start = self._starts.stack.pop()
+        if METRICS_ENABLED:
+            self._finish(start, exc)
+
+    def _finish(self, start: float, error: Optional[BaseException]) -> None:
+        seconds = time.perf_counter() - start
+        metrics.observe(STAGE_SECONDS, seconds, stage=self.stage)
+        # Generators closed early and interrupts are not stage failures
+        failed = isinstance(error, Exception) and not isinstance(error, GeneratorExit)
+        if failed:
+            record_error(self.stage, error)
+        log_event("stage", stage=self.stage, seconds=round(seconds, 6), status="error" if failed else "ok")
+
+
+def record_error(stage: str, error: BaseException) -> None:
+    """
+    Count an error of a stage and log it, even when the stage recovers.
+
+    Analyzers return neutral results after an error; this is what tells a
+    failed stage apart from a recording that really had nothing in it.
+
+    Args:
+        stage (str): Stage name
+        error (BaseException): The exception
+    """
+    if not METRICS_ENABLED:
+        return
+    metrics.inc(STAGE_ERRORS, stage=stage, error=type(error).__name__)
+    log_event("error", stage=stage, error=type(error).__name__, message=str(error))
+
+
+def record_cache(stage: str, hit: bool) -> None:
+    """Count a result cache lookup."""
+    if METRICS_ENABLED:
+        metrics.inc(CACHE_REQUESTS, stage=stage, result="hit" if hit else "miss")
+
+
+def record_model_load(name: str, device: str, seconds: float) -> None:
+    """Observe a model load time."""
+    if METRICS_ENABLED:
+        metrics.observe(MODEL_LOAD_SECONDS, seconds, model=name, device=device)
+        log_event("model_load", model=name, device=device, seconds=round(seconds, 3))
+
+
+def record_llm_first_token(model: str, seconds: float) -> None:
+    """Observe how long an LLM response took to start streaming."""
+    if METRICS_ENABLED:
+        metrics.observe(LLM_FIRST_TOKEN_SECONDS, seconds, model=model)
+
+
+def record_llm_retry(model: str, error: BaseException) -> None:
+    """Count a retried LLM request."""
+    if METRICS_ENABLED:
+        metrics.inc(LLM_RETRIES, model=model, error=type(error).__name__)
+        log_event("llm_retry", model=model, error=type(error).__name__, message=str(error))
+
+
+def record_rejection(reason: str) -> None:
+    """Count an upload rejected before analysis."""
+    if METRICS_ENABLED:
+        metrics.inc(ADMISSION_REJECTIONS, reason=reason)
+        log_event("rejected", reason=reason)
+
+
+def set_queue_depth(counts: Dict[str, int]) -> None:
+    """Publish the number of jobs in each queue status."""
+    if METRICS_ENABLED:
+        for status, count in counts.items():
+            metrics.set(QUEUE_DEPTH, count, status=status)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] == "/metrics":
+            body = metrics.render().encode()
+            content_type = "text/plain; version=0.0.4; charset=utf-8"
+        elif self.path.split("?")[0] == "/metrics.json":
+            body = json.dumps(metrics.snapshot(), default=str).encode()
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_servers: Dict[int, ThreadingHTTPServer] = {}
+_servers_lock = threading.Lock()
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> Optional[ThreadingHTTPServer]:
+    """
+    Serve /metrics (Prometheus text) and /metrics.json from a daemon thread.
+
+    Calling it again for the same port returns the running server, so it is
+    safe from Streamlit reruns.
+
+    Args:
+        port (int): Port to listen on (0 picks a free one)
+        host (str): Interface to bind
+
+    Returns:
+        Optional[ThreadingHTTPServer]: The server, or None if the port is taken
+    """
+    with _servers_lock:
+        if port and port in _servers:
+            return _servers[port]
+        try:
+            server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        except OSError as e:
+            print(f"Error starting metrics server on port {port}: {str(e)}")
+            return None
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+        _servers[server.server_address[1]] = server
+        return server
+
+
+if METRICS_LOG_PATH:
+    configure_json_log(METRICS_LOG_PATH)
@@ -0,0 +1,287 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from config.config import (
+    EMOTION_MODEL_DIR,
+    EMOTION_MODEL_SOURCE,
+    MODEL_COMPILE,
+    MODEL_MEMORY_BUDGET_MB,
+    MODEL_QUANTIZATION,
+    WARMUP_MODELS,
+)
+from utils.inference import optimize_model, resolve_device
+from utils.instrumentation import record_error, record_model_load
+
+# A loader receives the target device ("cpu", "cuda", ...) and returns the model
+Loader = Callable[[str], Any]
+ModelKey = Tuple[str, str]
+
+WHISPER_SIZES = ["tiny", "base", "small", "medium"]
+
+
+def default_device() -> str:
+    """
+    Pick the device models should be loaded on.
+
+    Returns:
+        str: config.INFERENCE_DEVICE, or with "auto", "cuda" when a GPU is
+            available, otherwise "cpu"
+    """
+    return resolve_device()
+
+
+def estimate_model_bytes(model: Any) -> int:
+    """
+    Estimate the memory held by a model from its parameters and buffers.
+
+    Args:
+        model (Any): Loaded model, usually a torch.nn.Module
+
+    Returns:
+        int: Estimated size in bytes (0 when it cannot be determined)
+    """
+    total = 0
+    try:
+        for tensor in model.parameters():
+            total += tensor.numel() * tensor.element_size()
+        for tensor in model.buffers():
+            total += tensor.numel() * tensor.element_size()
+    except Exception:
+        return 0
+    return total
+
+
+class ModelRegistry:
+    """
+    Thread-safe, process-wide cache of loaded models.
+
+    Models are loaded lazily on first use, keyed by (name, device), and kept
+    until the memory budget is exceeded, at which point the least recently
+    used ones are dropped.
+    """
+
+    def __init__(self, memory_budget_mb: float = MODEL_MEMORY_BUDGET_MB):
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024)
+        self.load_times: Dict[ModelKey, float] = {}
+        self._loaders: Dict[str, Loader] = {}
+        self._models: "OrderedDict[ModelKey, Any]" = OrderedDict()
+        self._sizes: Dict[ModelKey, int] = {}
+        self._key_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, loader: Loader) -> None:
+        """
+        Register (or replace) the loader used for a model name.
+
+        Args:
+            name (str): Model name, e.g. "whisper-base"
+            loader (Loader): Callable taking a device and returning the model
+        """
+        with self._lock:
+            self._loaders[name] = loader
+            for key in [key for key in self._models if key[0] == name]:
+                self._drop(key)
+
+    def loader(self, name: str) -> Optional[Loader]:
+        """Loader registered for a model name, if any."""
+        with self._lock:
+            return self._loaders.get(name)
+
+    def get(self, name: str, device: Optional[str] = None) -> Any:
+        """
+        Return a loaded model, loading it once per process if needed.
+
+        Args:
+            name (str): Registered model name
+            device (Optional[str]): Target device (default: best available)
+
+        Returns:
+            Any: The loaded model
+        """
+        key = (name, device or default_device())
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key]
+            if name not in self._loaders:
+                raise KeyError(f"Unknown model: {name}")
+            loader = self._loaders[name]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given key; others wait and reuse its result
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+
+            start = time.perf_counter()
+            model = loader(key[1])
+            load_time = time.perf_counter() - start
+
+            with self._lock:
+                self._models[key] = model
+                self._sizes[key] = estimate_model_bytes(model)
+                self.load_times[key] = load_time
+                self._evict()
+            record_model_load(name, key[1], load_time)
+        return model
+
+    def warmup(self, names: Optional[Iterable[str]] = None, device: Optional[str] = None) -> List[str]:
+        """
+        Load models ahead of time so the first request doesn't pay for it.
+
+        Args:
+            names (Optional[Iterable[str]]): Models to load (default: config.WARMUP_MODELS)
+            device (Optional[str]): Target device (default: best available)
+
+        Returns:
+            List[str]: Names of the models that loaded successfully
+        """
+        loaded = []
+        for name in names if names is not None else WARMUP_MODELS:
+            try:
+                self.get(name, device)
+                loaded.append(name)
+            except Exception as e:
+                print(f"Error warming up model {name}: {str(e)}")
+                record_error("warmup", e)
+        return loaded
+
+    def warmup_in_background(self, names: Optional[Iterable[str]] = None,
+                             device: Optional[str] = None) -> threading.Thread:
+        """
+        Start warmup() in a daemon thread, once per registry.
+
+        A request for a model that is still loading waits for that load
+        instead of starting its own.
+
+        Args:
+            names (Optional[Iterable[str]]): Models to load (default: config.WARMUP_MODELS)
+            device (Optional[str]): Target device (default: best available)
+
+        Returns:
+            threading.Thread: The warmup thread (on later calls, the one already started)
+        """
+        with self._lock:
+            if self._warmup_thread is None:
+                self._warmup_thread = threading.Thread(target=self.warmup, args=(names, device),
+                                                       name="model-warmup", daemon=True)
+                self._warmup_thread.start()
+            return self._warmup_thread
+
+    def is_loaded(self, name: str, device: Optional[str] = None) -> bool:
+        with self._lock:
+            return (name, device or default_device()) in self._models
+
+    def memory_used(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+
+    def clear(self) -> None:
+        with self._lock:
+            for key in list(self._models):
+                self._drop(key)
+
+    def _drop(self, key: ModelKey) -> None:
+        self._models.pop(key, None)
+        self._sizes.pop(key, None)
+
+    def _evict(self) -> None:
+        # Always keep the most recently used model, even if it alone is over budget
+        while len(self._models) > 1 and sum(self._sizes.values()) > self.memory_budget:
+            self._drop(next(iter(self._models)))
+
+
+def whisper_loader(size: str, quantization: str = MODEL_QUANTIZATION, compile: bool = MODEL_COMPILE) -> Loader:
+    """
+    Loader for a Whisper model with the given inference backend.
+
+    Args:
+        size (str): Model size, e.g. "base"
+        quantization (str): "int8" or "none" (see utils.inference.optimize_model)
+        compile (bool): torch.compile the encoder
+
+    Returns:
+        Loader: Callable taking a device and returning the model
+    """
+    def load(device: str) -> Any:
+        import whisper
+        # Decoding is a loop of small steps, so only the encoder is worth compiling
+        return optimize_model(whisper.load_model(size, device=device), device, compile_targets=["encoder"],
+                              quantization=quantization, compile=compile)
+    return load
+
+
+def emotion_loader(quantization: str = MODEL_QUANTIZATION, compile: bool = MODEL_COMPILE) -> Loader:
+    """
+    Loader for the emotion classifier with the given inference backend.
+
+    Args:
+        quantization (str): "int8" or "none" (see utils.inference.optimize_model)
+        compile (bool): torch.compile the wav2vec2 encoder
+
+    Returns:
+        Loader: Callable taking a device and returning the model
+    """
+    def load(device: str) -> Any:
+        import speechbrain as sb
+        classifier = sb.pretrained.EncoderClassifier.from_hparams(
+            source=EMOTION_MODEL_SOURCE,
+            savedir=EMOTION_MODEL_DIR,
+            run_opts={"device": device}
+        )
+        return optimize_model(classifier, device, module=classifier.mods, compile_targets=["wav2vec2"],
+                              quantization=quantization, compile=compile)
+    return load
+
+
+registry = ModelRegistry()
+for _size in WHISPER_SIZES:
+    registry.register(f"whisper-{_size}", whisper_loader(_size))
+registry.register("emotion", emotion_loader())
+
+
+def get_model(name: str, device: Optional[str] = None) -> Any:
+    """
+    Get a model from the process-wide registry.
+
+    Args:
+        name (str): Registered model name
+        device (Optional[str]): Target device (default: best available)
+
+    Returns:
+        Any: The loaded model
+    """
+    return registry.get(name, device)
+
+
+def warmup(names: Optional[Iterable[str]] = None, device: Optional[str] = None) -> List[str]:
+    """
+    Preload models in the process-wide registry.
+
+    Args:
+        names (Optional[Iterable[str]]): Models to load (default: config.WARMUP_MODELS)
+        device (Optional[str]): Target device (default: best available)
+
+    Returns:
+        List[str]: Names of the models that loaded successfully
+    """
+    return registry.warmup(names, device)
+
+
+def warmup_in_background(names: Optional[Iterable[str]] = None, device: Optional[str] = None) -> threading.Thread:
+    """
+    Preload models in the process-wide registry without blocking the caller.
+
+    Args:
+        names (Optional[Iterable[str]]): Models to load (default: config.WARMUP_MODELS)
+        device (Optional[str]): Target device (default: best available)
+
+    Returns:
+        threading.Thread: The warmup thread
+    """
+    return registry.warmup_in_background(names, device)
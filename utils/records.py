@@ -0,0 +1,358 @@
+import io
+import json
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Record classes by name, so serialized results can be rebuilt
+_RECORD_TYPES: Dict[str, type] = {}
+_MARKERS = {"__array__", "__bytes__", "__tuple__", "__items__", "__record__", "__table__"}
+_META_KEY = "__meta__"
+_TABLE_MIN_ROWS = 8  # shorter lists of dicts aren't worth storing column by column
+
+
+def record(cls: type) -> type:
+    """
+    Make a class a slotted result record and register it for serialization.
+
+    Records are dataclasses with __slots__, so an instance holds its fields
+    and nothing else (no per-instance __dict__).
+    """
+    cls = dataclass(slots=True, eq=False)(cls)
+    _RECORD_TYPES[cls.__name__] = cls
+    return cls
+
+
+def _equal(a: Any, b: Any) -> bool:
+    if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+        a, b = np.asarray(a), np.asarray(b)
+        return a.shape == b.shape and bool(np.array_equal(a, b, equal_nan=a.dtype.kind == "f" and b.dtype.kind == "f"))
+    return bool(a == b)
+
+
+class Record(Mapping):
+    """
+    Base of the analyzer result records.
+
+    Records read like the dicts they replace (`result["speech_rate"]`,
+    `result.get(...)`, `"field" in result`), so consumers written against
+    dicts keep working, while attribute access gives typed fields.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in type(self).__dataclass_fields__:
+            return getattr(self, key)
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(type(self).__dataclass_fields__)
+
+    def __len__(self) -> int:
+        return len(type(self).__dataclass_fields__)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return set(self) == set(other) and all(_equal(self[key], other[key]) for key in self)
+
+    __hash__ = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict of the fields, with nested records converted too."""
+        return {key: value.to_dict() if isinstance(value, Record) else value for key, value in self.items()}
+
+
+class Series(Record):
+    """Record of equal-length float32 arrays, the first of which is the time axis."""
+    __slots__ = ()
+
+    def __post_init__(self):
+        for key in self:
+            setattr(self, key, np.asarray(getattr(self, key), dtype=np.float32))
+
+    @classmethod
+    def empty(cls):
+        return cls(*(np.zeros(0, dtype=np.float32) for _ in cls.__dataclass_fields__))
+
+
+@record
+class RateSeries(Series):
+    time: np.ndarray
+    wpm: np.ndarray
+
+
+@record
+class ProsodySeries(Series):
+    time: np.ndarray
+    pitch_variability: np.ndarray
+    energy_variability: np.ndarray
+    monotony: np.ndarray
+
+
+@record
+class VoiceActivityResult(Record):
+    total_frames: int
+    voice_frames: int
+    voice_percentage: float
+    has_speech: bool
+    frame_duration: float
+    speech_mask: np.ndarray  # bool, one entry per frame
+    speech_segments: List[Tuple[float, float]]
+
+
+@record
+class PacingResult(Record):
+    speech_rate: float
+    articulation_rate: float
+    total_words: int
+    rate_variability: float
+    avg_pause_duration: float
+    total_pause_time: float
+    total_duration: float
+    pause_percentage: float
+    pause_count: int
+    long_pause_count: int
+    median_pause_duration: float
+    p90_pause_duration: float
+    pause_histogram: Dict[str, int]
+    rate_over_time: RateSeries
+
+
+@record
+class FillerWordsResult(Record):
+    total_filler_words: int
+    filler_percentage: float
+    total_words: int
+    filler_counts: Dict[str, int]
+    most_common_fillers: List[Tuple[str, int]]
+    positions: List[Dict]
+
+
+@record
+class ProsodyResult(Record):
+    median_pitch: float
+    pitch_range: float
+    pitch_variability: float
+    energy_range: float
+    energy_variability: float
+    energy_consistency: float
+    monotony_score: float
+    monotonous_percentage: float
+    voiced_duration: float
+    prosody_over_time: ProsodySeries
+
+
+@record
+class EmotionTimeline(Sequence):
+    """
+    Per-window emotion scores as arrays.
+
+    Iterating (or indexing) still yields one dict per window with start,
+    end, label, confidence and scores, as the list of dicts it replaces did.
+    """
+    start: np.ndarray
+    end: np.ndarray
+    labels: Tuple[str, ...]  # score columns
+    scores: np.ndarray  # (windows, labels) class probabilities
+
+    def __post_init__(self):
+        self.start = np.asarray(self.start, dtype=np.float32)
+        self.end = np.asarray(self.end, dtype=np.float32)
+        self.labels = tuple(self.labels)
+        self.scores = np.asarray(self.scores, dtype=np.float32).reshape(len(self.start), len(self.labels))
+
+    @classmethod
+    def empty(cls) -> "EmotionTimeline":
+        return cls(np.zeros(0), np.zeros(0), (), np.zeros((0, 0)))
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return EmotionTimeline(self.start[index], self.end[index], self.labels, self.scores[index])
+        row = self.scores[index]
+        best = int(np.argmax(row))
+        return {
+            "start": float(self.start[index]),
+            "end": float(self.end[index]),
+            "label": self.labels[best],
+            "confidence": float(row[best]),
+            "scores": dict(zip(self.labels, row.tolist()))
+        }
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, EmotionTimeline):
+            return NotImplemented
+        return (self.labels == other.labels
+                and all(_equal(getattr(self, key), getattr(other, key)) for key in ("start", "end", "scores")))
+
+    __hash__ = None
+
+
+@record
+class EmotionResult(Record):
+    dominant_emotion: str
+    confidence: float
+    emotion_distribution: Dict[str, float]
+    all_emotions: Dict[str, float]
+    timeline: EmotionTimeline
+
+
+class _Packer:
+    # Arrays are concatenated into one flat buffer per dtype, so a result
+    # with many short series costs a few archive entries rather than one each
+    def __init__(self):
+        self.groups: Dict[str, int] = {}
+        self.parts: List[List[np.ndarray]] = []
+        self.sizes: List[int] = []
+
+    def add(self, array: np.ndarray) -> List:
+        if array.dtype.hasobject:
+            raise TypeError("Object arrays can't be serialized")
+        group = self.groups.setdefault(array.dtype.str, len(self.groups))
+        if group == len(self.parts):
+            self.parts.append([])
+            self.sizes.append(0)
+        offset = self.sizes[group]
+        self.parts[group].append(array.ravel())
+        self.sizes[group] += array.size
+        return [group, offset, list(array.shape)]
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {f"d{group}": np.concatenate(parts) for group, parts in enumerate(self.parts)}
+
+
+def _encode(value: Any, packer: _Packer) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return {"__array__": packer.add(value)}
+    if isinstance(value, (bytes, bytearray)):
+        return {"__bytes__": packer.add(np.frombuffer(bytes(value), dtype=np.uint8))}
+    if _RECORD_TYPES.get(type(value).__name__) is type(value):
+        return {
+            "__record__": type(value).__name__,
+            "fields": {field.name: _encode(getattr(value, field.name), packer) for field in fields(value)}
+        }
+    if isinstance(value, tuple):
+        return {"__tuple__": [_encode(item, packer) for item in value]}
+    if isinstance(value, list):
+        table = _encode_table(value, packer)
+        return table if table is not None else [_encode(item, packer) for item in value]
+    if isinstance(value, Mapping):
+        if all(isinstance(key, str) for key in value) and not _MARKERS.intersection(value):
+            return {key: _encode(item, packer) for key, item in value.items()}
+        return {"__items__": [[_encode(key, packer), _encode(item, packer)] for key, item in value.items()]}
+    raise TypeError(f"Can't serialize {type(value).__name__}")
+
+
+def _encode_table(rows: List[Any], packer: _Packer) -> Any:
+    # Lists of same-shaped dicts (transcript words and segments, filler
+    # positions) are stored column by column, with int and float columns as
+    # arrays, instead of repeating every key in every row
+    if len(rows) < _TABLE_MIN_ROWS or any(type(row) is not dict for row in rows):
+        return None
+    keys = list(rows[0])
+    if _MARKERS.intersection(keys) or any(not isinstance(key, str) for key in keys):
+        return None
+    if any(list(row) != keys for row in rows):
+        return None
+    columns = []
+    for key in keys:
+        values = [row[key] for row in rows]
+        kind = type(values[0])
+        if kind in (int, float) and all(type(item) is kind for item in values):
+            try:
+                columns.append(_encode(np.array(values, dtype=np.int64 if kind is int else np.float64), packer))
+                continue
+            except OverflowError:
+                pass
+        columns.append([_encode(item, packer) for item in values])
+    return {"__table__": keys, "columns": columns}
+
+
+def _decode(value: Any, flat: List[np.ndarray]) -> Any:
+    if isinstance(value, list):
+        return [_decode(item, flat) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if "__array__" in value:
+        return _unpack(value["__array__"], flat)
+    if "__bytes__" in value:
+        return _unpack(value["__bytes__"], flat).tobytes()
+    if "__tuple__" in value:
+        return tuple(_decode(item, flat) for item in value["__tuple__"])
+    if "__items__" in value:
+        return {_hashable(_decode(key, flat)): _decode(item, flat) for key, item in value["__items__"]}
+    if "__table__" in value:
+        columns = [_decode(column, flat) for column in value["columns"]]
+        columns = [column.tolist() if isinstance(column, np.ndarray) else column for column in columns]
+        return [dict(zip(value["__table__"], row)) for row in zip(*columns)]
+    if "__record__" in value:
+        cls = _RECORD_TYPES[value["__record__"]]
+        return cls(**{key: _decode(item, flat) for key, item in value["fields"].items()})
+    return {key: _decode(item, flat) for key, item in value.items()}
+
+
+def _unpack(ref: List, flat: List[np.ndarray]) -> np.ndarray:
+    group, offset, shape = ref
+    size = int(np.prod(shape, dtype=np.int64))
+    return flat[group][offset:offset + size].reshape(shape)
+
+
+def _hashable(key: Any) -> Any:
+    return tuple(key) if isinstance(key, list) else key
+
+
+def dumps(value: Any) -> bytes:
+    """
+    Serialize analysis results to a compact binary blob.
+
+    Arrays (masks, time series, score matrices, and the numeric columns of
+    lists of dicts such as transcript words) go into a compressed NumPy .npz
+    archive as one flat buffer per dtype, next to a JSON description of the
+    rest of the structure, so loading never unpickles anything.
+
+    Args:
+        value (Any): Records, arrays, bytes, and dicts, lists, tuples and
+            scalars of them
+
+    Returns:
+        bytes: .npz archive
+
+    Raises:
+        TypeError: If the value holds anything else
+    """
+    packer = _Packer()
+    encoded = _encode(value, packer)
+    meta = json.dumps({"groups": len(packer.parts), "value": encoded}).encode()
+    buffer = io.BytesIO()
+    np.savez_compressed(buffer, **{_META_KEY: np.frombuffer(meta, dtype=np.uint8)}, **packer.arrays())
+    return buffer.getvalue()
+
+
+def loads(data: bytes) -> Any:
+    """
+    Rebuild a value serialized by dumps().
+
+    Args:
+        data (bytes): .npz archive
+
+    Returns:
+        Any: The serialized value, with its records and arrays
+    """
+    with np.load(io.BytesIO(data), allow_pickle=False) as archive:
+        meta = json.loads(archive[_META_KEY].tobytes())
+        flat = [archive[f"d{group}"] for group in range(meta["groups"])]
+    return _decode(meta["value"], flat)
+
+
+def is_serialized(data: bytes) -> bool:
+    """Whether a blob was written by dumps() (.npz archives are zip files)."""
+    return data[:4] == b"PK\x03\x04"
@@ -0,0 +1,274 @@
+import hashlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from config.config import CACHE_DIR, CACHE_MAX_MB
+from utils.instrumentation import record_cache, record_error
+from utils.records import dumps, loads
+
+_MISSING = object()
+_INDEX_NAME = "index.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_by_use ON entries (used_at);
+"""
+
+
+def stage_key(audio_digest: str, stage: str, version: str, dep_keys: Iterable[str] = ()) -> str:
+    """
+    Cache key for one stage's output on one recording.
+
+    Downstream keys include the keys of the stages they depend on, so a
+    version bump in one stage invalidates it and everything built on it, and
+    nothing else.
+
+    Args:
+        audio_digest (str): Content hash of the decoded audio
+        stage (str): Stage name
+        version (str): Model/config version string of the stage
+        dep_keys (Iterable[str]): Cache keys of the stage's dependencies
+
+    Returns:
+        str: Hex SHA-256 cache key
+    """
+    hasher = hashlib.sha256()
+    for part in (audio_digest, stage, version, *dep_keys):
+        hasher.update(part.encode())
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+class ResultCache:
+    """
+    Persistent, size-bounded LRU cache of analyzer outputs.
+
+    Each stage's results live in their own directory as .npz archives (see
+    utils.records.dumps) named after their key. Sizes and last use times are
+    kept in a SQLite index next to them, shared by every process using the
+    directory, so the size budget holds for all of them together and the LRU
+    order survives restarts.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_mb: float = CACHE_MAX_MB):
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+        self._load_index()
+
+    def get(self, stage: str, key: str, default: Any = None) -> Any:
+        """
+        Look up a cached result.
+
+        Args:
+            stage (str): Stage name
+            key (str): Cache key from stage_key()
+            default (Any): Value returned on a miss
+
+        Returns:
+            Any: Cached result, or `default` on a miss
+        """
+        found, value = self.lookup(stage, key)
+        return value if found else default
+
+    def lookup(self, stage: str, key: str) -> Tuple[bool, Any]:
+        """
+        Look up a cached result, distinguishing misses from cached None.
+
+        Args:
+            stage (str): Stage name
+            key (str): Cache key from stage_key()
+
+        Returns:
+            Tuple[bool, Any]: Whether the key was found and its value
+        """
+        path = self._path(stage, key)
+        value = _MISSING
+        try:
+            with open(path, "rb") as f:
+                value = loads(f.read())
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Error reading cache entry {path}: {str(e)}")
+            record_error("cache", e)
+
+        record_cache(stage, value is not _MISSING)
+        with self._lock:
+            if value is _MISSING:
+                self.misses[stage] = self.misses.get(stage, 0) + 1
+                return False, None
+            self.hits[stage] = self.hits.get(stage, 0) + 1
+        self._touch(path)
+        return True, value
+
+    def put(self, stage: str, key: str, value: Any) -> None:
+        """
+        Store a result, evicting least recently used entries if over budget.
+
+        Args:
+            stage (str): Stage name
+            key (str): Cache key from stage_key()
+            value (Any): Result serializable by utils.records.dumps
+        """
+        path = self._path(stage, key)
+        try:
+            data = dumps(value)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+        except Exception as e:
+            print(f"Error writing cache entry {path}: {str(e)}")
+            record_error("cache", e)
+            return
+
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.execute("INSERT OR REPLACE INTO entries (path, size, used_at) VALUES (?, ?, ?)",
+                             (self._relative(path), size, time.time()))
+                self._evict(conn)
+                conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            print(f"Error indexing cache entry {path}: {str(e)}")
+            record_error("cache", e)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Hit/miss counters per stage.
+
+        Returns:
+            Dict[str, Dict[str, float]]: hits, misses and hit_rate for each stage
+        """
+        with self._lock:
+            stages = set(self.hits) | set(self.misses)
+            return {
+                stage: {
+                    "hits": self.hits.get(stage, 0),
+                    "misses": self.misses.get(stage, 0),
+                    "hit_rate": self.hits.get(stage, 0) / (self.hits.get(stage, 0) + self.misses.get(stage, 0))
+                }
+                for stage in stages
+            }
+
+    def size(self) -> int:
+        with self._connect() as conn:
+            return conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for (path,) in conn.execute("SELECT path FROM entries").fetchall():
+                self._remove(path)
+            conn.execute("DELETE FROM entries")
+            conn.execute("COMMIT")
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(os.path.join(self.cache_dir, _INDEX_NAME), timeout=30, isolation_level=None)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _path(self, stage: str, key: str) -> str:
+        return os.path.join(self.cache_dir, stage, f"{key}.npz")
+
+    def _relative(self, path: str) -> str:
+        return os.path.relpath(path, self.cache_dir)
+
+    def _touch(self, path: str) -> None:
+        try:
+            with self._connect() as conn:
+                conn.execute("UPDATE entries SET used_at = ? WHERE path = ?", (time.time(), self._relative(path)))
+        except sqlite3.Error as e:
+            # A missed recency update only makes the entry look older
+            record_error("cache", e)
+
+    def _load_index(self) -> None:
+        # Bring the index in line with the files on disk: entries written
+        # before it existed are indexed by modification time, and rows of
+        # files removed by hand are dropped
+        files = {}
+        for root, _, names in os.walk(self.cache_dir):
+            for name in names:
+                path = os.path.join(root, name)
+                if name.endswith(".pkl"):
+                    # Pickled entries from before the .npz format are never read again
+                    os.remove(path)
+                    continue
+                if not name.endswith(".npz"):
+                    continue
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                files[self._relative(path)] = (stat.st_size, stat.st_mtime)
+
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            indexed = {path for (path,) in conn.execute("SELECT path FROM entries")}
+            conn.executemany("DELETE FROM entries WHERE path = ?",
+                             [(path,) for path in indexed if path not in files])
+            conn.executemany("INSERT INTO entries (path, size, used_at) VALUES (?, ?, ?)",
+                             [(path, size, mtime) for path, (size, mtime) in files.items() if path not in indexed])
+            self._evict(conn)
+            conn.execute("COMMIT")
+
+    def _remove(self, relative_path: str) -> None:
+        try:
+            os.remove(os.path.join(self.cache_dir, relative_path))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        # Runs inside the caller's write transaction, so processes sharing the
+        # directory evict one at a time against the same totals
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for path, size in conn.execute("SELECT path, size FROM entries ORDER BY used_at"):
+            if total <= self.max_bytes:
+                break
+            evicted.append(path)
+            total -= size
+        for path in evicted:
+            self._remove(path)
+        conn.executemany("DELETE FROM entries WHERE path = ?", [(path,) for path in evicted])
+
+
+_shared_cache: Optional[ResultCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """
+    Process-wide result cache under config.CACHE_DIR.
+
+    Returns:
+        ResultCache: The shared cache
+    """
+    global _shared_cache
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ResultCache()
+        return _shared_cache
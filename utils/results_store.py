@@ -0,0 +1,450 @@
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.config import RESULTS_DB_PATH, RESULTS_PERCENTILES
+from utils.instrumentation import record_error
+
+# Scalar fields kept from each stage's result, stored as "<stage>.<field>"
+METRIC_FIELDS = {
+    "voice_activity": ["voice_percentage"],
+    "pacing": [
+        "speech_rate", "articulation_rate", "total_words", "rate_variability", "avg_pause_duration",
+        "median_pause_duration", "pause_percentage", "pause_count", "long_pause_count", "total_duration"
+    ],
+    "filler_words": ["total_filler_words", "filler_percentage"],
+    "prosody": [
+        "median_pitch", "pitch_range", "pitch_variability", "energy_variability", "energy_consistency",
+        "monotony_score", "monotonous_percentage", "voiced_duration"
+    ],
+    "emotions": ["confidence"],
+}
+# Time series kept from each stage's result: (field holding them, series names)
+SERIES_FIELDS = {
+    "pacing": ("rate_over_time", ["wpm"]),
+    "prosody": ("prosody_over_time", ["monotony", "pitch_variability", "energy_variability"]),
+}
+GROUP_COLUMNS = ("student", "assignment")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS recordings (
+    id INTEGER PRIMARY KEY,
+    source TEXT UNIQUE,
+    student TEXT,
+    assignment TEXT,
+    recorded_at REAL NOT NULL,
+    duration REAL,
+    filename TEXT
+);
+CREATE INDEX IF NOT EXISTS recordings_by_student ON recordings (student, recorded_at);
+CREATE INDEX IF NOT EXISTS recordings_by_assignment ON recordings (assignment, recorded_at);
+CREATE INDEX IF NOT EXISTS recordings_by_time ON recordings (recorded_at);
+CREATE TABLE IF NOT EXISTS metrics (
+    name TEXT NOT NULL,
+    recording_id INTEGER NOT NULL REFERENCES recordings (id) ON DELETE CASCADE,
+    value REAL NOT NULL,
+    PRIMARY KEY (name, recording_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metrics_by_recording ON metrics (recording_id);
+CREATE TABLE IF NOT EXISTS series (
+    recording_id INTEGER NOT NULL REFERENCES recordings (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    time BLOB NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (recording_id, name)
+) WITHOUT ROWID;
+"""
+
+
+def _measured(stages: Optional[Sequence[Any]]) -> Dict[str, Callable[[Any], bool]]:
+    # A stage's cache_if tells real results from the zeroed fallbacks
+    # analyzers return on errors or when there was nothing to measure
+    if stages is None:
+        from audio_processing.pipeline import DEFAULT_STAGES
+        stages = DEFAULT_STAGES
+    return {stage.name: stage.cache_if for stage in stages if stage.cache_if is not None}
+
+
+def extract_metrics(results: Dict[str, Any], stages: Optional[Sequence[Any]] = None) -> Dict[str, float]:
+    """
+    Flatten analysis results into named scalar metrics.
+
+    Args:
+        results (Dict[str, Any]): Stage results keyed by stage name
+        stages (Optional[Sequence[Any]]): Pipeline stages (default:
+            DEFAULT_STAGES); results failing their stage's cache_if are
+            fallbacks, not measurements, and are skipped
+
+    Returns:
+        Dict[str, float]: Values keyed "<stage>.<field>"; emotions also
+            contribute "emotions.<label>" with each label's share in percent
+    """
+    measured = _measured(stages)
+    metrics = {}
+    for stage, fields in METRIC_FIELDS.items():
+        result = results.get(stage)
+        if not isinstance(result, Mapping):
+            continue
+        if stage in measured and not measured[stage](result):
+            continue
+        for field in fields:
+            value = result.get(field)
+            if isinstance(value, (int, float, np.number)) and not isinstance(value, bool) and np.isfinite(value):
+                metrics[f"{stage}.{field}"] = float(value)
+    emotions = results.get("emotions")
+    if isinstance(emotions, Mapping) and ("emotions" not in measured or measured["emotions"](emotions)):
+        for label, share in emotions.get("emotion_distribution", {}).items():
+            metrics[f"emotions.{label}"] = float(share)
+    return metrics
+
+
+def extract_series(results: Dict[str, Any], stages: Optional[Sequence[Any]] = None) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """
+    Collect the time series in analysis results.
+
+    Args:
+        results (Dict[str, Any]): Stage results keyed by stage name
+        stages (Optional[Sequence[Any]]): Pipeline stages, see extract_metrics()
+
+    Returns:
+        Dict[str, Tuple[np.ndarray, np.ndarray]]: (times, values) as float32,
+            keyed "<stage>.<series>"
+    """
+    measured = _measured(stages)
+    series = {}
+    for stage, (field, names) in SERIES_FIELDS.items():
+        result = results.get(stage)
+        if not isinstance(result, Mapping) or field not in result:
+            continue
+        if stage in measured and not measured[stage](result):
+            continue
+        times = np.asarray(result[field]["time"], dtype=np.float32)
+        for name in names:
+            if name in result[field]:
+                series[f"{stage}.{name}"] = (times, np.asarray(result[field][name], dtype=np.float32))
+    return series
+
+
+class ResultsStore:
+    """
+    Persistent history of analysis results, backed by SQLite.
+
+    Each analyzed recording keeps its scalar metrics (one row per metric in
+    a narrow table indexed by name) and its time series as float32 blobs,
+    labelled with the student, assignment and time. Progress, trend and
+    cohort queries read these columns only; audio and models are never
+    touched again.
+    """
+
+    def __init__(self, db_path: str = RESULTS_DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys=ON")
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def save(
+        self,
+        results: Dict[str, Any],
+        student: Optional[str] = None,
+        assignment: Optional[str] = None,
+        recorded_at: Optional[float] = None,
+        source: Optional[str] = None,
+        filename: Optional[str] = None,
+        stages: Optional[Sequence[Any]] = None
+    ) -> Optional[int]:
+        """
+        Store the metrics and time series of one analysis.
+
+        Args:
+            results (Dict[str, Any]): Stage results keyed by stage name
+            student (Optional[str]): Student identifier
+            assignment (Optional[str]): Assignment identifier
+            recorded_at (Optional[float]): Unix time of the submission (default: now)
+            source (Optional[str]): What was analyzed (job ID or audio
+                digest); saving the same source again replaces its row but
+                keeps its original recorded_at
+            filename (Optional[str]): Original file name
+            stages (Optional[Sequence[Any]]): Stages that produced the
+                results, see extract_metrics()
+
+        Returns:
+            Optional[int]: Recording ID, or None if it could not be stored
+        """
+        metrics = extract_metrics(results, stages)
+        series = extract_series(results, stages)
+        screen = results.get("prescreen")
+        duration = screen["duration"] if isinstance(screen, Mapping) else metrics.get("pacing.total_duration")
+        try:
+            with self._connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                if source is not None:
+                    previous = conn.execute("SELECT recorded_at FROM recordings WHERE source = ?", (source,)).fetchone()
+                    if previous is not None:
+                        recorded_at = previous[0]
+                    conn.execute("DELETE FROM recordings WHERE source = ?", (source,))
+                recording_id = conn.execute(
+                    "INSERT INTO recordings (source, student, assignment, recorded_at, duration, filename) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (source, student, assignment, recorded_at if recorded_at is not None else time.time(),
+                     duration, filename)
+                ).lastrowid
+                conn.executemany(
+                    "INSERT INTO metrics (name, recording_id, value) VALUES (?, ?, ?)",
+                    [(name, recording_id, value) for name, value in metrics.items()]
+                )
+                conn.executemany(
+                    "INSERT INTO series (recording_id, name, time, value) VALUES (?, ?, ?, ?)",
+                    [(recording_id, name, times.tobytes(), values.tobytes()) for name, (times, values) in series.items()]
+                )
+                conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            print(f"Error saving results: {str(e)}")
+            record_error("results_store", e)
+            return None
+        return recording_id
+
+    def recordings(
+        self,
+        student: Optional[str] = None,
+        assignment: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> List[Dict]:
+        """
+        Stored recordings matching a filter, oldest first.
+
+        Args:
+            student (Optional[str]): Only this student's recordings
+            assignment (Optional[str]): Only recordings for this assignment
+            since (Optional[float]): Only recordings at or after this Unix time
+            until (Optional[float]): Only recordings before this Unix time
+
+        Returns:
+            List[Dict]: id, source, student, assignment, recorded_at, duration and filename
+        """
+        where, params = _filter(student, assignment, since, until)
+        with self._connect() as conn:
+            rows = conn.execute(f"SELECT * FROM recordings r{where} ORDER BY recorded_at", params).fetchall()
+        return [dict(row) for row in rows]
+
+    def metrics(self, recording_id: int) -> Dict[str, float]:
+        """All metrics of one recording, keyed by name."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT name, value FROM metrics WHERE recording_id = ?", (recording_id,)).fetchall()
+        return {row["name"]: row["value"] for row in rows}
+
+    def series(self, recording_id: int, name: str) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        One stored time series.
+
+        Args:
+            recording_id (int): Recording ID
+            name (str): Series name, e.g. "pacing.wpm"
+
+        Returns:
+            Optional[Tuple[np.ndarray, np.ndarray]]: (times, values), or None if not stored
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT time, value FROM series WHERE recording_id = ? AND name = ?",
+                               (recording_id, name)).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row["time"], dtype=np.float32), np.frombuffer(row["value"], dtype=np.float32)
+
+    def history(
+        self,
+        names: Sequence[str],
+        student: Optional[str] = None,
+        assignment: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Metrics of every matching recording as columns, oldest first.
+
+        Args:
+            names (Sequence[str]): Metric names, e.g. ["filler_words.filler_percentage"]
+            student, assignment, since, until: Filter, as in recordings()
+
+        Returns:
+            Dict[str, np.ndarray]: "id", "recorded_at", "student" and
+                "assignment" columns, plus one float column per metric (NaN
+                where a recording lacks it)
+        """
+        where, params = _filter(student, assignment, since, until)
+        with self._connect() as conn:
+            recordings = conn.execute(
+                f"SELECT id, recorded_at, student, assignment FROM recordings r{where} ORDER BY recorded_at", params
+            ).fetchall()
+            rows = conn.execute(
+                f"SELECT m.name, m.recording_id, m.value FROM metrics m JOIN recordings r ON r.id = m.recording_id"
+                f"{where}{' AND' if where else ' WHERE'} m.name IN ({', '.join('?' * len(names))})",
+                params + list(names)
+            ).fetchall() if names else []
+
+        ids = np.array([row["id"] for row in recordings], dtype=np.int64)
+        table = {
+            "id": ids,
+            "recorded_at": np.array([row["recorded_at"] for row in recordings], dtype=np.float64),
+            "student": np.array([row["student"] for row in recordings], dtype=object),
+            "assignment": np.array([row["assignment"] for row in recordings], dtype=object),
+        }
+        position = {recording_id: index for index, recording_id in enumerate(ids.tolist())}
+        for name in names:
+            table[name] = np.full(len(ids), np.nan)
+        for row in rows:
+            table[row["name"]][position[row["recording_id"]]] = row["value"]
+        return table
+
+    def values(
+        self,
+        name: str,
+        student: Optional[str] = None,
+        assignment: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None
+    ) -> np.ndarray:
+        """Every stored value of one metric among matching recordings."""
+        where, params = _filter(student, assignment, since, until)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT m.value FROM metrics m JOIN recordings r ON r.id = m.recording_id"
+                f"{where}{' AND' if where else ' WHERE'} m.name = ?",
+                params + [name]
+            ).fetchall()
+        return np.array([row[0] for row in rows], dtype=np.float64)
+
+    def percentile_rank(self, name: str, value: float, assignment: Optional[str] = None) -> Optional[float]:
+        """
+        Where a value falls in the cohort, e.g. a new recording's filler rate
+        among every submission for the same assignment.
+
+        Args:
+            name (str): Metric name
+            value (float): Value to rank
+            assignment (Optional[str]): Cohort (default: every recording)
+
+        Returns:
+            Optional[float]: Percent of the cohort at or below `value`
+                (ties count half), or None for an empty cohort
+        """
+        cohort = self.values(name, assignment=assignment)
+        if not len(cohort):
+            return None
+        below = np.count_nonzero(cohort < value)
+        ties = np.count_nonzero(cohort == value)
+        return float((below + 0.5 * ties) / len(cohort) * 100)
+
+    def aggregate(
+        self,
+        name: str,
+        by: str = "assignment",
+        student: Optional[str] = None,
+        assignment: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        percentiles: Sequence[float] = RESULTS_PERCENTILES
+    ) -> List[Dict]:
+        """
+        Summary statistics of one metric per group, in chronological order.
+
+        Grouping by assignment gives a class's trend over the term;
+        grouping by student compares students.
+
+        Args:
+            name (str): Metric name
+            by (str): "assignment" or "student"
+            student, assignment, since, until: Filter, as in recordings()
+            percentiles (Sequence[float]): Percentiles reported per group
+
+        Returns:
+            List[Dict]: One entry per group, ordered by its first recording:
+                group, count, mean, std, min, max, first_at, last_at and
+                "p<q>" for each percentile
+        """
+        if by not in GROUP_COLUMNS:
+            raise ValueError(f"Cannot group by {by}; expected one of {GROUP_COLUMNS}")
+        where, params = _filter(student, assignment, since, until)
+        with self._connect() as conn:
+            rows = conn.execute(
+                f"SELECT r.{by} AS grp, r.recorded_at, m.value FROM metrics m JOIN recordings r ON r.id = m.recording_id"
+                f"{where}{' AND' if where else ' WHERE'} m.name = ? ORDER BY r.{by}",
+                params + [name]
+            ).fetchall()
+        if not rows:
+            return []
+
+        groups = np.array([row["grp"] if row["grp"] is not None else "" for row in rows], dtype=object)
+        times = np.array([row["recorded_at"] for row in rows], dtype=np.float64)
+        values = np.array([row["value"] for row in rows], dtype=np.float64)
+        # Rows arrive sorted by group, so each group is one contiguous slice
+        boundaries = np.flatnonzero(groups[1:] != groups[:-1]) + 1
+        summary = []
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(rows)]):
+            group_values = values[start:end]
+            entry = {
+                "group": rows[start]["grp"],
+                "count": int(end - start),
+                "mean": float(np.mean(group_values)),
+                "std": float(np.std(group_values)),
+                "min": float(np.min(group_values)),
+                "max": float(np.max(group_values)),
+                "first_at": float(np.min(times[start:end])),
+                "last_at": float(np.max(times[start:end])),
+            }
+            for q, value in zip(percentiles, np.percentile(group_values, percentiles)):
+                entry[f"p{q:g}"] = float(value)
+            summary.append(entry)
+        summary.sort(key=lambda entry: entry["first_at"])
+        return summary
+
+    def delete(self, recording_id: int) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM recordings WHERE id = ?", (recording_id,))
+
+
+def _filter(student: Optional[str], assignment: Optional[str], since: Optional[float],
+            until: Optional[float]) -> Tuple[str, List[Any]]:
+    # WHERE clause over the recordings table (aliased r) and its parameters
+    clauses, params = [], []
+    for clause, value in [("r.student = ?", student), ("r.assignment = ?", assignment),
+                          ("r.recorded_at >= ?", since), ("r.recorded_at < ?", until)]:
+        if value is not None:
+            clauses.append(clause)
+            params.append(value)
+    return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+_shared_store: Optional[ResultsStore] = None
+_shared_lock = threading.Lock()
+
+
+def get_results_store() -> ResultsStore:
+    """
+    Process-wide results store at config.RESULTS_DB_PATH.
+
+    Returns:
+        ResultsStore: The shared store
+    """
+    global _shared_store
+    with _shared_lock:
+        if _shared_store is None:
+            _shared_store = ResultsStore()
+        return _shared_store